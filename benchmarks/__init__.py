@@ -0,0 +1 @@
+"""Benchmarks for MCP Hub MCP Server (run with ``python -m benchmarks.<name>``)"""
@@ -0,0 +1,115 @@
+"""Compare the legacy string-concatenation renderers with src.tools.formatters
+
+Usage:
+    python -m benchmarks.bench_formatters [--sizes 10 100 1000]
+"""
+
+import argparse
+import json
+import timeit
+
+from src.tools import formatters
+from .synthetic import make_catalog
+
+
+# Renderers as they were implemented in ToolHandler before the formatter engine
+
+def legacy_format_server_list(data, title):
+    servers = data if isinstance(data, list) else data.get("servers", [])
+
+    if not servers:
+        return f"{title}\n\nNo servers found."
+
+    result = f"{title}\n{'=' * 60}\n\n"
+
+    for idx, server in enumerate(servers, 1):
+        result += f"{idx}. {server.get('name', 'Unknown')}\n"
+        result += f"   ID: {server.get('id')}\n"
+
+        desc = server.get('description', '')
+        if desc:
+            result += f"   Description: {desc[:100]}{'...' if len(desc) > 100 else ''}\n"
+
+        result += f"   GitHub: {server.get('github_link', 'N/A')}\n"
+        result += f"   Favorites: {server.get('favorites_count', 0)}\n"
+
+        tags = server.get('tags', [])
+        if tags:
+            tag_names = [t.get('name', t) if isinstance(t, dict) else t for t in tags]
+            result += f"   Tags: {', '.join(tag_names)}\n"
+
+        result += "\n"
+
+    return result
+
+
+def legacy_format_server_details(server):
+    result = f"=== {server.get('name', 'Unknown')} ===\n\n"
+    result += f"ID: {server.get('id')}\n"
+    result += f"Description: {server.get('description', 'N/A')}\n"
+    result += f"GitHub: {server.get('github_link', 'N/A')}\n"
+    result += f"Protocol: {server.get('protocol', 'N/A')}\n"
+    result += f"Status: {server.get('status', 'N/A')}\n"
+    result += f"Favorites: {server.get('favorites_count', 0)}\n"
+
+    tags = server.get('tags', [])
+    if tags:
+        tag_names = [t.get('name', t) if isinstance(t, dict) else t for t in tags]
+        result += f"Tags: {', '.join(tag_names)}\n"
+
+    tools = server.get('tools', [])
+    if tools:
+        result += f"\n--- Tools ({len(tools)}) ---\n"
+        for tool in tools:
+            result += f"  • {tool.get('name', 'Unknown')}\n"
+            if tool.get('description'):
+                result += f"    {tool['description']}\n"
+
+    if server.get('created_at'):
+        result += f"\nCreated: {server['created_at']}\n"
+
+    return result
+
+
+def best_of(fn, number: int, repeat: int = 5) -> float:
+    """Best per-call time in microseconds"""
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def run(sizes) -> dict:
+    catalog = make_catalog(max(sizes))
+    results = {}
+
+    for size in sizes:
+        data = {"servers": catalog[:size]}
+        assert legacy_format_server_list(data, "Title") == formatters.format_server_list(data, "Title")
+
+        number = max(1, 20000 // size)
+        results[f"list_{size}"] = {
+            "legacy_us": round(best_of(lambda: legacy_format_server_list(data, "Title"), number), 2),
+            "text_us": round(best_of(lambda: formatters.format_server_list(data, "Title"), number), 2),
+            "compact_us": round(best_of(lambda: formatters.format_server_list(data, "Title", "compact"), number), 2),
+            "json_us": round(best_of(lambda: formatters.format_server_list(data, "Title", "json"), number), 2),
+        }
+
+    details = catalog[0]
+    assert legacy_format_server_details(details) == formatters.format_server_details(details)
+    results["details"] = {
+        "legacy_us": round(best_of(lambda: legacy_format_server_details(details), 20000), 2),
+        "text_us": round(best_of(lambda: formatters.format_server_details(details), 20000), 2),
+    }
+
+    for entry in results.values():
+        entry["speedup"] = round(entry["legacy_us"] / entry["text_us"], 2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes), indent=2))
+
+
+if __name__ == "__main__":
+    main()
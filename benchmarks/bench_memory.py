@@ -0,0 +1,81 @@
+"""Memory per mirrored server: raw payload dicts vs. ServerRecord
+
+Builds the catalog the mirror holds (a listing entry plus a detail payload
+per server) from JSON text, the way it arrives from the backend, once as
+parsed dicts and once as ServerRecord objects, and reports the bytes
+allocated per server (tracemalloc). Also times rendering a 20-server page.
+
+Usage:
+    python -m benchmarks.bench_memory [--servers 100000]
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from src.models import ServerRecord
+from src.tools import formatters
+from .synthetic import make_catalog
+
+
+def _measure(build) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, used
+
+
+def _render_us(servers: list, repeat: int = 2000) -> float:
+    page = servers[:20]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        formatters.format_server_list(page, "Servers", "text")
+    return round((time.perf_counter() - start) / repeat * 1e6, 2)
+
+
+def run(servers: int) -> dict:
+    catalog = make_catalog(servers)
+    # One JSON document per payload so parsed strings are not shared
+    summaries = [json.dumps({k: v for k, v in s.items() if k != "tools"}) for s in catalog]
+    details = [json.dumps(s) for s in catalog]
+    del catalog
+
+    def build_dicts():
+        return [json.loads(s) for s in summaries], [json.loads(d) for d in details]
+
+    def build_records():
+        listing = [ServerRecord.from_dict(json.loads(s)) for s in summaries]
+        return listing, [ServerRecord.from_dict(json.loads(d), base=b) for d, b in zip(details, listing)]
+
+    (dict_listing, dict_details), dict_bytes = _measure(build_dicts)
+    (record_listing, record_details), record_bytes = _measure(build_records)
+
+    return {
+        "servers": servers,
+        "bytes_per_server": {
+            "dicts": round(dict_bytes / servers),
+            "records": round(record_bytes / servers),
+            "saved_percent": round(100 * (1 - record_bytes / dict_bytes), 1),
+        },
+        "render_20_servers_us": {
+            "dicts": _render_us(dict_listing),
+            "records": _render_us(record_listing),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--servers", type=int, default=100_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.servers), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Measure ETag / Last-Modified revalidation against the fake backend
+
+Repeatedly expires the cached catalog listing and refreshes it, once with
+validators enabled on the fake backend (304 refreshes) and once without
+(full downloads). APIClient talks to the backend in-process through
+httpx.ASGITransport, so timings exclude network cost and bytes are the
+response bodies the backend would have sent.
+
+Usage:
+    python -m benchmarks.bench_revalidation [--servers 1000] [--limit 100] [--refreshes 200]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from src.client import APIClient
+from .fake_hub import API_PREFIX, FakeHub
+from .stats import summarize
+
+
+async def measure(validators: bool, servers: int, limit: int, refreshes: int) -> dict:
+    hub = FakeHub(servers=servers, validators=validators)
+    client = APIClient()
+    client.base_url = f"http://fake{API_PREFIX}"
+    client.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=hub))
+    client.cache.stale_ttl = 0
+
+    await client.list_servers(limit=limit)
+    sent = hub.bytes_sent
+    latencies = []
+    for _ in range(refreshes):
+        for entry in client.cache._entries.values():
+            entry.stored_at -= entry.ttl + 1
+        start = time.perf_counter()
+        await client.list_servers(limit=limit)
+        latencies.append((time.perf_counter() - start) * 1000)
+    await client.close()
+
+    return {
+        "bytes_per_refresh": round((hub.bytes_sent - sent) / refreshes),
+        "not_modified": hub.not_modified,
+        "refresh_ms": summarize(latencies),
+    }
+
+
+async def run(servers: int, limit: int, refreshes: int) -> dict:
+    return {
+        "full_download": await measure(False, servers, limit, refreshes),
+        "revalidated": await measure(True, servers, limit, refreshes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--servers", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100, help="Servers per listing page")
+    parser.add_argument("--refreshes", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.servers, args.limit, args.refreshes)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
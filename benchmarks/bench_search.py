@@ -0,0 +1,100 @@
+"""Query latency of the local BM25 search index on a synthetic catalog
+
+Usage:
+    python -m benchmarks.bench_search [--servers 100000] [--queries 2000]
+"""
+
+import argparse
+import json
+import random
+import time
+
+from src.search import SearchIndex
+from .stats import summarize
+from .synthetic import make_catalog
+
+
+def _misspell(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word) - 1)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if kind == 1:
+        return word[:i] + word[i + 1:]
+    if kind == 2:
+        return word[:i] + rng.choice("aeiou") + word[i:]
+    return word[:i] + rng.choice("aeiou") + word[i + 1:]
+
+
+def run(servers: int, queries: int) -> dict:
+    catalog = make_catalog(servers)
+    rng = random.Random(7)
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    for server in catalog:
+        index.upsert(server, server)
+    build_s = time.perf_counter() - start
+
+    # Queries reuse words from random server names and descriptions
+    sample = rng.sample(catalog, queries)
+    query_list = []
+    for server in sample:
+        words = server["name"].split("-")[:1] + server["description"].split()[:rng.randint(0, 2)]
+        query_list.append(" ".join(words))
+
+    # Warm the per-term impact cache, then measure steady-state latency
+    for q in query_list:
+        index.search(q)
+
+    latencies = []
+    for q in query_list:
+        t0 = time.perf_counter()
+        index.search(q, limit=20)
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    # Misspelled server names (one swapped, dropped, inserted or replaced
+    # letter) miss the exact index and are answered by the trigram fallback
+    typo_latencies = []
+    corrected = 0
+    for server in sample[:500]:
+        word = server["name"].split("-")[0]
+        typo = _misspell(word, rng)
+        t0 = time.perf_counter()
+        results = index.search(typo, limit=20)
+        typo_latencies.append((time.perf_counter() - t0) * 1000)
+        corrected += bool(results) and word in results[0]["name"].split("-")
+
+    tag = catalog[0]["tags"][0]["name"]
+    t0 = time.perf_counter()
+    index.search(query_list[0], tags=[tag])
+    tag_ms = (time.perf_counter() - t0) * 1000
+
+    # Incremental update cost
+    t0 = time.perf_counter()
+    for server in catalog[:1000]:
+        index.upsert(dict(server, description=server["description"] + " updated"), server)
+    update_us = (time.perf_counter() - t0) / 1000 * 1e6
+
+    return {
+        "servers": servers,
+        "queries": queries,
+        "build_seconds": round(build_s, 3),
+        "query_ms": summarize(latencies),
+        "typo_query_ms": summarize(typo_latencies),
+        "typo_top_result_corrected": round(corrected / len(typo_latencies), 3),
+        "tag_filtered_query_ms": round(tag_ms, 4),
+        "upsert_us": round(update_us, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--servers", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.servers, args.queries), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Similar-server lookups on a synthetic catalog (TF-IDF cosine neighbours)
+
+Reports the initial index build, cold and cached lookups, batched lookups,
+and the cost of applying a small catalog delta.
+
+Usage:
+    python -m benchmarks.bench_similarity [--servers 100000] [--lookups 500]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from src.catalog import CatalogSnapshot
+from src.models import ServerRecord
+from src.similarity import SimilarityIndex
+from .stats import summarize
+from .synthetic import make_catalog
+
+
+def _timed_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+async def run(servers: int, lookups: int) -> dict:
+    catalog = [ServerRecord.from_dict(s) for s in make_catalog(servers)]
+    snapshot = CatalogSnapshot(catalog, {s.id: s for s in catalog})
+    rng = random.Random(7)
+
+    index = SimilarityIndex()
+    start = time.perf_counter()
+    await index.apply_changes(snapshot, list(snapshot.servers), [])
+    build_s = time.perf_counter() - start
+
+    ids = rng.sample(list(snapshot.servers), lookups * 2)
+    cold = [_timed_ms(lambda i=i: index.similar(i, 5)) for i in ids[:lookups]]
+    cached = [_timed_ms(lambda i=i: index.similar(i, 5)) for i in ids[:lookups]]
+    batch_ms = _timed_ms(lambda: index.similar_many(ids[lookups:]))
+
+    # A delta sync touching 50 servers
+    updated = [
+        ServerRecord.from_dict(dict(s.to_dict(), description=s.description + " updated"))
+        for s in rng.sample(catalog, 50)
+    ]
+    delta = snapshot.apply(updated, {s.id: s for s in updated})
+    cached_before = len(index._neighbours)
+    start = time.perf_counter()
+    await index.apply_changes(delta, [s.id for s in updated], [])
+    delta_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "servers": servers,
+        "lookups": lookups,
+        "build_seconds": round(build_s, 3),
+        "cold_lookup_ms": summarize(cold),
+        "cached_lookup_ms": summarize(cached),
+        "batched_lookup_ms_per_server": round(batch_ms / lookups, 4),
+        "delta_50_servers_ms": round(delta_ms, 2),
+        "cached_lists_kept_after_delta": f"{len(index._neighbours)}/{cached_before}",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--servers", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.servers, args.lookups)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Compare SSE and stateless Streamable HTTP transports
+
+For each transport the server under test is started against the fake
+backend, N MCP sessions are opened and held, and the growth of the server's
+resident memory is converted into sessions-per-GB. The same sessions then
+issue tool calls concurrently to measure requests/sec. Memory is read from
+/proc, so this benchmark runs on Linux only.
+
+Usage:
+    python -m benchmarks.bench_transports [--sessions 50] [--calls 20]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import warnings
+from contextlib import AsyncExitStack
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from .fake_hub import FakeHub, serve_in_background
+from .load_test import http_server
+from .stats import summarize
+
+GIB = 1024 ** 3
+
+
+def rss_bytes(pid: int) -> int:
+    """Resident set size of a process"""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError("VmRSS not found")
+
+
+async def open_session(stack: AsyncExitStack, transport: str, base_url: str) -> ClientSession:
+    if transport == "sse":
+        read, write = await stack.enter_async_context(sse_client(f"{base_url}/sse"))
+    else:
+        read, write, _ = await stack.enter_async_context(streamablehttp_client(f"{base_url}/mcp"))
+    session = await stack.enter_async_context(ClientSession(read, write))
+    await session.initialize()
+    return session
+
+
+async def measure(transport: str, hub_url: str, sessions: int, calls: int) -> dict:
+    mode = "http" if transport == "sse" else "streamable-http"
+    async with http_server(hub_url, mode, {}) as (base_url, proc):
+        # Warm up imports, caches and the backend connection pool
+        async with AsyncExitStack() as stack:
+            session = await open_session(stack, transport, base_url)
+            await session.call_tool("get_top_servers", arguments={"limit": 3})
+        await asyncio.sleep(0.5)
+        baseline = rss_bytes(proc.pid)
+
+        async with AsyncExitStack() as stack:
+            opened = []
+            for _ in range(sessions):
+                opened.append(await open_session(stack, transport, base_url))
+            await asyncio.sleep(0.5)
+            held = rss_bytes(proc.pid)
+
+            latencies = []
+
+            async def worker(session: ClientSession):
+                for _ in range(calls):
+                    t0 = time.perf_counter()
+                    await session.call_tool("get_top_servers", arguments={"limit": 3})
+                    latencies.append((time.perf_counter() - t0) * 1000)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(s) for s in opened))
+            elapsed = time.perf_counter() - start
+            peak = rss_bytes(proc.pid)
+
+    per_session = (held - baseline) / sessions
+    return {
+        "sessions": sessions,
+        "baseline_rss_mb": round(baseline / 2 ** 20, 1),
+        "held_rss_mb": round(held / 2 ** 20, 1),
+        "peak_rss_mb": round(peak / 2 ** 20, 1),
+        "bytes_per_session": round(per_session),
+        # Stateless sessions may not grow the server at all
+        "sessions_per_gb": round(GIB / per_session) if per_session > 0 else None,
+        "requests": len(latencies),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "latency_ms": summarize(latencies),
+    }
+
+
+async def run(sessions: int, calls: int) -> dict:
+    results = {}
+    with serve_in_background(FakeHub(servers=200)) as hub_url:
+        for transport in ("sse", "streamable-http"):
+            results[transport] = await measure(transport, hub_url, sessions, calls)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--calls", type=int, default=20, help="Tool calls per session for the throughput phase")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", DeprecationWarning)
+    print(json.dumps(asyncio.run(run(args.sessions, args.calls)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Local stand-in for the MCP Hub backend API
+
+Serves the endpoints APIClient uses from a synthetic catalog with
+configurable latency, payload size and error rate. GET responses carry
+ETag and Last-Modified validators and conditional requests are answered
+with 304 Not Modified. Runs fully offline.
+
+Usage:
+    python -m benchmarks.fake_hub --port 8000 --servers 500 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import socket
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs
+
+from .synthetic import make_catalog
+
+API_PREFIX = "/api/v1"
+
+_DETAIL_RE = re.compile(r"^/mcp-servers/(\d+)$")
+
+
+class FakeHub:
+    """ASGI app emulating the MCP Hub API"""
+
+    def __init__(
+        self,
+        servers: int = 500,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        description_words: Optional[int] = None,
+        validators: bool = True,
+        seed: int = 42
+    ):
+        """Initialize fake backend
+
+        Args:
+            servers: Number of servers in the synthetic catalog
+            latency_ms: Added delay per request
+            jitter_ms: Uniform random extra delay per request
+            error_rate: Fraction of requests answered with HTTP 500
+            description_words: Fixed description length (controls payload size)
+            validators: Send ETag/Last-Modified and honour conditional requests
+            seed: Random seed for catalog and error injection
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.validators = validators
+        self._rng = random.Random(seed)
+
+        self.catalog: List[Dict[str, Any]] = make_catalog(servers, seed=seed)
+        if description_words is not None:
+            for server in self.catalog:
+                words = (server["description"].split() * description_words)[:description_words]
+                server["description"] = " ".join(words)
+        self.by_id = {s["id"]: s for s in self.catalog}
+        self.last_modified = time.time()
+
+        self.requests: Counter = Counter()
+        self.not_modified = 0
+        self.bytes_sent = 0
+
+    def modify(self, server_id: int, **changes) -> None:
+        """Change a server's fields and bump the catalog's Last-Modified time"""
+        self.by_id[server_id].update(changes)
+        self.last_modified = time.time()
+
+    def _is_not_modified(self, headers: Dict[str, str], etag: str) -> bool:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                return int(self.last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def summary(self, server: Dict[str, Any]) -> Dict[str, Any]:
+        """Listing representation of a server (no tools)"""
+        return {k: v for k, v in server.items() if k != "tools"}
+
+    def list_servers(self, sort: str, order: str, limit: int, offset: int) -> Dict[str, Any]:
+        field = "favorites_count" if sort == "favorites" else "created_at"
+        ordered = sorted(self.catalog, key=lambda s: (s[field], s["id"]), reverse=(order == "desc"))
+        return {"servers": [self.summary(s) for s in ordered[offset:offset + limit]]}
+
+    def search(self, keyword: Optional[str], tags: Optional[List[str]]) -> Dict[str, Any]:
+        keyword = (keyword or "").lower()
+        wanted = {t.lower() for t in tags or []}
+        results = []
+        for server in self.catalog:
+            if keyword and keyword not in server["name"].lower() and keyword not in server["description"].lower():
+                continue
+            if wanted and not wanted <= {t["name"].lower() for t in server["tags"]}:
+                continue
+            results.append(self.summary(server))
+        return {"servers": results}
+
+    def top_users(self, limit: int) -> Dict[str, Any]:
+        counts = Counter(s["author"] for s in self.catalog)
+        return {"users": [{"username": u, "server_count": c} for u, c in counts.most_common(limit)]}
+
+    def route(self, method: str, path: str, query: Dict[str, str], body: Any) -> tuple:
+        """Return (status, payload) for a request"""
+        if not path.startswith(API_PREFIX):
+            return 404, {"detail": "Not Found"}
+        path = path[len(API_PREFIX):]
+
+        if method == "GET" and path == "/mcp-servers/":
+            return 200, self.list_servers(
+                query.get("sort", "favorites"),
+                query.get("order", "desc"),
+                int(query.get("limit", 20)),
+                int(query.get("offset", 0))
+            )
+        if method == "GET" and path == "/mcp-servers/top-users":
+            return 200, self.top_users(int(query.get("limit", 3)))
+        if method == "POST" and path == "/mcp-servers/search":
+            body = body or {}
+            return 200, self.search(body.get("keyword"), body.get("tags"))
+        if method in ("GET", "HEAD"):
+            match = _DETAIL_RE.match(path)
+            if match:
+                server = self.by_id.get(int(match.group(1)))
+                if server is None:
+                    return 404, {"detail": "Server not found"}
+                return 200, server
+            if path in ("", "/"):
+                return 200, {"status": "ok"}
+        return 404, {"detail": "Not Found"}
+
+    async def __call__(self, scope, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        method = scope["method"]
+        path = scope["path"]
+        self.requests[f"{method} {re.sub(r'/[0-9]+$', '/{id}', path)}"] += 1
+
+        delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+        if self.error_rate and self._rng.random() < self.error_rate:
+            status, payload = 500, {"detail": "Injected failure"}
+        else:
+            query = {k: v[0] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+            status, payload = self.route(method, path, query, json.loads(body) if body else None)
+
+        data = json.dumps(payload).encode()
+        headers = [[b"content-type", b"application/json"]]
+        if self.validators and method == "GET" and status == 200:
+            etag = f'"{hashlib.sha1(data).hexdigest()[:20]}"'
+            headers.append([b"etag", etag.encode()])
+            headers.append([b"last-modified", formatdate(self.last_modified, usegmt=True).encode()])
+            request_headers = {k.decode().lower(): v.decode() for k, v in scope.get("headers", [])}
+            if self._is_not_modified(request_headers, etag):
+                status, data = 304, b""
+                self.not_modified += 1
+        if status != 304:
+            headers.append([b"content-length", str(len(data)).encode()])
+
+        body = b"" if method == "HEAD" else data
+        self.bytes_sent += len(body)
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+@contextmanager
+def serve_in_background(hub: FakeHub, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+    """Run the fake backend on a background thread
+
+    Yields:
+        Base URL to use as MCP_HUB_URL
+    """
+    import uvicorn
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    bound_port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(hub, log_level="warning", access_log=False, lifespan="off"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("fake backend failed to start")
+        time.sleep(0.01)
+
+    try:
+        yield f"http://{host}:{bound_port}{API_PREFIX}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+        sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--servers", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--description-words", type=int, default=None)
+    parser.add_argument("--no-validators", action="store_true", help="Disable ETag/Last-Modified support")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    hub = FakeHub(
+        servers=args.servers,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        description_words=args.description_words,
+        validators=not args.no_validators
+    )
+    uvicorn.run(hub, host=args.host, port=args.port, log_level="warning", lifespan="off")
+
+
+if __name__ == "__main__":
+    main()
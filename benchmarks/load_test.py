@@ -0,0 +1,270 @@
+"""End-to-end load test of the MCP server against a local fake backend
+
+Starts benchmarks.fake_hub in-process, launches the real server
+(``python -m src.main``) and drives it with many concurrent MCP client
+sessions over SSE, stateless Streamable HTTP and/or stdio. Reports throughput and p50/p95/p99 latency
+per tool as JSON so results can be diffed across releases.
+
+Usage:
+    python -m benchmarks.load_test --transport sse stdio --sessions 20 --calls 50 \\
+        --latency-ms 10 --output load_results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from .fake_hub import FakeHub, serve_in_background
+from .stats import summarize
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    """Return an unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_env(hub_url: str, extra: Dict[str, str]) -> Dict[str, str]:
+    """Environment for the server under test"""
+    env = dict(os.environ)
+    env.update({"MCP_HUB_URL": hub_url, "LOG_LEVEL": "WARNING", "PYTHONUNBUFFERED": "1"})
+    env.update(extra)
+    return env
+
+
+def make_workload(hub: FakeHub, rng: random.Random):
+    """Build a weighted mix of tool calls resembling agent traffic"""
+    ids = [s["id"] for s in hub.catalog]
+    words = [s["name"].split("-")[0] for s in hub.catalog[:50]]
+    return [
+        (3, "search_mcp_servers", lambda: {"keyword": rng.choice(words)}),
+        (3, "list_mcp_servers", lambda: {"limit": 20, "offset": rng.choice([0, 20, 40])}),
+        (4, "get_mcp_server_details", lambda: {"server_id": rng.choice(ids)}),
+        (2, "get_top_servers", lambda: {"limit": 3}),
+        (1, "get_top_contributors", lambda: {"limit": 3}),
+    ]
+
+
+async def run_session(session: ClientSession, workload, calls: int, rng: random.Random,
+                      samples: Dict[str, List[float]], errors: Dict[str, int]):
+    """Issue calls sequentially on one session, recording latency per tool"""
+    weights = [w for w, _, _ in workload]
+    for _ in range(calls):
+        _, tool, make_args = rng.choices(workload, weights=weights)[0]
+        start = time.perf_counter()
+        try:
+            result = await session.call_tool(tool, arguments=make_args())
+            text = result.content[0].text if result.content else ""
+            if result.isError or text.startswith("Error"):
+                errors[tool] += 1
+        except Exception:
+            errors[tool] += 1
+        samples[tool].append((time.perf_counter() - start) * 1000)
+
+
+@asynccontextmanager
+async def http_server(hub_url: str, transport_mode: str, extra_env: Dict[str, str]):
+    """Start the server in an HTTP transport mode
+
+    Yields:
+        Tuple of (base URL, server process)
+    """
+    port = free_port()
+    env = server_env(hub_url, {"TRANSPORT_MODE": transport_mode, "HOST": "127.0.0.1", "PORT": str(port), **extra_env})
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.main"], cwd=REPO_ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + 20
+        while True:
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                    break
+            except OSError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("server under test failed to start")
+                await asyncio.sleep(0.05)
+        yield f"http://127.0.0.1:{port}", proc
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+async def drive_sse(hub: FakeHub, hub_url: str, sessions: int, calls: int, extra_env: Dict[str, str]):
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+
+    async with http_server(hub_url, "http", extra_env) as (base_url, _):
+        async def one(seed: int):
+            rng = random.Random(seed)
+            async with sse_client(f"{base_url}/sse") as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    await run_session(session, make_workload(hub, rng), calls, rng, samples, errors)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(sessions)))
+        elapsed = time.perf_counter() - start
+
+    return samples, errors, elapsed
+
+
+async def drive_streamable_http(hub: FakeHub, hub_url: str, sessions: int, calls: int, extra_env: Dict[str, str]):
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+
+    async with http_server(hub_url, "streamable-http", extra_env) as (base_url, _):
+        async def one(seed: int):
+            rng = random.Random(seed)
+            async with streamablehttp_client(f"{base_url}/mcp") as (read, write, _):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    await run_session(session, make_workload(hub, rng), calls, rng, samples, errors)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(sessions)))
+        elapsed = time.perf_counter() - start
+
+    return samples, errors, elapsed
+
+
+async def drive_stdio(hub: FakeHub, hub_url: str, sessions: int, calls: int, extra_env: Dict[str, str]):
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "src.main"],
+        cwd=str(REPO_ROOT),
+        env=server_env(hub_url, {"TRANSPORT_MODE": "stdio", **extra_env})
+    )
+
+    async def one(seed: int):
+        rng = random.Random(seed)
+        async with stdio_client(params) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                await run_session(session, make_workload(hub, rng), calls, rng, samples, errors)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    return samples, errors, elapsed
+
+
+DRIVERS = {
+    "sse": drive_sse,
+    "streamable-http": drive_streamable_http,
+    "stdio": drive_stdio,
+}
+
+
+def report(samples: Dict[str, List[float]], errors: Dict[str, int], elapsed: float, sessions: int) -> Dict[str, Any]:
+    total = sum(len(v) for v in samples.values())
+    return {
+        "sessions": sessions,
+        "calls": total,
+        "errors": sum(errors.values()),
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": summarize([x for v in samples.values() for x in v]),
+        "tools": {
+            tool: {**summarize(values), "errors": errors.get(tool, 0)}
+            for tool, values in sorted(samples.items())
+        },
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+async def run(args) -> Dict[str, Any]:
+    hub = FakeHub(
+        servers=args.servers,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        description_words=args.description_words
+    )
+    extra_env = dict(kv.split("=", 1) for kv in args.server_env)
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": {},
+    }
+
+    with serve_in_background(hub) as hub_url:
+        for transport in args.transport:
+            sessions = args.sessions if transport != "stdio" else args.stdio_sessions
+            samples, errors, elapsed = await DRIVERS[transport](hub, hub_url, sessions, args.calls, extra_env)
+            results["results"][transport] = report(samples, errors, elapsed, sessions)
+        results["meta"]["backend_requests"] = dict(hub.requests)
+        results["meta"]["backend_not_modified"] = hub.not_modified
+        results["meta"]["backend_bytes_sent"] = hub.bytes_sent
+
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", nargs="+", choices=sorted(DRIVERS), default=["sse", "stdio"])
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent sessions for HTTP transports")
+    parser.add_argument("--stdio-sessions", type=int, default=4, help="Concurrent stdio sessions (one process each)")
+    parser.add_argument("--calls", type=int, default=50, help="Tool calls per session")
+    parser.add_argument("--servers", type=int, default=500, help="Synthetic catalog size")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="Fake backend latency")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="Fake backend latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake backend error rate")
+    parser.add_argument("--description-words", type=int, default=None, help="Fixed description length")
+    parser.add_argument("--server-env", nargs="*", default=[], metavar="KEY=VALUE",
+                        help="Extra environment for the server under test (e.g. CACHE_ENABLED=false)")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    results = asyncio.run(run(args))
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Latency statistics helpers shared by benchmarks"""
+
+import statistics
+from typing import Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile of already sorted samples"""
+    index = min(len(samples) - 1, int(len(samples) * pct / 100))
+    return samples[index]
+
+
+def summarize(latencies_ms: List[float]) -> Dict[str, float]:
+    """Summarize latencies in milliseconds"""
+    if not latencies_ms:
+        return {"count": 0}
+    ordered = sorted(latencies_ms)
+    return {
+        "count": len(ordered),
+        "mean": round(statistics.mean(ordered), 4),
+        "p50": round(percentile(ordered, 50), 4),
+        "p95": round(percentile(ordered, 95), 4),
+        "p99": round(percentile(ordered, 99), 4),
+        "max": round(ordered[-1], 4),
+    }
@@ -0,0 +1,54 @@
+"""Synthetic MCP Hub catalog generator shared by benchmarks"""
+
+import random
+from typing import Any, Dict, List
+
+VOCABULARY_SIZE = 5000
+TAG_COUNT = 200
+
+
+def make_vocabulary(rng: random.Random, size: int = VOCABULARY_SIZE) -> List[str]:
+    """Generate pronounceable pseudo-words"""
+    consonants = "bcdfghjklmnprstvwz"
+    vowels = "aeiou"
+    words = set()
+    while len(words) < size:
+        length = rng.randint(2, 4)
+        words.add("".join(rng.choice(consonants) + rng.choice(vowels) for _ in range(length)))
+    return sorted(words)
+
+
+def make_catalog(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Generate server detail payloads shaped like the backend's
+
+    Args:
+        count: Number of servers
+        seed: Random seed for reproducible catalogs
+
+    Returns:
+        List of server payloads including tags and tools
+    """
+    rng = random.Random(seed)
+    vocab = make_vocabulary(rng)
+    tags = [f"tag-{w}" for w in rng.sample(vocab, TAG_COUNT)]
+
+    servers = []
+    for server_id in range(1, count + 1):
+        name_words = rng.sample(vocab, 2)
+        servers.append({
+            "id": server_id,
+            "name": f"{name_words[0]}-{name_words[1]}-mcp",
+            "description": " ".join(rng.choices(vocab, k=rng.randint(8, 24))),
+            "github_link": f"https://github.com/example/{name_words[0]}-{server_id}",
+            "protocol": "stdio",
+            "status": "approved",
+            "favorites_count": int(rng.paretovariate(1.5)) - 1,
+            "created_at": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T00:00:00",
+            "author": f"user{rng.randint(1, count // 10 + 1)}",
+            "tags": [{"id": i, "name": t} for i, t in enumerate(rng.sample(tags, rng.randint(1, 4)))],
+            "tools": [
+                {"name": f"{rng.choice(vocab)}_{rng.choice(vocab)}", "description": " ".join(rng.choices(vocab, k=6))}
+                for _ in range(rng.randint(1, 6))
+            ],
+        })
+    return servers
@@ -0,0 +1,154 @@
+"""Admission control for tool calls"""
+
+import asyncio
+import bisect
+import itertools
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Hashable, List, Optional
+
+
+class OverloadedError(Exception):
+    """Raised when a call is rejected because the wait queue is full"""
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "session", "future")
+
+    def __init__(self, priority: int, seq: int, session: Optional[Hashable], future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.session = session
+        self.future = future
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class AdmissionController:
+    """Global and per-session concurrency limits with a bounded priority queue
+
+    A call starts at once when both the global and its session's in-flight
+    counts are below their caps. Otherwise it waits in a queue ordered by
+    priority (lower first) and arrival. When a slot frees up, the first
+    waiter whose session is under its cap is started, so one busy session
+    cannot block others queued behind it. When the queue is full new calls
+    are rejected immediately with OverloadedError.
+    """
+
+    def __init__(self, max_in_flight: int = 64, max_per_session: int = 8, max_queued: int = 256):
+        """Initialize controller
+
+        Args:
+            max_in_flight: Calls executing at once across all sessions (0 for unlimited)
+            max_per_session: Calls executing at once per session (0 for unlimited)
+            max_queued: Calls allowed to wait for a slot before rejecting
+        """
+        self.max_in_flight = max_in_flight
+        self.max_per_session = max_per_session
+        self.max_queued = max_queued
+
+        self._in_flight = 0
+        self._per_session: Dict[Hashable, int] = {}
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Calls currently holding a slot"""
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        """Calls currently queued"""
+        return len(self._queue)
+
+    @asynccontextmanager
+    async def slot(self, session: Optional[Hashable] = None, priority: int = 0) -> AsyncIterator[None]:
+        """Hold an execution slot for the duration of the block
+
+        Args:
+            session: Caller identity for the per-session cap (None to skip it)
+            priority: Queue priority, lower values run first
+
+        Raises:
+            OverloadedError: If the call has to wait and the queue is full
+        """
+        await self.acquire(session, priority)
+        try:
+            yield
+        finally:
+            self.release(session)
+
+    async def acquire(self, session: Optional[Hashable] = None, priority: int = 0) -> None:
+        """Wait for an execution slot (see slot())"""
+        if self._can_start(session):
+            self._start(session)
+            return
+
+        if len(self._queue) >= self.max_queued:
+            self.rejected += 1
+            raise OverloadedError(f"Server is busy ({len(self._queue)} calls queued); retry later")
+
+        waiter = _Waiter(priority, next(self._seq), session, asyncio.get_running_loop().create_future())
+        bisect.insort(self._queue, waiter)
+        self.queued += 1
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted a slot just before being cancelled: hand it on
+                self.release(session)
+            else:
+                self._queue.remove(waiter)
+            raise
+
+    def release(self, session: Optional[Hashable] = None) -> None:
+        """Return an execution slot and start queued calls that now fit"""
+        self._in_flight -= 1
+        if session is not None:
+            remaining = self._per_session[session] - 1
+            if remaining:
+                self._per_session[session] = remaining
+            else:
+                del self._per_session[session]
+        self._wake()
+
+    def stats(self) -> Dict[str, int]:
+        """Return admission counters and current occupancy"""
+        return {
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "in_flight": self._in_flight,
+            "waiting": len(self._queue),
+        }
+
+    def _can_start(self, session: Optional[Hashable]) -> bool:
+        if self.max_in_flight and self._in_flight >= self.max_in_flight:
+            return False
+        if session is not None and self.max_per_session:
+            return self._per_session.get(session, 0) < self.max_per_session
+        return True
+
+    def _start(self, session: Optional[Hashable]) -> None:
+        self._in_flight += 1
+        self.admitted += 1
+        if session is not None:
+            self._per_session[session] = self._per_session.get(session, 0) + 1
+
+    def _wake(self) -> None:
+        index = 0
+        while index < len(self._queue):
+            if self.max_in_flight and self._in_flight >= self.max_in_flight:
+                return
+            waiter = self._queue[index]
+            if waiter.future.done() or not self._can_start(waiter.session):
+                index += 1
+                continue
+            del self._queue[index]
+            self._start(waiter.session)
+            waiter.future.set_result(None)
@@ -0,0 +1,228 @@
+"""In-process response cache for MCP Hub backend calls"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Lookup states returned by ResponseCache.lookup
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+def endpoint_kind(endpoint: str) -> str:
+    """Classify a backend endpoint for per-endpoint TTLs
+
+    Args:
+        endpoint: Endpoint path relative to the API base URL
+
+    Returns:
+        One of 'search', 'contributors', 'list' or 'details'
+    """
+    if endpoint.endswith("/search"):
+        return "search"
+    if endpoint.endswith("/top-users"):
+        return "contributors"
+    if endpoint == "/mcp-servers/":
+        return "list"
+    return "details"
+
+
+def make_key(method: str, endpoint: str, payload: Optional[Dict[str, Any]] = None) -> str:
+    """Build a cache key from endpoint and normalized params/body"""
+    if not payload:
+        return f"{method} {endpoint}"
+    normalized = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{method} {endpoint} {normalized}"
+
+
+class CacheEntry:
+    """Single cached backend response"""
+
+    __slots__ = ("value", "size", "stored_at", "ttl", "etag", "last_modified")
+
+    def __init__(
+        self,
+        value: Any,
+        size: int,
+        stored_at: float,
+        ttl: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        self.value = value
+        self.size = size
+        self.stored_at = stored_at
+        self.ttl = ttl
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class ResponseCache:
+    """Bounded TTL + LRU cache with stale-while-revalidate support
+
+    Entries younger than their TTL are fresh. Entries older than their TTL
+    but within ``stale_ttl`` after expiry are served as stale so the caller
+    can refresh them in the background. Anything older is a miss, but is
+    kept for another ``error_ttl`` seconds as a fallback when the backend
+    is failing (stale-if-error).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        stale_ttl: float = 0.0,
+        error_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize cache
+
+        Args:
+            max_entries: Maximum number of entries kept
+            max_bytes: Maximum total size of cached response bodies
+            stale_ttl: Seconds an expired entry may still be served as stale
+            error_ttl: Seconds after the stale window an entry is kept as a
+                fallback for backend failures
+            clock: Monotonic time source (overridable for tests)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self.error_ttl = error_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: str) -> tuple[str, Any]:
+        """Look up a key
+
+        Returns:
+            Tuple of (state, value) where state is FRESH, STALE or MISS
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISS, None
+
+        age = self._clock() - entry.stored_at
+        if age < entry.ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return FRESH, entry.value
+        if age < entry.ttl + self.stale_ttl:
+            self._entries.move_to_end(key)
+            self.stale_hits += 1
+            return STALE, entry.value
+
+        if age >= entry.ttl + self.stale_ttl + self.error_ttl:
+            self._remove(key)
+        self.misses += 1
+        return MISS, None
+
+    def is_fresh(self, key: str) -> bool:
+        """Whether a fresh entry is held, without counting a lookup or touching LRU order"""
+        entry = self._entries.get(key)
+        return entry is not None and self._clock() - entry.stored_at < entry.ttl
+
+    def fallback(self, key: str) -> Any:
+        """Return an expired value still inside the stale-if-error window
+
+        Returns:
+            The cached value, or None when there is nothing to fall back to
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._clock() - entry.stored_at >= entry.ttl + self.stale_ttl + self.error_ttl:
+            return None
+        return entry.value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        size: int,
+        ttl: float,
+        age: float = 0.0,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """Store a value
+
+        Args:
+            key: Cache key
+            value: Parsed response
+            size: Size of the raw response body in bytes
+            ttl: Seconds the entry stays fresh
+            age: Seconds since the value was fetched (when copied from
+                another cache level)
+            etag: ETag validator from the response
+            last_modified: Last-Modified validator from the response
+        """
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = CacheEntry(value, size, self._clock() - age, ttl, etag, last_modified)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def validators(self, key: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """Return (etag, last_modified) for a held entry of any age, if it has any"""
+        entry = self._entries.get(key)
+        if entry is None or (entry.etag is None and entry.last_modified is None):
+            return None
+        return entry.etag, entry.last_modified
+
+    def revalidate(self, key: str, ttl: float) -> Any:
+        """Mark a held entry fresh again after the backend confirmed it unchanged
+
+        Returns:
+            The cached value, or None if the entry was evicted meanwhile
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.stored_at = self._clock()
+        entry.ttl = ttl
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop a single key, or everything when no key is given"""
+        if key is None:
+            self._entries.clear()
+            self._bytes = 0
+        elif key in self._entries:
+            self._remove(key)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and current usage"""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
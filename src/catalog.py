@@ -0,0 +1,456 @@
+"""In-memory mirror of the approved MCP server catalog"""
+
+import asyncio
+import bisect
+import inspect
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .client import extract_servers
+from .config import config
+from .leaderboard import ContributorLeaderboard
+from .models import ServerRecord
+
+logger = logging.getLogger(__name__)
+
+# Sort fields supported by the backend listing endpoint
+SORT_FIELDS = ("favorites", "created_at")
+
+# Deltas touching more than this fraction of the catalog rebuild the
+# orderings with a sort instead of per-server bisect updates
+_REBUILD_FRACTION = 0.1
+
+
+def _sort_key(sort: str):
+    if sort == "favorites":
+        return lambda s: (s.get("favorites_count") or 0, s.get("id") or 0)
+    return lambda s: (s.get("created_at") or "", s.get("id") or 0)
+
+
+class CatalogSnapshot:
+    """Immutable view of the catalog at one point in time
+
+    Snapshots are fully built before they are published, so readers holding
+    a reference never observe a partially refreshed catalog.
+    """
+
+    def __init__(self, servers: List[Dict[str, Any]], details: Optional[Dict[int, Dict[str, Any]]] = None):
+        """Build snapshot and precompute orderings
+
+        Args:
+            servers: Server summaries as returned by the listing endpoint
+            details: Detail payloads keyed by server ID
+        """
+        self.servers: Dict[int, Dict[str, Any]] = {s["id"]: s for s in servers}
+        self.details: Dict[int, Dict[str, Any]] = details or {}
+        # Ascending orderings; descending is served by walking them backwards
+        self._ascending = {
+            sort: sorted(self.servers.values(), key=_sort_key(sort))
+            for sort in SORT_FIELDS
+        }
+
+    def __len__(self) -> int:
+        return len(self.servers)
+
+    @property
+    def watermark(self) -> Optional[Tuple[str, int]]:
+        """(created_at, id) of the newest server, or None when empty"""
+        newest = self._ascending["created_at"]
+        return _sort_key("created_at")(newest[-1]) if newest else None
+
+    def apply(
+        self,
+        upserts: List[Dict[str, Any]],
+        details: Optional[Dict[int, Dict[str, Any]]] = None,
+        removed: Iterable[int] = ()
+    ) -> "CatalogSnapshot":
+        """Return a new snapshot with a delta applied
+
+        This snapshot is left untouched. Small deltas update copies of the
+        sorted orderings with bisect instead of re-sorting the catalog.
+
+        Args:
+            upserts: Added or modified server summaries
+            details: Detail payloads for the upserted servers
+            removed: IDs of servers to drop
+        """
+        removed = [i for i in removed if i in self.servers]
+        if len(upserts) + len(removed) > len(self.servers) * _REBUILD_FRACTION:
+            servers = dict(self.servers)
+            for server_id in removed:
+                del servers[server_id]
+            servers.update((s["id"], s) for s in upserts)
+            # Upserted servers only keep details fetched for this delta
+            upserted = {s["id"] for s in upserts}
+            merged = {i: d for i, d in self.details.items() if i in servers and i not in upserted}
+            merged.update(details or {})
+            return CatalogSnapshot(list(servers.values()), merged)
+
+        snapshot = CatalogSnapshot.__new__(CatalogSnapshot)
+        snapshot.servers = dict(self.servers)
+        snapshot.details = dict(self.details)
+        snapshot._ascending = {sort: list(ordered) for sort, ordered in self._ascending.items()}
+
+        for server_id in removed + [s["id"] for s in upserts if s["id"] in self.servers]:
+            snapshot._discard(snapshot.servers.pop(server_id))
+            snapshot.details.pop(server_id, None)
+        for server in upserts:
+            snapshot.servers[server["id"]] = server
+            for sort, ordered in snapshot._ascending.items():
+                bisect.insort(ordered, server, key=_sort_key(sort))
+        snapshot.details.update(details or {})
+        return snapshot
+
+    def _discard(self, server: Dict[str, Any]) -> None:
+        for sort, ordered in self._ascending.items():
+            key = _sort_key(sort)
+            index = bisect.bisect_left(ordered, key(server), key=key)
+            if index < len(ordered) and ordered[index] is server:
+                del ordered[index]
+
+    def diff(self, previous: Optional["CatalogSnapshot"]) -> Tuple[List[int], List[int]]:
+        """Compare against an older snapshot
+
+        Returns:
+            Tuple of (added or modified IDs, removed IDs)
+        """
+        if previous is None:
+            return list(self.servers), []
+
+        changed = [
+            server_id for server_id, server in self.servers.items()
+            if previous.servers.get(server_id) != server
+            or previous.details.get(server_id) != self.details.get(server_id)
+        ]
+        removed = [server_id for server_id in previous.servers if server_id not in self.servers]
+        return changed, removed
+
+    def page(self, sort: str, order: str, limit: int, offset: int) -> List[Dict[str, Any]]:
+        """Return one page using the backend's sort/order/limit/offset semantics"""
+        ordered = self._ascending[sort]
+        offset = max(offset, 0)
+        limit = max(limit, 0)
+        if order == "asc":
+            return ordered[offset:offset + limit]
+
+        end = len(ordered) - offset
+        if end <= 0:
+            return []
+        start = max(end - limit, 0)
+        return ordered[start:end][::-1]
+
+
+class CatalogMirror:
+    """Background-refreshed local copy of the approved catalog
+
+    Servers are held as compact ServerRecord objects parsed once on arrival.
+    Syncs bypass the response cache: they need current data, and sweeping
+    the whole catalog through it would evict the entries user calls reuse.
+
+    Exposes the read methods of APIClient used by the list/top/detail and
+    top-contributor tools. Top-N answers are slices of orderings and
+    leaderboards that are updated as deltas arrive, so they cost O(limit).
+    Until the first snapshot is published (cold mirror), or for requests the
+    mirror cannot answer, calls fall through to the live API.
+
+    Each tick pages the listing newest-first from the created_at watermark
+    and applies only the new servers as a delta. It also re-reads the first
+    ``favorites_pages`` pages sorted by favorites, so count changes at the
+    top of the favorites ordering show up within a tick; changes further
+    down wait for the full sync. Every ``full_sync_interval`` seconds a full reconciliation pages the whole
+    listing to pick up deletions and edits of older servers; it re-fetches
+    details only for servers whose listing entry changed.
+    """
+
+    def __init__(
+        self,
+        api_client,
+        refresh_interval: Optional[float] = None,
+        full_sync_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize mirror
+
+        Args:
+            api_client: APIClient used to page through the backend
+            refresh_interval: Seconds between refreshes (defaults to config)
+            full_sync_interval: Seconds between full reconciliations (defaults to config)
+            clock: Monotonic time source (overridable for tests)
+        """
+        self.api_client = api_client
+        self.refresh_interval = refresh_interval if refresh_interval is not None else config.mirror_refresh_interval
+        self.page_size = config.mirror_page_size
+        self.fetch_details = config.mirror_fetch_details
+        self.detail_concurrency = config.mirror_detail_concurrency
+        self.full_sync_interval = (
+            full_sync_interval if full_sync_interval is not None else config.mirror_full_sync_interval
+        )
+        self.favorites_pages = config.mirror_favorites_pages
+        self._clock = clock
+
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable] = []
+        self._contributors = ContributorLeaderboard()
+        self._last_full_sync: Optional[float] = None
+
+        self.full_syncs = 0
+        self.delta_syncs = 0
+        self.delta_pages = 0
+        self.details_fetched = 0
+        self.details_failed = 0
+
+    @property
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        """Currently published snapshot, or None while cold"""
+        return self._snapshot
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether a snapshot has been published"""
+        return self._snapshot is not None
+
+    def add_listener(self, listener: Callable) -> None:
+        """Register a callback invoked after each published snapshot
+
+        The callback receives (snapshot, changed_ids, removed_ids) and is
+        used by local indexes to apply catalog changes incrementally. It may
+        be a coroutine function; it is awaited before the next sync starts.
+        """
+        self._listeners.append(listener)
+
+    async def start(self):
+        """Start the background refresh loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background refresh loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def sync(self) -> CatalogSnapshot:
+        """Run a delta sync, or a full refresh when cold or when one is due"""
+        if (
+            self._snapshot is None
+            or self._last_full_sync is None
+            or self._clock() - self._last_full_sync >= self.full_sync_interval
+        ):
+            return await self.refresh()
+        return await self.refresh_delta()
+
+    async def refresh(self) -> CatalogSnapshot:
+        """Page through the whole listing, build a new snapshot and publish it
+
+        Details of servers whose listing entry is unchanged are carried over
+        from the previous snapshot instead of being fetched again.
+        """
+        previous = self._snapshot
+        servers = await self._fetch_all_servers()
+
+        details = {}
+        if self.fetch_details:
+            stale = servers
+            if previous is not None:
+                stale = []
+                for server in servers:
+                    server_id = server["id"]
+                    if previous.servers.get(server_id) == server and server_id in previous.details:
+                        details[server_id] = previous.details[server_id]
+                    else:
+                        stale.append(server)
+            details.update(await self._fetch_details(stale))
+
+        snapshot = CatalogSnapshot(servers, details)
+        self._last_full_sync = self._clock()
+        self.full_syncs += 1
+        logger.info("Catalog mirror refreshed (%d servers)", len(snapshot))
+
+        changed, removed = snapshot.diff(previous)
+        await self._publish(snapshot, changed, removed, force=previous is None)
+        return snapshot
+
+    async def refresh_delta(self) -> CatalogSnapshot:
+        """Fetch servers created since the watermark and apply them as a delta
+
+        Pages the listing newest-first and stops at the first page reaching
+        servers already mirrored, then reads the first ``favorites_pages``
+        pages of the most-favorited listing. Entries on those pages that
+        differ from the mirrored copy are applied too. Deletions and edits
+        elsewhere are left to the next full refresh.
+        """
+        previous = self._snapshot
+        if previous is None:
+            return await self.refresh()
+
+        watermark = previous.watermark
+        newest_first = _sort_key("created_at")
+        upserts: Dict[int, ServerRecord] = {}
+
+        def collect(page: List[Dict[str, Any]]) -> List[ServerRecord]:
+            records = [ServerRecord.from_dict(server) for server in page]
+            for server in records:
+                if previous.servers.get(server["id"]) != server:
+                    upserts[server["id"]] = server
+            return records
+
+        offset = 0
+        while True:
+            page = collect(await self._fetch_page("created_at", offset))
+            reached = watermark is not None and any(newest_first(s) <= watermark for s in page)
+            if reached or len(page) < self.page_size:
+                break
+            offset += len(page)
+
+        # Favorite counts of older servers change without moving the watermark
+        for number in range(self.favorites_pages):
+            page = collect(await self._fetch_page("favorites", number * self.page_size))
+            if len(page) < self.page_size:
+                break
+
+        self.delta_syncs += 1
+        if not upserts:
+            return previous
+
+        servers = list(upserts.values())
+        details = await self._fetch_details(servers) if self.fetch_details else {}
+        snapshot = previous.apply(servers, details)
+        logger.info("Catalog mirror applied delta (%d servers)", len(servers))
+        await self._publish(snapshot, list(upserts), [])
+        return snapshot
+
+    def stats(self) -> Dict[str, int]:
+        """Return sync counters and the mirrored catalog size"""
+        snapshot = self._snapshot
+        return {
+            "servers": len(snapshot) if snapshot is not None else 0,
+            "contributors": len(self._contributors),
+            "full_syncs": self.full_syncs,
+            "delta_syncs": self.delta_syncs,
+            "delta_pages": self.delta_pages,
+            "details_fetched": self.details_fetched,
+            "details_failed": self.details_failed,
+        }
+
+    async def _publish(
+        self,
+        snapshot: CatalogSnapshot,
+        changed: List[int],
+        removed: List[int],
+        force: bool = False
+    ) -> None:
+        # Single reference assignment: readers see the old or the new snapshot
+        self._snapshot = snapshot
+        self._contributors.apply_changes(snapshot, changed, removed)
+        if changed or removed or force:
+            await self._notify(snapshot, changed, removed)
+
+    async def _notify(self, snapshot: CatalogSnapshot, changed: List[int], removed: List[int]) -> None:
+        for listener in self._listeners:
+            try:
+                result = listener(snapshot, changed, removed)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error("Catalog listener failed: %s", e, exc_info=True)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Catalog mirror refresh failed: %s", e)
+            await asyncio.sleep(self.refresh_interval)
+
+    async def _fetch_page(self, sort: str, offset: int) -> List[Dict[str, Any]]:
+        # Newest or most-favorited first, bypassing the response cache
+        page = extract_servers(await self.api_client.list_servers(
+            sort=sort,
+            order="desc",
+            limit=self.page_size,
+            offset=offset,
+            use_cache=False
+        ))
+        self.delta_pages += 1
+        return page
+
+    async def _fetch_all_servers(self) -> List[ServerRecord]:
+        return [
+            ServerRecord.from_dict(server) async for server in self.api_client.iter_servers(
+                sort="created_at",
+                order="asc",
+                page_size=self.page_size,
+                use_cache=False
+            )
+        ]
+
+    async def _fetch_details(self, servers: List[ServerRecord]) -> Dict[int, ServerRecord]:
+        # Servers whose detail call fails (e.g. deleted since the listing was
+        # read) are left out: they are mirrored from their listing entry,
+        # detail lookups fall through to the API, and the next full sync
+        # fetches them again
+        semaphore = asyncio.Semaphore(self.detail_concurrency)
+
+        async def fetch(server_id: int):
+            async with semaphore:
+                return await self.api_client.get_server_details(server_id, use_cache=False)
+
+        results = await asyncio.gather(*(fetch(s.id) for s in servers), return_exceptions=True)
+        details = {}
+        failed = []
+        for server, data in zip(servers, results):
+            if isinstance(data, Exception):
+                failed.append((server.id, data))
+            else:
+                # Details share unchanged field values and tags with the listing entry
+                details[server.id] = ServerRecord.from_dict(data, base=server)
+        self.details_fetched += len(details)
+        if failed:
+            self.details_failed += len(failed)
+            server_id, error = failed[0]
+            logger.warning(
+                "Failed to fetch details for %d of %d servers (server %s: %s)",
+                len(failed), len(servers), server_id, error
+            )
+        return details
+
+    async def list_servers(
+        self,
+        sort: str = "favorites",
+        order: str = "desc",
+        limit: int = 20,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """List servers from the mirror, falling back to the API when cold"""
+        snapshot = self._snapshot
+        if snapshot is None or sort not in SORT_FIELDS:
+            return await self.api_client.list_servers(sort=sort, order=order, limit=limit, offset=offset)
+        return {"servers": snapshot.page(sort, order, limit, offset)}
+
+    async def get_top_servers(self, limit: int = 3, sort: str = "favorites") -> Dict[str, Any]:
+        """Get top servers from the mirror, falling back to the API when cold"""
+        snapshot = self._snapshot
+        if snapshot is None or sort not in SORT_FIELDS:
+            return await self.api_client.get_top_servers(limit=limit, sort=sort)
+        return {"servers": snapshot.page(sort, "desc", limit, 0)}
+
+    async def get_server_details(self, server_id: int) -> Dict[str, Any]:
+        """Get server details from the mirror, falling back to the API on a miss"""
+        snapshot = self._snapshot
+        if snapshot is not None and server_id in snapshot.details:
+            return snapshot.details[server_id]
+        return await self.api_client.get_server_details(server_id)
+
+    async def get_top_contributors(self, limit: int = 3) -> Dict[str, Any]:
+        """Get top contributors from the mirror, falling back to the API when unavailable"""
+        if self._snapshot is None or not self._contributors.is_ready:
+            return await self.api_client.get_top_contributors(limit=limit)
+        return self._contributors.top(limit)
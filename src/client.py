@@ -1,62 +1,504 @@
 """HTTP API client for MCP Hub backend"""
 
+import asyncio
+import importlib.util
 import logging
-from typing import Any, Dict, Optional
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 import httpx
 
+from .cache import FRESH, MISS, STALE, ResponseCache, endpoint_kind, make_key
 from .config import config
+from . import metrics
+from .resilience import CircuitBreaker, CircuitOpenError, LatencyWindow, backoff_delay, is_backend_failure
+from .singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from .shared_cache import SharedCacheStore
 
 logger = logging.getLogger(__name__)
 
 
+# Returned by APIClient._send in place of a body for 304 Not Modified
+NOT_MODIFIED = object()
+
+
+def extract_servers(data: Any) -> List[Dict[str, Any]]:
+    """Return the server list from a backend listing response"""
+    return data if isinstance(data, list) else data.get("servers", [])
+
+
+def _listing_params(sort: str, order: str, limit: int, offset: int) -> Dict[str, Any]:
+    """Query parameters of an approved-servers listing page"""
+    return {
+        "status": "approved",
+        "sort": sort,
+        "order": order,
+        "limit": limit,
+        "offset": offset
+    }
+
+
+def _conditional_headers(validators: Optional[tuple]) -> Optional[Dict[str, str]]:
+    """Build If-None-Match / If-Modified-Since headers from stored validators"""
+    if not validators:
+        return None
+    etag, last_modified = validators
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _response_validators(response: httpx.Response) -> Optional[tuple]:
+    """Return (etag, last_modified) from a response, or None if it has neither"""
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    if etag is None and last_modified is None:
+        return None
+    return etag, last_modified
+
+
 class APIClient:
     """Client for MCP Hub API"""
 
     def __init__(self):
         """Initialize API client with configuration"""
         self.base_url = config.api_base_url
+
+        http2 = config.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+
+        self.limits = httpx.Limits(
+            max_connections=config.http_max_connections,
+            max_keepalive_connections=config.http_max_keepalive,
+            keepalive_expiry=config.http_keepalive_expiry
+        )
         self.client = httpx.AsyncClient(
-            timeout=config.api_timeout,
+            timeout=httpx.Timeout(
+                config.api_timeout,
+                connect=config.http_connect_timeout,
+                read=config.http_read_timeout,
+                pool=config.http_pool_timeout
+            ),
+            limits=self.limits,
+            http2=http2,
             verify=config.verify_ssl,
             follow_redirects=True
         )
 
+        # Response cache (None when disabled)
+        self.cache: Optional[ResponseCache] = None
+        if config.cache_enabled:
+            self.cache = ResponseCache(
+                max_entries=config.cache_max_entries,
+                max_bytes=config.cache_max_bytes,
+                stale_ttl=config.cache_stale_ttl,
+                error_ttl=config.cache_stale_if_error
+            )
+        # On-disk cache shared with other workers and kept across restarts
+        # (None when not configured)
+        self.shared: Optional["SharedCacheStore"] = None
+        if config.cache_enabled and config.shared_cache_path:
+            from .shared_cache import SharedCacheStore
+
+            self.shared = SharedCacheStore(
+                config.shared_cache_path,
+                stale_ttl=config.cache_disk_stale_ttl,
+                max_bytes=config.cache_disk_max_bytes,
+                namespace=config.api_base_url
+            )
+        self._ttls = config.cache_ttls
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+        # Coalesces concurrent identical requests into one HTTP call
+        self._inflight = SingleFlight()
+
+        # Resilience: per-endpoint circuit breakers and latency windows
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latency: Dict[str, LatencyWindow] = {}
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.short_circuits = 0
+        self.stale_if_error = 0
+        self.revalidations = 0
+
         if not config.verify_ssl:
             logger.warning("SSL certificate verification is disabled")
 
     async def close(self):
         """Close HTTP client"""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._inflight.cancel_all()
         await self.client.aclose()
+        if self.shared is not None:
+            self.shared.close()
+
+    async def warm_up(self, connections: int) -> int:
+        """Open keep-alive connections to the backend ahead of traffic
+
+        Issues concurrent HEAD requests so the pool holds ``connections``
+        established (TLS-negotiated) connections.
+
+        Args:
+            connections: Number of connections to open
+
+        Returns:
+            Number of idle connections in the pool afterwards
+        """
+        async def ping():
+            try:
+                await self.client.head(self.base_url)
+            except Exception as e:
+                logger.warning("Connection warm-up request failed: %s", e)
+
+        await asyncio.gather(*(ping() for _ in range(connections)))
+        return self.pool_stats()["idle"]
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Return connection pool utilization
 
-    async def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        Returns:
+            Dict with connection counts (in_use, idle), queued requests
+            waiting for a connection (waiters) and the configured maximum
+        """
+        pool = getattr(self.client._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for c in connections if c.is_idle())
+        waiters = sum(1 for r in getattr(pool, "_requests", []) if r.is_queued())
+        return {
+            "connections": len(connections),
+            "in_use": len(connections) - idle,
+            "idle": idle,
+            "waiters": waiters,
+            "max_connections": self.limits.max_connections,
+        }
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return response cache counters"""
+        if self.cache is None:
+            return {}
+        stats = self.cache.stats()
+        stats["refreshes"] = self.refreshes
+        stats["refresh_errors"] = self.refresh_errors
+        stats["revalidations"] = self.revalidations
+        return stats
+
+    def shared_cache_stats(self) -> Dict[str, int]:
+        """Return shared cache counters"""
+        if self.shared is None:
+            return {}
+        return self.shared.stats()
+
+    def coalescing_stats(self) -> Dict[str, int]:
+        """Return single-flight counters"""
+        return self._inflight.stats()
+
+    def resilience_stats(self) -> Dict[str, int]:
+        """Return retry, hedging and circuit breaker counters"""
+        return {
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "short_circuits": self.short_circuits,
+            "stale_if_error": self.stale_if_error,
+            "circuit_opens": sum(b.opens for b in self._breakers.values()),
+            "circuits_open": sum(1 for b in self._breakers.values() if b.state != "closed"),
+        }
+
+    async def _get(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
         """Make GET request to API"""
-        url = f"{self.base_url}{endpoint}"
-        try:
-            logger.debug(f"GET {url} with params: {params}")
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error: {e.response.status_code} - {e.response.text}")
-            raise
-        except Exception as e:
-            logger.error(f"Request error: {str(e)}")
-            raise
+        if not use_cache:
+            return await self._uncached("GET", endpoint, params)
+        return await self._cached("GET", endpoint, params)
 
     async def _post(self, endpoint: str, json_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make POST request to API"""
+        return await self._cached("POST", endpoint, json_data)
+
+    async def _cached(self, method: str, endpoint: str, payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Serve a request from the response cache, fetching on miss
+
+        Stale entries are returned immediately while a background task
+        refreshes them. Local misses fall back to the shared cache, if any.
+        Concurrent misses for the same key share a single backend call.
+        """
+        key = make_key(method, endpoint, payload)
+        if self.cache is not None:
+            state, value = self.cache.lookup(key)
+            if state == MISS and self.shared is not None:
+                state, value = self._lookup_shared(key)
+            if state == FRESH:
+                return value
+            if state == STALE:
+                self._schedule_refresh(key, method, endpoint, payload)
+                return value
+
+        try:
+            return await self._inflight.do(
+                key, lambda: self._fetch_and_store(key, method, endpoint, payload)
+            )
+        except Exception as e:
+            if self.cache is None or not (isinstance(e, CircuitOpenError) or is_backend_failure(e)):
+                raise
+            fallback = self.cache.fallback(key)
+            if fallback is None:
+                raise
+            logger.warning("Serving expired response for %s %s: %s", method, endpoint, e)
+            self.stale_if_error += 1
+            return fallback
+
+    def _is_fresh(self, method: str, endpoint: str, payload: Optional[Dict[str, Any]]) -> bool:
+        return self.cache is not None and self.cache.is_fresh(make_key(method, endpoint, payload))
+
+    async def _uncached(self, method: str, endpoint: str, payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Fetch current data from the backend without reading or filling the cache
+
+        For bulk syncs such as the catalog mirror, which must not be served
+        stale entries and would otherwise evict the entries user calls
+        reuse. Concurrent identical requests are still coalesced and sent
+        with retries and circuit breakers.
+        """
+        key = make_key(method, endpoint, payload)
+        return await self._inflight.do(key, lambda: self._fetch(method, endpoint, payload))
+
+    async def _fetch(self, method: str, endpoint: str, payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        data, _, _ = await self._send_resilient(method, endpoint, payload)
+        return data
+
+    def _lookup_shared(self, key: str) -> tuple[str, Any]:
+        """Look up a key in the shared cache and copy hits into the local one"""
+        entry = self.shared.get(key)
+        if entry is None:
+            return MISS, None
+        value, size, age, ttl, etag, last_modified = entry
+        self.cache.set(key, value, size, ttl, age=age, etag=etag, last_modified=last_modified)
+        return (FRESH if age < ttl else STALE), value
+
+    async def _fetch_and_store(
+        self,
+        key: str,
+        method: str,
+        endpoint: str,
+        payload: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Fetch from the backend and store the result in the cache
+
+        GETs for entries the cache still holds are sent as conditional
+        requests; a 304 marks the held, already-parsed value fresh again.
+        """
+        if self.cache is None:
+            return await self._fetch(method, endpoint, payload)
+
+        ttl = self._ttls.get(endpoint_kind(endpoint), 0.0)
+        validators = self.cache.validators(key) if method == "GET" else None
+        data, size, new_validators = await self._send_resilient(method, endpoint, payload, validators)
+        if data is NOT_MODIFIED:
+            value = self.cache.revalidate(key, ttl)
+            if value is not None:
+                self.revalidations += 1
+                if self.shared is not None:
+                    self.shared.touch(key, ttl)
+                return value
+            # Evicted while the request was in flight: fetch unconditionally
+            data, size, new_validators = await self._send_resilient(method, endpoint, payload)
+
+        etag, last_modified = new_validators or (None, None)
+        self.cache.set(key, data, size, ttl, etag=etag, last_modified=last_modified)
+        if self.shared is not None:
+            self.shared.set(key, data, size, ttl, etag=etag, last_modified=last_modified)
+        return data
+
+    def _schedule_refresh(self, key: str, method: str, endpoint: str, payload: Optional[Dict[str, Any]]) -> None:
+        """Start a background refresh for a stale key unless one is running"""
+        if key in self._refreshing or key in self._inflight:
+            return
+
+        async def refresh():
+            try:
+                await self._inflight.do(
+                    key, lambda: self._fetch_and_store(key, method, endpoint, payload)
+                )
+                self.refreshes += 1
+            except Exception:
+                # _send already logged the failure; keep serving stale data
+                self.refresh_errors += 1
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    async def _send_resilient(
+        self,
+        method: str,
+        endpoint: str,
+        payload: Optional[Dict[str, Any]],
+        validators: Optional[tuple] = None
+    ) -> tuple[Any, int, Optional[tuple]]:
+        """Send a request through the endpoint's circuit breaker
+
+        GET requests are idempotent, so backend failures are retried with
+        jittered exponential backoff and slow responses may be hedged.
+        POST requests are sent once.
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open
+        """
+        label = metrics.endpoint_label(endpoint)
+        breaker = self._breakers.get(label)
+        if breaker is None:
+            breaker = self._breakers[label] = CircuitBreaker(
+                failure_threshold=config.circuit_failure_threshold,
+                reset_timeout=config.circuit_reset_timeout
+            )
+
+        attempts = 1 + (config.retry_attempts if method == "GET" else 0)
+        for attempt in range(attempts):
+            if not breaker.allow():
+                self.short_circuits += 1
+                raise CircuitOpenError(f"Backend endpoint {label} is unavailable (circuit open)")
+            try:
+                if method == "GET" and config.hedge_enabled:
+                    result = await self._send_hedged(method, endpoint, payload, label, validators)
+                else:
+                    result = await self._send(method, endpoint, payload, validators)
+            except Exception as e:
+                if not is_backend_failure(e):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if attempt + 1 >= attempts:
+                    raise
+                self.retries += 1
+                await asyncio.sleep(backoff_delay(attempt, config.retry_backoff_base, config.retry_backoff_max))
+            else:
+                breaker.record_success()
+                return result
+
+    async def _send_hedged(
+        self,
+        method: str,
+        endpoint: str,
+        payload: Optional[Dict[str, Any]],
+        label: str,
+        validators: Optional[tuple] = None
+    ) -> tuple[Any, int, Optional[tuple]]:
+        """Send a request, and a second copy if the first is slower than usual
+
+        The backup request is sent once the first has been outstanding for
+        the endpoint's recent hedge-percentile latency; whichever succeeds
+        first wins and the other is cancelled.
+        """
+        window = self._latency.get(label)
+        delay = window.percentile(config.hedge_percentile) if window is not None else None
+        if delay is None:
+            return await self._send(method, endpoint, payload, validators)
+
+        tasks = [asyncio.create_task(self._send(method, endpoint, payload, validators))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=max(delay, config.hedge_min_delay))
+            if not done:
+                self.hedges += 1
+                tasks.append(asyncio.create_task(self._send(method, endpoint, payload, validators)))
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        payload: Optional[Dict[str, Any]],
+        validators: Optional[tuple] = None
+    ) -> tuple[Any, int, Optional[tuple]]:
+        """Send a request to the API
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint path relative to the base URL
+            payload: Query parameters (GET) or JSON body (POST)
+            validators: (etag, last_modified) of a held response to
+                revalidate with If-None-Match / If-Modified-Since
+
+        Returns:
+            Tuple of (parsed JSON body, raw body size in bytes, response
+            validators or None). The body is NOT_MODIFIED on a 304.
+        """
         url = f"{self.base_url}{endpoint}"
+        label = metrics.endpoint_label(endpoint)
+        start = time.perf_counter()
+        status = "error"
         try:
-            logger.debug(f"POST {url} with data: {json_data}")
-            response = await self.client.post(url, json=json_data)
+            if method == "GET":
+                logger.debug("GET %s with params: %s", url, payload)
+                response = await self.client.get(url, params=payload, headers=_conditional_headers(validators))
+            else:
+                logger.debug("POST %s with data: %s", url, payload)
+                response = await self.client.post(url, json=payload)
+            status = str(response.status_code)
+            if response.status_code == 304 and validators:
+                self._observe_latency(label, time.perf_counter() - start)
+                return NOT_MODIFIED, 0, validators
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            self._observe_latency(label, time.perf_counter() - start)
+            return data, len(response.content), _response_validators(response)
+        except asyncio.CancelledError:
+            # Losing hedged request or caller gave up
+            status = "cancelled"
+            raise
         except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error: {e.response.status_code} - {e.response.text}")
+            logger.error(
+                "HTTP error %d from %s %s",
+                e.response.status_code, method, label,
+                extra={"duration_ms": round((time.perf_counter() - start) * 1000, 1)}
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                # Decoding the body is only worth it when someone reads it
+                logger.debug("Error response body: %.500s", e.response.text)
+            metrics.BACKEND_ERRORS.labels(method, label, "http_status").inc()
             raise
         except Exception as e:
-            logger.error(f"Request error: {str(e)}")
+            logger.error(
+                "Request error for %s %s: %s",
+                method, label, e,
+                extra={"duration_ms": round((time.perf_counter() - start) * 1000, 1)}
+            )
+            metrics.BACKEND_ERRORS.labels(method, label, type(e).__name__).inc()
             raise
+        finally:
+            metrics.BACKEND_DURATION.labels(method, label, status).observe(time.perf_counter() - start)
+
+    def _observe_latency(self, label: str, seconds: float) -> None:
+        window = self._latency.get(label)
+        if window is None:
+            window = self._latency[label] = LatencyWindow()
+        window.observe(seconds)
 
     async def search_servers(self, keyword: Optional[str] = None, tags: Optional[list[str]] = None) -> Dict[str, Any]:
         """Search MCP servers by keyword and/or tags"""
@@ -72,21 +514,90 @@ class APIClient:
         sort: str = "favorites",
         order: str = "desc",
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
-        """List MCP servers with pagination and sorting"""
-        params = {
-            "status": "approved",
-            "sort": sort,
-            "order": order,
-            "limit": limit,
-            "offset": offset
-        }
-        return await self._get("/mcp-servers/", params)
+        """List MCP servers with pagination and sorting
+
+        Args:
+            use_cache: Set to False to bypass the response cache (bulk syncs)
+        """
+        return await self._get("/mcp-servers/", _listing_params(sort, order, limit, offset), use_cache=use_cache)
+
+    def has_fresh_listing(self, sort: str, order: str, limit: int, offset: int) -> bool:
+        """Whether list_servers() would be answered from the local cache without a fetch"""
+        return self._is_fresh("GET", "/mcp-servers/", _listing_params(sort, order, limit, offset))
+
+    def has_fresh_details(self, server_id: int) -> bool:
+        """Whether get_server_details() would be answered from the local cache without a fetch"""
+        return self._is_fresh("GET", f"/mcp-servers/{server_id}", None)
+
+    async def iter_servers(
+        self,
+        sort: str = "favorites",
+        order: str = "desc",
+        page_size: Optional[int] = None,
+        max_buffered_pages: Optional[int] = None,
+        use_cache: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over every approved server, page by page
+
+        The next page is fetched in the background while the current one is
+        consumed. At most ``max_buffered_pages`` fetched pages are held
+        before the reader catches up, and iteration stops on the first short
+        page.
+
+        Args:
+            sort: Sort field ('favorites' or 'created_at')
+            order: Sort order ('asc' or 'desc')
+            page_size: Servers per backend request (defaults to config)
+            max_buffered_pages: Read-ahead depth (defaults to config)
+            use_cache: Set to False to bypass the response cache
+
+        Yields:
+            Server payloads in listing order
+        """
+        page_size = page_size or config.iter_page_size
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered_pages or config.iter_buffered_pages)
+
+        async def produce():
+            offset = 0
+            try:
+                while True:
+                    data = await self.list_servers(
+                        sort=sort, order=order, limit=page_size, offset=offset, use_cache=use_cache
+                    )
+                    page = extract_servers(data)
+                    await queue.put(page)
+                    if len(page) < page_size:
+                        break
+                    offset += len(page)
+            except Exception as e:
+                await queue.put(e)
+                return
+            await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                page = await queue.get()
+                if page is None:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                for server in page:
+                    yield server
+        finally:
+            producer.cancel()
+
+    async def get_server_details(self, server_id: int, use_cache: bool = True) -> Dict[str, Any]:
+        """Get detailed information about a specific server
 
-    async def get_server_details(self, server_id: int) -> Dict[str, Any]:
-        """Get detailed information about a specific server"""
-        return await self._get(f"/mcp-servers/{server_id}")
+        Args:
+            server_id: Server ID
+            use_cache: Set to False to bypass the response cache (bulk syncs)
+        """
+        return await self._get(f"/mcp-servers/{server_id}", use_cache=use_cache)
 
     async def get_top_servers(self, limit: int = 3, sort: str = "favorites") -> Dict[str, Any]:
         """Get top servers by favorites or created_at"""
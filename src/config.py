@@ -4,6 +4,11 @@ import os
 from typing import Optional
 
 
+def _env_bool(name: str, default: str) -> bool:
+    """Read a boolean flag from the environment"""
+    return os.getenv(name, default).lower() not in ("false", "0", "no")
+
+
 class Config:
     """Application configuration"""
 
@@ -19,14 +24,109 @@ class Config:
         # Server Configuration
         self.server_host = os.getenv("HOST", "0.0.0.0")
         self.server_port = int(os.getenv("PORT", "8080"))
+        # Streamable HTTP: plain JSON responses instead of SSE streams
+        self.streamable_http_json_response = _env_bool("STREAMABLE_HTTP_JSON_RESPONSE", "false")
+        # Streamable HTTP: key per-session limits on the proxy-appended X-Forwarded-For address
+        self.trust_forwarded_for = _env_bool("TRUST_FORWARDED_FOR", "false")
+        # Worker processes sharing the listening socket (streamable-http only)
+        self.workers = int(os.getenv("WORKERS", "1"))
+        self.worker_shutdown_timeout = float(os.getenv("WORKER_SHUTDOWN_TIMEOUT", "30"))
+
+        # HTTP client (connection pool and timeouts)
+        self._api_timeout = float(os.getenv("API_TIMEOUT", "30"))
+        self.http_connect_timeout = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+        self.http_read_timeout = float(os.getenv("HTTP_READ_TIMEOUT", str(self._api_timeout)))
+        self.http_pool_timeout = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))
+        self.http_max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+        self.http_max_keepalive = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+        self.http_keepalive_expiry = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+        self.http2 = _env_bool("HTTP2", "false")
+        self.http_warmup_connections = int(os.getenv("HTTP_WARMUP_CONNECTIONS", "0"))
+
+        # Backend resilience
+        self.retry_attempts = int(os.getenv("RETRY_ATTEMPTS", "2"))
+        self.retry_backoff_base = float(os.getenv("RETRY_BACKOFF_BASE", "0.1"))
+        self.retry_backoff_max = float(os.getenv("RETRY_BACKOFF_MAX", "2.0"))
+        self.hedge_enabled = _env_bool("HEDGE_ENABLED", "false")
+        self.hedge_percentile = float(os.getenv("HEDGE_PERCENTILE", "0.95"))
+        self.hedge_min_delay = float(os.getenv("HEDGE_MIN_DELAY", "0.05"))
+        self.circuit_failure_threshold = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+        self.circuit_reset_timeout = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
 
         # Logging
         self.log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+        self.log_json = _env_bool("LOG_JSON", "false")
+        self.log_rate_limit = int(os.getenv("LOG_RATE_LIMIT", "10"))
+        self.log_rate_limit_interval = float(os.getenv("LOG_RATE_LIMIT_INTERVAL", "60"))
+        self.log_sample_every = int(os.getenv("LOG_SAMPLE_EVERY", "100"))
+
+        # Response cache
+        self.cache_enabled = _env_bool("CACHE_ENABLED", "true")
+        self.cache_max_entries = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+        self.cache_max_bytes = int(os.getenv("CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+        self.cache_stale_ttl = float(os.getenv("CACHE_STALE_TTL", "300"))
+        self.cache_ttls = {
+            "list": float(os.getenv("CACHE_TTL_LIST", "30")),
+            "search": float(os.getenv("CACHE_TTL_SEARCH", "30")),
+            "details": float(os.getenv("CACHE_TTL_DETAILS", "60")),
+            "contributors": float(os.getenv("CACHE_TTL_CONTRIBUTORS", "60")),
+        }
+        # Keep expired entries this much longer to answer when the backend fails
+        self.cache_stale_if_error = float(os.getenv("CACHE_STALE_IF_ERROR", "3600"))
+        # SQLite file shared by worker processes and kept across restarts
+        # (a temporary one is used when WORKERS > 1 and this is unset)
+        self.shared_cache_path: Optional[str] = os.getenv("SHARED_CACHE_PATH") or None
+        self.cache_disk_max_bytes = int(os.getenv("CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024)))
+        # Longer than CACHE_STALE_TTL so a restarted server starts warm and
+        # revalidates in the background
+        self.cache_disk_stale_ttl = float(os.getenv("CACHE_DISK_STALE_TTL", "3600"))
+
+        # Catalog pagination
+        self.iter_page_size = int(os.getenv("ITER_PAGE_SIZE", "100"))
+        self.iter_buffered_pages = int(os.getenv("ITER_BUFFERED_PAGES", "2"))
+
+        # Catalog mirror
+        self.mirror_enabled = _env_bool("MIRROR_ENABLED", "false")
+        self.mirror_refresh_interval = float(os.getenv("MIRROR_REFRESH_INTERVAL", "300"))
+        self.mirror_page_size = int(os.getenv("MIRROR_PAGE_SIZE", "100"))
+        self.mirror_fetch_details = _env_bool("MIRROR_FETCH_DETAILS", "true")
+        self.mirror_detail_concurrency = int(os.getenv("MIRROR_DETAIL_CONCURRENCY", "8"))
+        self.mirror_full_sync_interval = float(os.getenv("MIRROR_FULL_SYNC_INTERVAL", "3600"))
+        self.mirror_favorites_pages = int(os.getenv("MIRROR_FAVORITES_PAGES", "1"))
+
+        # Local search (requires the catalog mirror)
+        self.search_local = _env_bool("SEARCH_LOCAL", "true")
+        self.search_max_results = int(os.getenv("SEARCH_MAX_RESULTS", "50"))
+        self.search_fuzzy_min_results = int(os.getenv("SEARCH_FUZZY_MIN_RESULTS", "3"))
+        self.search_fuzzy_threshold = float(os.getenv("SEARCH_FUZZY_THRESHOLD", "0.4"))
+
+        # find_similar_servers (requires the catalog mirror, numpy and scipy)
+        self.similar_servers = _env_bool("SIMILAR_SERVERS", "true")
+        self.similar_max_results = int(os.getenv("SIMILAR_MAX_RESULTS", "20"))
+        self.similar_cache_max_entries = int(os.getenv("SIMILAR_CACHE_MAX_ENTRIES", "2048"))
+
+        # Admission control for tool calls (0 disables a cap)
+        self.max_in_flight = int(os.getenv("MAX_IN_FLIGHT", "64"))
+        self.max_in_flight_per_session = int(os.getenv("MAX_IN_FLIGHT_PER_SESSION", "8"))
+        self.max_queued = int(os.getenv("MAX_QUEUED", "256"))
+
+        # Rendered tool results reused for equivalent calls (0 disables)
+        self.result_cache_max_entries = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "512"))
+
+        # Batch tools
+        self.batch_concurrency = int(os.getenv("BATCH_CONCURRENCY", "5"))
+        self.batch_max_ids = int(os.getenv("BATCH_MAX_IDS", "50"))
+
+        # Speculative prefetch of next pages and top-result details
+        self.prefetch_enabled = _env_bool("PREFETCH_ENABLED", "false")
+        self.prefetch_detail_count = int(os.getenv("PREFETCH_DETAIL_COUNT", "3"))
+        self.prefetch_max_in_flight = int(os.getenv("PREFETCH_MAX_IN_FLIGHT", "4"))
+        self.prefetch_window = float(os.getenv("PREFETCH_WINDOW", "60"))
 
     @property
     def api_timeout(self) -> float:
-        """HTTP request timeout in seconds"""
-        return 30.0
+        """Default HTTP request timeout in seconds"""
+        return self._api_timeout
 
 
 # Global config instance
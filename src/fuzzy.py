@@ -0,0 +1,138 @@
+"""Typo-tolerant trigram matching over server names, tags and tool names"""
+
+import heapq
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Candidate vocabulary terms kept per query token, best similarity first
+_CANDIDATES_PER_TOKEN = 8
+
+# Terms in more than this fraction of documents say nothing about which
+# server was meant (e.g. "mcp") and are skipped
+_MAX_DF_FRACTION = 0.5
+
+
+def trigrams(term: str) -> Set[str]:
+    """Padded character trigrams of a term ("git" -> "  g", " gi", "git", "it ")"""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Trigram index over the distinct terms of indexed documents
+
+    Documents are reduced to weighted terms; trigrams index the vocabulary
+    rather than the documents, so lookups touch each distinct term once
+    however many servers share it. A query token is matched to the
+    vocabulary terms with the highest trigram similarity, and documents
+    score the sum over query tokens of their best ``similarity * weight *
+    idf``.
+    """
+
+    def __init__(self, threshold: float = 0.4):
+        """Initialize empty index
+
+        Args:
+            threshold: Minimum trigram similarity for a term to match
+        """
+        self.threshold = threshold
+
+        self._term_docs: Dict[str, Dict[int, int]] = {}
+        self._term_grams: Dict[str, Set[str]] = {}
+        self._gram_terms: Dict[str, Set[str]] = {}
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def upsert(self, doc_id: int, terms: Dict[str, int]) -> None:
+        """Add or replace a document's weighted terms"""
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+        for term, weight in terms.items():
+            docs = self._term_docs.get(term)
+            if docs is None:
+                docs = self._term_docs[term] = {}
+                grams = self._term_grams[term] = trigrams(term)
+                for gram in grams:
+                    self._gram_terms.setdefault(gram, set()).add(term)
+            docs[doc_id] = weight
+        self._doc_terms[doc_id] = tuple(terms)
+
+    def remove(self, doc_id: int) -> None:
+        """Remove a document if present"""
+        for term in self._doc_terms.pop(doc_id, ()):
+            docs = self._term_docs[term]
+            del docs[doc_id]
+            if docs:
+                continue
+            del self._term_docs[term]
+            for gram in self._term_grams.pop(term):
+                terms = self._gram_terms[gram]
+                terms.discard(term)
+                if not terms:
+                    del self._gram_terms[gram]
+
+    def match_terms(self, token: str) -> List[Tuple[float, str]]:
+        """Vocabulary terms similar to a token, as (similarity, term), best first"""
+        grams = trigrams(token)
+        shared: Dict[str, int] = {}
+        get = shared.get
+        for gram in grams:
+            for term in self._gram_terms.get(gram, ()):
+                shared[term] = get(term, 0) + 1
+
+        # Dice coefficient of the two trigram sets
+        size = len(grams)
+        term_grams = self._term_grams
+        matches = []
+        for term, count in shared.items():
+            score = 2.0 * count / (size + len(term_grams[term]))
+            if score >= self.threshold:
+                matches.append((score, term))
+        return heapq.nlargest(_CANDIDATES_PER_TOKEN, matches)
+
+    def search(
+        self,
+        tokens: Iterable[str],
+        limit: int = 20,
+        allowed: Optional[Set[int]] = None,
+        exclude: Iterable[int] = ()
+    ) -> List[int]:
+        """Rank documents by fuzzy similarity to the query tokens
+
+        Args:
+            tokens: Query tokens (already normalized)
+            limit: Maximum number of document IDs returned
+            allowed: Only consider these documents
+            exclude: Documents to leave out (e.g. already returned exact hits)
+
+        Returns:
+            Document IDs, best match first
+        """
+        n = len(self._doc_terms)
+        if not n:
+            return []
+        max_df = max(n * _MAX_DF_FRACTION, 1)
+        excluded = set(exclude)
+
+        scores: Dict[int, float] = {}
+        for token in set(tokens):
+            best: Dict[int, float] = {}
+            for sim, term in self.match_terms(token):
+                docs = self._term_docs[term]
+                if len(docs) > max_df:
+                    continue
+                idf = math.log(1.0 + n / len(docs))
+                for doc_id, weight in docs.items():
+                    score = sim * weight * idf
+                    if score > best.get(doc_id, 0.0):
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+        candidates = (
+            (score, doc_id) for doc_id, score in scores.items()
+            if doc_id not in excluded and (allowed is None or doc_id in allowed)
+        )
+        return [doc_id for _, doc_id in heapq.nlargest(limit, candidates)]
@@ -0,0 +1,143 @@
+"""Incrementally maintained leaderboards over the catalog mirror"""
+
+import bisect
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Listing fields that may carry a server's author, in order of preference
+AUTHOR_FIELDS = ("author", "username", "user_name", "owner")
+
+
+def author_of(server: Dict[str, Any]) -> Optional[str]:
+    """Return the author name from a server payload, if it has one"""
+    for field in AUTHOR_FIELDS:
+        value = server.get(field)
+        if isinstance(value, dict):
+            value = value.get("username") or value.get("name")
+        if value:
+            return str(value)
+    return None
+
+
+class RankedCounter:
+    """Per-key counts kept in rank order
+
+    Ranks are held in a list sorted by (-count, tie, key), updated with
+    bisect as counts change, so the top N is a slice rather than a sort.
+    Each key's tie value defaults to 0, so equal counts rank by key.
+    """
+
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+        self._ties: Dict[str, Any] = {}
+        self._ranked: List[Tuple[int, Any, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def add(self, key: str, delta: int = 1, tie: Any = None) -> None:
+        """Change a key's count (and tie value), dropping it at zero"""
+        old = self._counts.get(key, 0)
+        old_tie = self._ties.get(key, 0)
+        new = old + delta
+        new_tie = old_tie if tie is None else tie
+        if old:
+            del self._ranked[bisect.bisect_left(self._ranked, (-old, old_tie, key))]
+        if new > 0:
+            self._counts[key] = new
+            self._ties[key] = new_tie
+            bisect.insort(self._ranked, (-new, new_tie, key))
+        else:
+            self._counts.pop(key, None)
+            self._ties.pop(key, None)
+
+    def update(self, deltas: Dict[str, int], ties: Optional[Dict[str, Any]] = None) -> None:
+        """Apply several count and tie changes, re-sorting once when there are many"""
+        ties = ties or {}
+        keys = set(deltas).union(ties)
+        if len(keys) <= len(self._counts) // 10:
+            for key in keys:
+                self.add(key, deltas.get(key, 0), ties.get(key))
+            return
+        for key in keys:
+            count = self._counts.get(key, 0) + deltas.get(key, 0)
+            if count > 0:
+                self._counts[key] = count
+                self._ties[key] = ties.get(key, self._ties.get(key, 0))
+            else:
+                self._counts.pop(key, None)
+                self._ties.pop(key, None)
+        self._ranked = sorted((-count, self._ties[key], key) for key, count in self._counts.items())
+
+    def top(self, limit: int) -> List[Tuple[str, int]]:
+        """Return up to ``limit`` (key, count) pairs, highest count first"""
+        return [(key, -count) for count, _, key in self._ranked[:max(limit, 0)]]
+
+
+class ContributorLeaderboard:
+    """Server count per author, kept in sync with a CatalogMirror
+
+    Only usable when the listing carries author names; until then (or when
+    the backend omits them) callers fall back to the top-users endpoint.
+    Authors with equal counts rank in the order the backend lists them:
+    by their lowest server ID, i.e. whoever registered a server first.
+    """
+
+    def __init__(self):
+        self._authors: Dict[int, str] = {}
+        self._servers: Dict[str, set] = {}
+        self._counter = RankedCounter()
+        # top() results per limit, reused until the counts change
+        self._top: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._counter)
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether any mirrored server has a known author"""
+        return bool(self._authors)
+
+    def apply_changes(self, snapshot, changed: Iterable[int], removed: Iterable[int]) -> None:
+        """Apply a catalog delta
+
+        Args:
+            snapshot: Newly published CatalogSnapshot
+            changed: IDs of added or modified servers
+            removed: IDs of servers no longer in the catalog
+        """
+        deltas: Counter = Counter()
+        for server_id in removed:
+            self._set(server_id, None, deltas)
+        for server_id in changed:
+            self._set(server_id, author_of(snapshot.servers[server_id]), deltas)
+        if deltas:
+            ties = {author: min(self._servers[author]) for author in deltas if author in self._servers}
+            self._counter.update(deltas, ties)
+            self._top.clear()
+
+    def top(self, limit: int) -> Dict[str, Any]:
+        """Return the top contributors in the backend's top-users shape"""
+        result = self._top.get(limit)
+        if result is None:
+            result = {"users": [{"username": u, "server_count": c} for u, c in self._counter.top(limit)]}
+            if len(self._top) >= 64:
+                self._top.clear()
+            self._top[limit] = result
+        return result
+
+    def _set(self, server_id: int, author: Optional[str], deltas: Counter) -> None:
+        old = self._authors.get(server_id)
+        if old == author:
+            return
+        if old is not None:
+            deltas[old] -= 1
+            del self._authors[server_id]
+            servers = self._servers[old]
+            servers.discard(server_id)
+            if not servers:
+                del self._servers[old]
+        if author is not None:
+            deltas[author] += 1
+            self._authors[server_id] = author
+            self._servers.setdefault(author, set()).add(server_id)
@@ -0,0 +1,225 @@
+"""Non-blocking logging: queue handler, rate limiting and JSON output"""
+
+import atexit
+import contextvars
+import itertools
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+# ID of the tool call being handled, attached to every record logged under it
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+_request_ids = itertools.count(1)
+
+# Record attributes set by logging itself; anything else came in via extra=
+_STANDARD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def new_request_id() -> str:
+    """Return a process-unique request ID"""
+    return f"{os.getpid():x}-{next(_request_ids):x}"
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request ID to records
+
+    Runs on the handler before the record is queued, in the context of the
+    code that logged it.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Rate-limit repetitive warnings and errors
+
+    Records at ``min_level`` or above are grouped by logger, level and
+    message template (the unformatted ``msg``). Each group may log
+    ``burst`` records per ``interval`` seconds. Beyond that, only every
+    ``sample_every``-th record gets through (0 drops them all). The next
+    record that gets through carries the number suppressed since the
+    previous one as ``suppressed``.
+    """
+
+    def __init__(
+        self,
+        burst: int = 10,
+        interval: float = 60.0,
+        sample_every: int = 0,
+        min_level: int = logging.WARNING,
+        clock=time.monotonic
+    ):
+        """Initialize filter
+
+        Args:
+            burst: Records per group allowed in each interval (0 disables limiting)
+            interval: Window length in seconds
+            sample_every: Let one in this many over-limit records through (0 for none)
+            min_level: Lowest level that is rate limited
+            clock: Monotonic time source (overridable for tests)
+        """
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.sample_every = sample_every
+        self.min_level = min_level
+        self._clock = clock
+        self._lock = threading.Lock()
+        # group -> [window start, records in window, suppressed since last emitted]
+        self._groups: Dict[Tuple[str, int, str], list] = {}
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not self.burst or record.levelno < self.min_level:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = self._clock()
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None or now - group[0] >= self.interval:
+                if group is None and len(self._groups) >= 1024:
+                    self._groups.clear()
+                group = self._groups[key] = [now, 0, group[2] if group else 0]
+            group[1] += 1
+            over = group[1] - self.burst
+            if over > 0 and not (self.sample_every and over % self.sample_every == 0):
+                group[2] += 1
+                self.suppressed += 1
+                return False
+            if group[2]:
+                record.suppressed = group[2]
+                group[2] = 0
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    """Plain text lines noting suppressed repeats"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f" ({suppressed} similar messages suppressed)"
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including request IDs and extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and value is not None:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message formatting to the writer thread
+
+    The stock handler formats each record before enqueueing it, on the
+    logging (event loop) thread. Here only tracebacks are rendered eagerly,
+    so the record does not keep stack frames alive, and %-style messages
+    are merged by the listener. Arguments must not be mutated after
+    logging.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(
+    level: str = "INFO",
+    json_format: bool = False,
+    burst: int = 10,
+    interval: float = 60.0,
+    sample_every: int = 0,
+    stream=None
+) -> QueueListener:
+    """Route all logging through a queue drained by a background thread
+
+    Args:
+        level: Root log level name
+        json_format: Write JSON lines instead of plain text
+        burst: Rate limit per repeated warning/error (see RateLimitFilter; 0 disables)
+        interval: Rate limit window in seconds
+        sample_every: Keep one in this many rate-limited records
+        stream: Output stream (defaults to stderr, which stdio mode leaves free)
+
+    Returns:
+        The running QueueListener
+    """
+    global _listener
+
+    writer = logging.StreamHandler(stream or sys.stderr)
+    writer.setFormatter(JsonFormatter() if json_format else TextFormatter(TEXT_FORMAT))
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(records)
+    handler.addFilter(RateLimitFilter(burst=burst, interval=interval, sample_every=sample_every))
+    handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+
+    if _listener is not None:
+        _listener.stop()
+    _listener = QueueListener(records, writer, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def _restart_after_fork() -> None:
+    # The writer thread does not survive fork(); give the child a fresh
+    # queue and thread (the parent's queue may be mid-operation)
+    global _listener
+    if _listener is None:
+        return
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, _DeferredQueueHandler):
+            handler.queue = records
+    _listener = QueueListener(records, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
+atexit.register(stop_logging)
@@ -5,9 +5,13 @@ Provides tools to query the MCP Hub database
 """
 
 import asyncio
+import importlib.util
 import logging
 import os
-from typing import Any
+import shutil
+import socket
+import tempfile
+from typing import TYPE_CHECKING, Any, Optional
 
 from dotenv import load_dotenv
 from mcp.server import Server
@@ -15,17 +19,28 @@ from mcp.types import Tool, TextContent
 
 from .config import config
 from .client import APIClient
+from . import metrics
+from .logging_setup import configure_logging
 from .tools.schemas import TOOLS
 from .tools.handlers import ToolHandler
-from .transport import run_http_transport, run_stdio_transport
+
+# Optional components and transports are imported when first used so a
+# stdio launch only loads what it needs
+if TYPE_CHECKING:
+    from .catalog import CatalogMirror
+    from .search import SearchIndex
+    from .similarity import SimilarityIndex
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, config.log_level),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Configure logging (records are written by a background thread)
+configure_logging(
+    level=config.log_level,
+    json_format=config.log_json,
+    burst=config.log_rate_limit,
+    interval=config.log_rate_limit_interval,
+    sample_every=config.log_sample_every
 )
 logger = logging.getLogger(__name__)
 
@@ -34,46 +49,161 @@ app = Server("mcp-hub-mcp")
 
 # Global instances
 api_client: APIClient | None = None
+catalog: "CatalogMirror | None" = None
+search_index: "SearchIndex | None" = None
+similarity_index: "SimilarityIndex | None" = None
 tool_handler: ToolHandler | None = None
 
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available tools"""
+    if similarity_index is None:
+        return [tool for tool in TOOLS if tool.name != "find_similar_servers"]
     return TOOLS
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls"""
+    return await get_tool_handler().handle_tool_call(name, arguments, session=_session_key())
+
+
+def _session_key() -> Any:
+    """Identify the caller for per-session concurrency limits
+
+    stdio and SSE keep one session object per client connection. Stateless
+    Streamable HTTP creates a session per request, and behind a load
+    balancer the peer address is the proxy's, so requests get no session
+    (only the global caps apply) unless TRUST_FORWARDED_FOR names the
+    client address to use.
+    """
+    try:
+        ctx = app.request_context
+    except LookupError:
+        return None
+    if _transport_mode() == "streamable-http":
+        request = getattr(ctx, "request", None)
+        if request is None or not config.trust_forwarded_for:
+            return None
+        # The last hop was appended by the trusted proxy; earlier ones are client-supplied
+        forwarded = request.headers.get("x-forwarded-for", "").split(",")[-1].strip()
+        return f"client:{forwarded}" if forwarded else None
+    return id(ctx.session)
+
+
+def get_api_client() -> APIClient:
+    """Return the API client, creating it on first use
+
+    Building the HTTP client (SSL context, connection pool) is the most
+    expensive part of startup, so it is deferred until a component
+    actually needs the backend.
+    """
+    global api_client
+
+    if api_client is None:
+        api_client = APIClient()
+        logger.info("API client initialized (base URL: %s)", api_client.base_url)
+        metrics.REGISTRY.register_stats("mcp_backend_cache", "Response cache counters", api_client.cache_stats)
+        metrics.REGISTRY.register_stats("mcp_backend_shared_cache", "Shared cache counters", api_client.shared_cache_stats)
+        metrics.REGISTRY.register_stats("mcp_backend_coalescing", "Single-flight counters", api_client.coalescing_stats)
+        metrics.REGISTRY.register_stats("mcp_backend_pool", "HTTP connection pool utilization", api_client.pool_stats)
+        metrics.REGISTRY.register_stats("mcp_backend_resilience", "Retry, hedging and circuit breaker counters", api_client.resilience_stats)
+    return api_client
+
+
+def get_tool_handler() -> ToolHandler:
+    """Return the tool handler, creating it (and the API client) on first tool call"""
     global tool_handler
 
     if tool_handler is None:
-        return [TextContent(type="text", text="Error: Tool handler not initialized")]
+        tool_handler = ToolHandler(
+            get_api_client(),
+            catalog=catalog,
+            search_index=search_index,
+            similarity_index=similarity_index
+        )
+        metrics.REGISTRY.register_stats("mcp_admission", "Tool call admission control", tool_handler.admission.stats)
+        if tool_handler.results is not None:
+            metrics.REGISTRY.register_stats("mcp_result_cache", "Rendered tool result cache", tool_handler.results.stats)
+        if tool_handler.prefetcher is not None:
+            metrics.REGISTRY.register_stats("mcp_prefetch", "Speculative prefetch counters", tool_handler.prefetcher.stats)
+        logger.info("Tool handler initialized")
+    return tool_handler
+
+
+def _transport_mode() -> str:
+    return os.getenv("TRANSPORT_MODE", "http").lower()
+
+
+async def main(sock: Optional[socket.socket] = None):
+    """Main entry point
 
-    return await tool_handler.handle_tool_call(name, arguments)
+    Args:
+        sock: Listening socket inherited from the worker supervisor
+    """
+    global catalog, search_index, similarity_index
 
+    # Pre-open backend connections (optional)
+    if config.http_warmup_connections:
+        idle = await get_api_client().warm_up(config.http_warmup_connections)
+        logger.info("Warmed up %d backend connections", idle)
 
-async def main():
-    """Main entry point"""
-    global api_client, tool_handler
+    # Initialize catalog mirror (optional)
+    if config.mirror_enabled:
+        from .catalog import CatalogMirror
 
-    # Initialize API client
-    api_client = APIClient()
-    logger.info(f"API client initialized (base URL: {api_client.base_url})")
+        catalog = CatalogMirror(get_api_client())
+        metrics.REGISTRY.register_stats("mcp_catalog", "Catalog mirror sync counters", catalog.stats)
+        if config.search_local:
+            from .search import SearchIndex
 
-    # Initialize tool handler
-    tool_handler = ToolHandler(api_client)
-    logger.info("Tool handler initialized")
+            search_index = SearchIndex(
+                fuzzy_min_results=config.search_fuzzy_min_results,
+                fuzzy_threshold=config.search_fuzzy_threshold
+            )
+            search_index.attach(catalog)
+        if config.similar_servers:
+            if importlib.util.find_spec("numpy") is None or importlib.util.find_spec("scipy") is None:
+                logger.warning("SIMILAR_SERVERS is enabled but numpy/scipy are not installed; find_similar_servers is disabled")
+            else:
+                from .similarity import SimilarityIndex
+
+                similarity_index = SimilarityIndex(
+                    max_results=config.similar_max_results,
+                    max_entries=config.similar_cache_max_entries
+                )
+                similarity_index.attach(catalog)
+                metrics.REGISTRY.register_stats("mcp_similarity", "Similar-server index counters", similarity_index.stats)
+        await catalog.start()
+        logger.info(
+            "Catalog mirror started (delta sync every %ss, full sync every %ss)",
+            catalog.refresh_interval,
+            catalog.full_sync_interval
+        )
 
     # Determine transport mode
-    transport_mode = os.getenv("TRANSPORT_MODE", "http").lower()
+    transport_mode = _transport_mode()
 
     try:
         if transport_mode == "stdio":
+            from .transport import run_stdio_transport
+
             await run_stdio_transport(app)
+        elif transport_mode == "streamable-http":
+            from .transport import run_streamable_http_transport
+
+            await run_streamable_http_transport(
+                app,
+                host=config.server_host,
+                port=config.server_port,
+                json_response=config.streamable_http_json_response,
+                sock=sock
+            )
         else:
             # Default to HTTP
+            from .transport import run_http_transport
+
             await run_http_transport(
                 app,
                 host=config.server_host,
@@ -81,10 +211,50 @@ async def main():
             )
     finally:
         # Cleanup
+        if catalog:
+            await catalog.stop()
+        if tool_handler is not None and tool_handler.prefetcher is not None:
+            await tool_handler.prefetcher.close()
         if api_client:
             await api_client.close()
             logger.info("API client closed")
 
 
+def run():
+    """Start the server, forking worker processes when WORKERS > 1"""
+    transport_mode = _transport_mode()
+    if config.workers <= 1 or transport_mode == "stdio":
+        asyncio.run(main())
+        return
+    if transport_mode != "streamable-http":
+        logger.warning(
+            "WORKERS > 1 requires TRANSPORT_MODE=streamable-http "
+            "(SSE sessions are bound to one process); running a single worker"
+        )
+        asyncio.run(main())
+        return
+
+    from .workers import bind_socket, run_workers
+
+    temp_dir = None
+    if config.cache_enabled and not config.shared_cache_path:
+        temp_dir = tempfile.mkdtemp(prefix="mcp-hub-cache-")
+        config.shared_cache_path = os.path.join(temp_dir, "shared-cache.sqlite3")
+
+    sock = bind_socket(config.server_host, config.server_port)
+    logger.info("Starting %d workers on %s:%s", config.workers, config.server_host, config.server_port)
+    try:
+        run_workers(
+            lambda s: asyncio.run(main(s)),
+            config.workers,
+            sock,
+            shutdown_timeout=config.worker_shutdown_timeout
+        )
+    finally:
+        sock.close()
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
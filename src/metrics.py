@@ -0,0 +1,239 @@
+"""In-process Prometheus metrics for MCP Hub MCP Server
+
+A small subset of the Prometheus client data model (counters, gauges and
+histograms with labels) rendered in the text exposition format. Updates are
+plain attribute arithmetic on the event loop thread, so instrumenting hot
+paths costs well under a microsecond.
+"""
+
+import bisect
+import re
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Latency buckets in seconds (tool calls and backend requests)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_ID_SEGMENT_RE = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_label(endpoint: str) -> str:
+    """Collapse numeric path segments so labels stay low-cardinality"""
+    return _ID_SEGMENT_RE.sub("/{id}", endpoint)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            # Unlabelled metrics are exported as 0 before the first update
+            self.labels()
+
+    def labels(self, *values) -> object:
+        """Return the child metric for a label value combination"""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _default(self):
+        return self.labels()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+    def _render_child(self, key, child) -> Iterable[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"]
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled counter"""
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled gauge"""
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrement the unlabelled gauge"""
+        self._default().dec(amount)
+
+    def set(self, value: float) -> None:
+        """Set the unlabelled gauge"""
+        self._default().set(value)
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed distribution of observations"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record an observation on the unlabelled histogram"""
+        self._default().observe(value)
+
+    def _render_child(self, key, child) -> Iterable[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on /metrics"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._stats_sources: List[Tuple[str, str, Callable[[], Dict[str, float]]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric to the registry"""
+        self._metrics.append(metric)
+        return metric
+
+    def register_stats(self, name: str, documentation: str, source: Callable[[], Dict[str, float]]) -> None:
+        """Expose a stats() dict as a gauge with one 'stat' label per key
+
+        The source is called at scrape time, so components such as the
+        response cache keep their own counters and pay nothing per request.
+        """
+        self._stats_sources = [s for s in self._stats_sources if s[0] != name]
+        self._stats_sources.append((name, documentation, source))
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text format"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, documentation, source in self._stats_sources:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} gauge")
+            for stat, value in sorted(source().items()):
+                lines.append(f'{name}{{stat="{_escape(stat)}"}} {_format_value(value)}')
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+TOOL_DURATION = REGISTRY.register(Histogram(
+    "mcp_tool_duration_seconds", "Tool execution time", ["tool"]
+))
+TOOL_ERRORS = REGISTRY.register(Counter(
+    "mcp_tool_errors_total", "Tool calls that returned an error", ["tool"]
+))
+TOOL_IN_FLIGHT = REGISTRY.register(Gauge(
+    "mcp_tool_calls_in_flight", "Tool calls currently executing"
+))
+BACKEND_DURATION = REGISTRY.register(Histogram(
+    "mcp_backend_request_duration_seconds", "Backend request latency", ["method", "endpoint", "status"]
+))
+BACKEND_ERRORS = REGISTRY.register(Counter(
+    "mcp_backend_errors_total", "Backend requests that failed", ["method", "endpoint", "reason"]
+))
+SSE_SESSIONS = REGISTRY.register(Gauge(
+    "mcp_sse_sessions_active", "Open SSE sessions"
+))
+
@@ -0,0 +1,172 @@
+"""Compact records for servers held in memory by the catalog mirror
+
+Backend payloads are parsed once into ``__slots__`` objects instead of
+being kept as nested dicts. Tag names are interned and shared between
+servers, and each record carries its tag names as a precomputed tuple.
+Records keep the read-only ``get``/``[]`` interface of the payload dicts
+so formatters, the search index and sort keys work on either.
+"""
+
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+_MISSING = object()
+
+# Interned tag objects keyed by (id, name)
+_TAGS: Dict[Tuple[Any, str], "TagRecord"] = {}
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class _Record:
+    """Dict-style read access over slots; None counts as missing"""
+
+    __slots__ = ()
+    _names: frozenset = frozenset()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._names:
+            value = getattr(self, key)
+        else:
+            value = self._extra_get(key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+    __hash__ = None
+
+    def _extra_get(self, key: str) -> Any:
+        return None
+
+
+class TagRecord(_Record):
+    """A tag shared by every server carrying it"""
+
+    __slots__ = ("id", "name")
+    _names = frozenset(__slots__)
+
+    def __init__(self, id: Any, name: str):
+        self.id = id
+        self.name = name
+
+    @classmethod
+    def of(cls, tag: Any) -> "TagRecord":
+        """Return the interned tag for a payload tag (dict or bare name)"""
+        if isinstance(tag, dict):
+            key = (tag.get("id"), sys.intern(str(tag.get("name", ""))))
+        else:
+            key = (None, sys.intern(str(tag)))
+        record = _TAGS.get(key)
+        if record is None:
+            record = _TAGS[key] = cls(*key)
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "name": self.name} if self.id is not None else {"name": self.name}
+
+
+class ToolRecord(_Record):
+    """A tool exposed by a server"""
+
+    __slots__ = ("name", "description")
+    _names = frozenset(__slots__)
+
+    def __init__(self, name: Optional[str], description: Optional[str] = None):
+        self.name = name
+        self.description = description
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ToolRecord":
+        return cls(_intern(data.get("name")), data.get("description"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "description": self.description}
+
+
+class ServerRecord(_Record):
+    """A server listing entry, or a detail payload when ``tools`` is set
+
+    ``get("tags")`` returns the precomputed tuple of tag names; the tag
+    objects themselves (with IDs) are kept in ``tag_records``. Payload
+    fields without a slot are kept in ``extra``.
+    """
+
+    __slots__ = (
+        "id", "name", "description", "github_link", "favorites_count",
+        "created_at", "author", "protocol", "status",
+        "tags", "tag_records", "tools", "extra",
+    )
+
+    _names = frozenset(__slots__)
+    # Payload fields copied to slots (everything but tags, tools and extra)
+    FIELDS = __slots__[:9]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], base: Optional["ServerRecord"] = None) -> "ServerRecord":
+        """Parse a backend payload
+
+        Args:
+            data: Listing entry or detail payload
+            base: Record for the same server whose equal values (and their
+                memory) are reused, e.g. the listing entry when parsing details
+        """
+        record = cls.__new__(cls)
+        for field in cls.FIELDS:
+            value = data.get(field)
+            if base is not None:
+                shared = getattr(base, field)
+                if shared == value:
+                    value = shared
+            setattr(record, field, value)
+        record.name = _intern(record.name)
+        record.author = _intern(record.author)
+        record.protocol = _intern(record.protocol)
+        record.status = _intern(record.status)
+        record.created_at = _intern(record.created_at)
+
+        tags = tuple(TagRecord.of(t) for t in data.get("tags") or ())
+        if base is not None and base.tag_records == tags:
+            record.tag_records, record.tags = base.tag_records, base.tags
+        else:
+            record.tag_records = tags
+            record.tags = tuple(t.name for t in tags)
+
+        tools = data.get("tools")
+        record.tools = tuple(ToolRecord.from_dict(t) for t in tools) if tools is not None else None
+
+        extra = {k: v for k, v in data.items() if k not in _KNOWN}
+        record.extra = extra or None
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the payload as a plain dict (None fields omitted)"""
+        data = {f: getattr(self, f) for f in self.FIELDS if getattr(self, f) is not None}
+        data["tags"] = [t.to_dict() for t in self.tag_records]
+        if self.tools is not None:
+            data["tools"] = [t.to_dict() for t in self.tools]
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def _extra_get(self, key: str) -> Any:
+        return self.extra.get(key) if self.extra else None
+
+    def __repr__(self) -> str:
+        return f"ServerRecord(id={self.id!r}, name={self.name!r})"
+
+
+_KNOWN = frozenset(ServerRecord.FIELDS) | {"tags", "tools"}
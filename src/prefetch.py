@@ -0,0 +1,187 @@
+"""Speculative prefetch of likely follow-up tool calls"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set
+
+from .client import extract_servers
+
+logger = logging.getLogger(__name__)
+
+# Prefetched keys remembered for hit accounting
+_MAX_TRACKED = 1024
+
+
+def page_key(sort: str, order: str, limit: int, offset: int) -> tuple:
+    """Hit-accounting key for a listing page"""
+    return ("list", sort, order, limit, offset)
+
+
+def details_key(server_id: int) -> tuple:
+    """Hit-accounting key for a server's details"""
+    return ("details", server_id)
+
+
+class Prefetcher:
+    """Warm the response cache with the calls agents usually make next
+
+    After a listing is served the next page is fetched, and after a listing
+    or search the details of the first ``detail_count`` results. Prefetches
+    run as background tasks that never hold admission slots: at most
+    ``max_in_flight`` run at once, and none start while user calls are
+    queued for admission. Surplus prefetches are dropped, not queued, and
+    results the response cache already holds fresh are not fetched again.
+
+    Every completed prefetch is remembered for ``window`` seconds. A user
+    call for it within that time counts as a hit; one that expires or is
+    pushed out unused counts as wasted.
+    """
+
+    def __init__(
+        self,
+        api_client,
+        detail_count: int = 3,
+        max_in_flight: int = 4,
+        window: float = 60.0,
+        busy: Optional[Callable[[], bool]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize prefetcher
+
+        Args:
+            api_client: APIClient whose response cache is warmed
+            detail_count: Results whose details are fetched after a listing or search
+            max_in_flight: Prefetches running at once
+            window: Seconds a prefetched result counts towards the hit rate
+            busy: Returns True while user calls are waiting (prefetch is skipped)
+            clock: Monotonic time source (overridable for tests)
+        """
+        self.api_client = api_client
+        self.detail_count = detail_count
+        self.max_in_flight = max_in_flight
+        self.window = window
+        self._busy = busy or (lambda: False)
+        self._clock = clock
+
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._ready: "OrderedDict[Hashable, float]" = OrderedDict()
+        # In-flight prefetches a user call already asked for
+        self._claimed: Set[Hashable] = set()
+
+        self.issued = 0
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.cached = 0
+        self.hits = 0
+        self.wasted = 0
+
+    def after_listing(self, data: Any, sort: str, order: str, limit: int, offset: int) -> None:
+        """Prefetch the next page and the top results' details after a listing"""
+        servers = extract_servers(data)
+        if limit > 0 and len(servers) >= limit:
+            next_offset = offset + limit
+            self._schedule(
+                page_key(sort, order, limit, next_offset),
+                lambda: self.api_client.list_servers(sort=sort, order=order, limit=limit, offset=next_offset),
+                lambda: self.api_client.has_fresh_listing(sort, order, limit, next_offset)
+            )
+        self._prefetch_details(servers)
+
+    def after_search(self, data: Any) -> None:
+        """Prefetch the top results' details after a search"""
+        self._prefetch_details(extract_servers(data))
+
+    def record(self, keys: Iterable[Hashable]) -> None:
+        """Count user requests for prefetched results"""
+        self._expire()
+        for key in keys:
+            if key in self._ready:
+                del self._ready[key]
+                self.hits += 1
+            elif key in self._tasks and key not in self._claimed:
+                self._claimed.add(key)
+                self.hits += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Return prefetch counters and the hit rate of completed prefetches"""
+        self._expire()
+        return {
+            "issued": self.issued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "cached": self.cached,
+            "hits": self.hits,
+            "wasted": self.wasted,
+            "in_flight": len(self._tasks),
+            "hit_rate": self.hits / self.completed if self.completed else 0.0,
+        }
+
+    async def close(self) -> None:
+        """Cancel running prefetches"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _prefetch_details(self, servers: Iterable[Dict[str, Any]]) -> None:
+        count = 0
+        for server in servers:
+            if count >= self.detail_count:
+                break
+            server_id = server.get("id")
+            if server_id is None:
+                continue
+            count += 1
+            self._schedule(
+                details_key(server_id),
+                lambda i=server_id: self.api_client.get_server_details(i),
+                lambda i=server_id: self.api_client.has_fresh_details(i)
+            )
+
+    def _schedule(self, key: Hashable, fetch: Callable, fresh: Callable[[], bool]) -> None:
+        if key in self._tasks or key in self._ready:
+            return
+        # Only backend fetches count as completed, so cached results are left out
+        if fresh():
+            self.cached += 1
+            return
+        if len(self._tasks) >= self.max_in_flight or self._busy():
+            self.skipped += 1
+            return
+
+        async def run():
+            try:
+                await fetch()
+                self.completed += 1
+                if key not in self._claimed:
+                    self._remember(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                logger.debug("Prefetch %s failed: %s", key, e)
+            finally:
+                self._tasks.pop(key, None)
+                self._claimed.discard(key)
+
+        self.issued += 1
+        self._tasks[key] = asyncio.create_task(run())
+
+    def _remember(self, key: Hashable) -> None:
+        self._ready[key] = self._clock()
+        while len(self._ready) > _MAX_TRACKED:
+            self._ready.popitem(last=False)
+            self.wasted += 1
+
+    def _expire(self) -> None:
+        cutoff = self._clock() - self.window
+        while self._ready:
+            key, stored_at = next(iter(self._ready.items()))
+            if stored_at > cutoff:
+                break
+            del self._ready[key]
+            self.wasted += 1
@@ -0,0 +1,145 @@
+"""Retry, hedging and circuit breaker primitives for backend calls"""
+
+import random
+import time
+from collections import deque
+from typing import Callable, Optional
+
+import httpx
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Recompute the cached latency percentile after this many new samples
+_PERCENTILE_REFRESH = 10
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend endpoint whose circuit is open"""
+
+
+def is_backend_failure(error: BaseException) -> bool:
+    """Whether an error indicates an unhealthy backend
+
+    Transport errors (timeouts, refused connections) and 5xx responses
+    count; 4xx responses are answers about the request, not the backend.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: Callable[[float, float], float] = random.uniform) -> float:
+    """Full-jitter exponential backoff
+
+    Args:
+        attempt: Zero-based retry number
+        base: Delay ceiling for the first retry in seconds
+        cap: Maximum delay ceiling in seconds
+        rng: Uniform random source (overridable for tests)
+
+    Returns:
+        Seconds to sleep, uniformly drawn from [0, min(cap, base * 2**attempt)]
+    """
+    return rng(0.0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker
+
+    Opens after ``failure_threshold`` consecutive failures and rejects calls
+    for ``reset_timeout`` seconds. It then lets a single probe call through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        """Initialize breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before probing
+            clock: Monotonic time source (overridable for tests)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+
+        self.opens = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the timeout passes"""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may be sent now"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+        # Half-open: one probe at a time; a probe that never reported back
+        # (e.g. cancelled) is replaced after another reset_timeout
+        now = self._clock()
+        if self._probe_started is None or now - self._probe_started >= self.reset_timeout:
+            self._probe_started = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record a call the backend answered"""
+        self._state = CLOSED
+        self._failures = 0
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        """Record a backend failure"""
+        self._failures += 1
+        probing = self._probe_started is not None
+        self._probe_started = None
+        if probing or (self._state == CLOSED and self._failures >= self.failure_threshold):
+            self._state = OPEN
+            self._opened_at = self._clock()
+            self.opens += 1
+
+
+class LatencyWindow:
+    """Sliding window of recent latencies for hedging thresholds"""
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        """Initialize window
+
+        Args:
+            size: Number of most recent samples kept
+            min_samples: Samples required before percentiles are reported
+        """
+        self.min_samples = min_samples
+        self._samples: deque = deque(maxlen=size)
+        self._new = 0
+        self._cached: dict = {}
+
+    def observe(self, seconds: float) -> None:
+        """Record a latency sample"""
+        self._samples.append(seconds)
+        self._new += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency at quantile q (0-1), or None until enough samples exist"""
+        if len(self._samples) < self.min_samples:
+            return None
+        if self._new >= _PERCENTILE_REFRESH or q not in self._cached:
+            if self._new >= _PERCENTILE_REFRESH:
+                self._cached.clear()
+                self._new = 0
+            ordered = sorted(self._samples)
+            self._cached[q] = ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+        return self._cached[q]
@@ -0,0 +1,300 @@
+"""Local BM25 search over the catalog mirror"""
+
+import asyncio
+import heapq
+import logging
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .fuzzy import TrigramIndex
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+    "is", "it", "of", "on", "or", "that", "the", "this", "to", "with",
+})
+
+# Term-frequency weight per indexed field
+FIELD_WEIGHTS = {
+    "name": 3,
+    "tags": 2,
+    "tools": 1,
+    "description": 1,
+}
+
+# Fields matched typo-tolerantly by the trigram index, with their weights
+FUZZY_FIELDS = ("name", "tags", "tools")
+
+# Servers indexed between yields to the event loop while applying a delta
+_APPLY_CHUNK = 200
+
+# Document statistics are re-frozen when the corpus drifts by this fraction
+_STATS_DRIFT = 0.05
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase and split text into index terms"""
+    if not text:
+        return []
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def tag_names(server: Dict[str, Any]) -> List[str]:
+    """Return tag names from a server payload"""
+    return [t.get("name", t) if isinstance(t, dict) else t for t in server.get("tags", [])]
+
+
+def tool_names(details: Optional[Dict[str, Any]]) -> List[str]:
+    """Return tool names from a server detail payload"""
+    if not details:
+        return []
+    return [t.get("name", "") for t in details.get("tools", []) or []]
+
+
+class SearchIndex:
+    """Inverted index with BM25 ranking and tag filters
+
+    Indexes server name, description, tags and tool names. Documents are
+    added, replaced and removed incrementally. Per-term score contributions
+    are cached and only recomputed when that term's postings change or the
+    corpus statistics (document count, average length) drift noticeably.
+
+    When a keyword query finds fewer than ``fuzzy_min_results`` servers,
+    its words that appear nowhere in the index are matched by trigram
+    similarity against names, tags and tool names, which tolerates typos
+    such as "githbu", and those matches are appended after the exact
+    results.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        fuzzy_min_results: int = 3,
+        fuzzy_threshold: float = 0.4
+    ):
+        """Initialize empty index
+
+        Args:
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+            fuzzy_min_results: Blend in fuzzy matches below this many exact results (0 disables)
+            fuzzy_threshold: Minimum trigram similarity for a fuzzy term match
+        """
+        self.k1 = k1
+        self.b = b
+        self.fuzzy_min_results = fuzzy_min_results
+        self._fuzzy = TrigramIndex(fuzzy_threshold)
+        self.fuzzy_searches = 0
+
+        self._docs: Dict[int, Dict[str, Any]] = {}
+        self._doc_terms: Dict[int, tuple] = {}
+        self._doc_len: Dict[int, int] = {}
+        self._doc_tags: Dict[int, Set[str]] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._tags: Dict[str, Set[int]] = {}
+        self._total_len = 0
+
+        # Frozen corpus statistics and per-term impact cache
+        self._stats_n = 0
+        self._stats_avgdl = 1.0
+        self._impacts: Dict[str, Dict[int, float]] = {}
+
+        self.is_ready = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def attach(self, catalog) -> None:
+        """Keep the index in sync with a CatalogMirror"""
+        catalog.add_listener(self.apply_changes)
+
+    async def apply_changes(self, snapshot, changed: Iterable[int], removed: Iterable[int]) -> None:
+        """Apply a catalog delta
+
+        Large deltas (the initial build indexes the whole catalog) are
+        applied in chunks, yielding to the event loop in between so tool
+        calls are not stalled. Searches in the meantime see some servers
+        updated and others not yet.
+
+        Args:
+            snapshot: Newly published CatalogSnapshot
+            changed: IDs of added or modified servers
+            removed: IDs of servers no longer in the catalog
+        """
+        for count, server_id in enumerate(removed, 1):
+            self.remove(server_id)
+            if count % _APPLY_CHUNK == 0:
+                await asyncio.sleep(0)
+        for count, server_id in enumerate(changed, 1):
+            self.upsert(snapshot.servers[server_id], snapshot.details.get(server_id))
+            if count % _APPLY_CHUNK == 0:
+                await asyncio.sleep(0)
+        self.is_ready = True
+
+    def upsert(self, server: Dict[str, Any], details: Optional[Dict[str, Any]] = None) -> None:
+        """Add or replace a server document"""
+        server_id = server["id"]
+        if server_id in self._docs:
+            self.remove(server_id)
+
+        source = details or server
+        tags = tag_names(source) or tag_names(server)
+
+        fields = {
+            "name": tokenize(source.get("name")),
+            "description": tokenize(source.get("description")),
+            "tags": tokenize(" ".join(tags)),
+            "tools": tokenize(" ".join(tool_names(details))),
+        }
+        terms: Counter = Counter()
+        fuzzy_terms: Dict[str, int] = {}
+        for field, tokens in fields.items():
+            weight = FIELD_WEIGHTS[field]
+            for token in tokens:
+                terms[token] += weight
+                if field in FUZZY_FIELDS and weight > fuzzy_terms.get(token, 0):
+                    fuzzy_terms[token] = weight
+        if self.fuzzy_min_results:
+            self._fuzzy.upsert(server_id, fuzzy_terms)
+
+        self._docs[server_id] = server
+        self._doc_terms[server_id] = tuple(terms)
+        length = sum(terms.values())
+        self._doc_len[server_id] = length
+        self._total_len += length
+
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[server_id] = tf
+            self._impacts.pop(term, None)
+
+        lowered = {t.lower() for t in tags}
+        self._doc_tags[server_id] = lowered
+        for tag in lowered:
+            self._tags.setdefault(tag, set()).add(server_id)
+
+        self._maybe_refreeze()
+
+    def remove(self, server_id: int) -> None:
+        """Remove a server document if present"""
+        if server_id not in self._docs:
+            return
+
+        del self._docs[server_id]
+        self._fuzzy.remove(server_id)
+        for term in self._doc_terms.pop(server_id):
+            postings = self._postings[term]
+            del postings[server_id]
+            if not postings:
+                del self._postings[term]
+            self._impacts.pop(term, None)
+        self._total_len -= self._doc_len.pop(server_id)
+
+        for tag in self._doc_tags.pop(server_id):
+            ids = self._tags[tag]
+            ids.discard(server_id)
+            if not ids:
+                del self._tags[tag]
+
+        self._maybe_refreeze()
+
+    def search(
+        self,
+        query: Optional[str],
+        tags: Optional[List[str]] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Rank servers against a keyword query
+
+        Args:
+            query: Free-text keyword query (empty matches every server)
+            tags: Only return servers carrying all of these tags
+            limit: Maximum number of results
+
+        Returns:
+            Server payloads ordered by descending BM25 score, followed by
+            fuzzy matches when there are too few exact ones
+        """
+        allowed = self._filter_by_tags(tags) if tags else None
+        if allowed is not None and not allowed:
+            return []
+
+        terms = set(tokenize(query))
+        if not terms:
+            # No keyword (or only stopwords): like the backend, match every
+            # server (or every tagged one), ordered by popularity
+            ranked = heapq.nlargest(
+                limit,
+                self._docs if allowed is None else allowed,
+                key=lambda i: (self._docs[i].get("favorites_count") or 0, i)
+            )
+            return [self._docs[i] for i in ranked]
+
+        # Copy the longest posting list in C, then fold the others into it
+        impacts = sorted((self._term_impacts(t) for t in terms), key=len, reverse=True)
+        scores = dict(impacts[0])
+        get = scores.get
+        for term_impacts in impacts[1:]:
+            for doc_id, impact in term_impacts.items():
+                scores[doc_id] = get(doc_id, 0.0) + impact
+
+        if allowed is not None:
+            scores = {i: s for i, s in scores.items() if i in allowed}
+
+        top = heapq.nlargest(limit, scores, key=scores.__getitem__)
+        if len(top) < min(self.fuzzy_min_results, limit):
+            # Only words the index has never seen are treated as misspelled
+            unknown = [t for t in terms if t not in self._postings]
+            if unknown:
+                self.fuzzy_searches += 1
+                top += self._fuzzy.search(unknown, limit - len(top), allowed=allowed, exclude=top)
+        return [self._docs[doc_id] for doc_id in top]
+
+    def _filter_by_tags(self, tags: List[str]) -> Set[int]:
+        sets = [self._tags.get(t.lower(), set()) for t in tags]
+        sets.sort(key=len)
+        return set.intersection(*sets) if sets else set()
+
+    def _term_impacts(self, term: str) -> Dict[int, float]:
+        # Plain int -> float dicts are not tracked by the cyclic GC, which
+        # keeps a warm cache from slowing down collections
+        impacts = self._impacts.get(term)
+        if impacts is not None:
+            return impacts
+
+        postings = self._postings.get(term)
+        if not postings:
+            return {}
+
+        n = self._stats_n or len(self._docs)
+        df = len(postings)
+        idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+        k1 = self.k1
+        norm_base = k1 * (1.0 - self.b)
+        norm_len = k1 * self.b / self._stats_avgdl
+        doc_len = self._doc_len
+
+        impacts = {
+            doc_id: idf * tf * (k1 + 1.0) / (tf + norm_base + norm_len * doc_len[doc_id])
+            for doc_id, tf in postings.items()
+        }
+        self._impacts[term] = impacts
+        return impacts
+
+    def _maybe_refreeze(self) -> None:
+        n = len(self._docs)
+        if n == 0:
+            return
+        if self._stats_n and abs(n - self._stats_n) <= self._stats_n * _STATS_DRIFT:
+            avgdl = self._total_len / n
+            if abs(avgdl - self._stats_avgdl) <= self._stats_avgdl * _STATS_DRIFT:
+                return
+
+        self._stats_n = n
+        self._stats_avgdl = (self._total_len / n) or 1.0
+        self._impacts.clear()
@@ -0,0 +1,290 @@
+"""Persistent SQLite-backed response cache shared between worker processes"""
+
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Expired rows are purged and the disk budget enforced after this many writes
+_PURGE_EVERY = 256
+
+# Seconds to wait for another worker's write lock. Calls run on the event
+# loop, so a locked database is treated as a miss or skipped write instead
+_BUSY_TIMEOUT = 0.05
+
+# Eviction frees space down to this fraction of the budget so that the
+# next writes do not immediately trigger another pass
+_LOW_WATER = 0.9
+
+# Bumped when the table layout or cache key format changes; files written
+# with another version are cleared on open
+SCHEMA_VERSION = 3
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY,
+        body TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        stored_at REAL NOT NULL,
+        ttl REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        etag TEXT,
+        last_modified TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS entries_stored_at ON entries (stored_at)",
+    "CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)",
+    # Running total of stored sizes, kept by triggers for every writer
+    "CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO totals (id, bytes) VALUES (0, 0)",
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries
+    BEGIN UPDATE totals SET bytes = bytes + NEW.size; END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries
+    BEGIN UPDATE totals SET bytes = bytes + NEW.size - OLD.size; END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries
+    BEGIN UPDATE totals SET bytes = bytes - OLD.size; END
+    """,
+)
+
+
+class SharedCacheStore:
+    """Second-level cache in a local SQLite file
+
+    Sits behind each process's in-memory ResponseCache so that a response
+    fetched by one worker is reused by the others instead of every worker
+    warming its own cold cache. The file outlives the process, so after a
+    restart responses are read back lazily, key by key, on first use.
+    Timestamps are wall-clock seconds so ages are comparable across
+    processes and restarts. Keys are scoped by ``namespace`` (the backend
+    URL), so after MCP_HUB_URL changes the file never answers with the old
+    backend's responses; those expire and are purged as usual. Total stored
+    response size is kept under
+    ``max_bytes`` by evicting the oldest entries. The store is best-effort:
+    database errors are logged and treated as misses, and a database locked
+    by another worker for longer than 50ms is counted as busy and skipped.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        stale_ttl: float = 0.0,
+        max_bytes: int = 0,
+        namespace: str = "",
+        clock: Callable[[], float] = time.time
+    ):
+        """Initialize store
+
+        Args:
+            path: SQLite database file (created on first use)
+            stale_ttl: Seconds an expired entry may still be served as stale
+            max_bytes: Disk budget for stored responses (0 for unlimited)
+            namespace: Prefix for stored keys, e.g. the backend base URL
+            clock: Wall-clock time source (overridable for tests)
+        """
+        self.path = path
+        self._prefix = f"{namespace} " if namespace else ""
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+        self.busy = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened lazily so a connection is never inherited across fork()
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=_BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # Serialize schema checks between workers opening the file at once
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    conn.execute("DROP TABLE IF EXISTS entries")
+                    conn.execute("DROP TABLE IF EXISTS totals")
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                conn.close()
+                raise
+            self._conn = conn
+            self._bytes = self._stored_bytes()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[Any, int, float, float, Optional[str], Optional[str]]]:
+        """Look up a key
+
+        Returns:
+            Tuple of (value, size, age, ttl, etag, last_modified), or None
+            when the key is missing or past its stale window
+        """
+        try:
+            row = self._connection().execute(
+                "SELECT body, size, stored_at, ttl, etag, last_modified FROM entries WHERE key = ?",
+                (self._prefix + key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._error("read", e)
+            return None
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        body, size, stored_at, ttl, etag, last_modified = row
+        age = max(self._clock() - stored_at, 0.0)
+        if age >= ttl + self.stale_ttl:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(body), size, age, ttl, etag, last_modified
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        size: int,
+        ttl: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """Store a value
+
+        Args:
+            key: Cache key
+            value: Parsed response (must be JSON serializable)
+            size: Size of the raw response body in bytes
+            ttl: Seconds the entry stays fresh
+            etag: ETag validator from the response
+            last_modified: Last-Modified validator from the response
+        """
+        if ttl <= 0 or (self.max_bytes and size > self.max_bytes):
+            return
+        try:
+            conn = self._connection()
+            now = self._clock()
+            # An upsert (not REPLACE) so the size triggers see the old row
+            conn.execute(
+                "INSERT INTO entries (key, body, size, stored_at, ttl, expires_at, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "body = excluded.body, size = excluded.size, stored_at = excluded.stored_at, "
+                "ttl = excluded.ttl, expires_at = excluded.expires_at, "
+                "etag = excluded.etag, last_modified = excluded.last_modified",
+                (
+                    self._prefix + key, json.dumps(value, separators=(",", ":")),
+                    size, now, ttl, now + ttl, etag, last_modified
+                )
+            )
+            self._writes += 1
+            self._bytes += size
+            if self._writes % _PURGE_EVERY == 0 or (self.max_bytes and self._bytes > self.max_bytes):
+                self.purge()
+        except sqlite3.Error as e:
+            self._error("write", e)
+
+    def touch(self, key: str, ttl: float) -> None:
+        """Mark an entry fresh again without rewriting its body (after a 304)"""
+        try:
+            now = self._clock()
+            self._connection().execute(
+                "UPDATE entries SET stored_at = ?, ttl = ?, expires_at = ? WHERE key = ?",
+                (now, ttl, now + ttl, self._prefix + key)
+            )
+        except sqlite3.Error as e:
+            self._error("touch", e)
+
+    def purge(self) -> int:
+        """Delete entries past their stale window, then enforce the disk budget
+
+        Returns:
+            Number of rows removed
+        """
+        try:
+            conn = self._connection()
+            removed = conn.execute(
+                "DELETE FROM entries WHERE expires_at <= ?", (self._clock() - self.stale_ttl,)
+            ).rowcount
+            # Other workers write to the same file, so re-read the shared total
+            self._bytes = self._stored_bytes()
+            if self.max_bytes and self._bytes > self.max_bytes:
+                evicted = self._evict(self._bytes - int(self.max_bytes * _LOW_WATER))
+                self.evictions += evicted
+                removed += evicted
+            return removed
+        except sqlite3.Error as e:
+            self._error("purge", e)
+            return 0
+
+    def _stored_bytes(self) -> int:
+        return self._conn.execute("SELECT bytes FROM totals").fetchone()[0]
+
+    def _evict(self, excess: int) -> int:
+        """Delete the oldest entries until ``excess`` bytes are freed"""
+        keys = []
+        freed = 0
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY stored_at"):
+            keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", keys)
+        self._bytes -= freed
+        return len(keys)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop a single key, or everything when no key is given"""
+        try:
+            if key is None:
+                self._connection().execute("DELETE FROM entries")
+                self._bytes = 0
+            else:
+                self._connection().execute("DELETE FROM entries WHERE key = ?", (self._prefix + key,))
+        except sqlite3.Error as e:
+            self._error("invalidate", e)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction/error counters and approximate disk usage"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "busy": self.busy,
+            "bytes": self._bytes,
+        }
+
+    def close(self) -> None:
+        """Close the database connection"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _error(self, operation: str, error: Exception) -> None:
+        # SQLITE_BUSY and SQLITE_LOCKED: another worker holds the write lock
+        if isinstance(error, sqlite3.OperationalError) and "locked" in str(error):
+            self.busy += 1
+            logger.debug("Shared cache %s skipped: %s", operation, error)
+            return
+        self.errors += 1
+        logger.warning("Shared cache %s failed: %s", operation, error)
@@ -0,0 +1,356 @@
+"""Content similarity between mirrored servers (TF-IDF cosine neighbours)
+
+Needs numpy and scipy, which are optional dependencies; the module is only
+imported when SIMILAR_SERVERS is enabled and both are installed.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .search import tag_names, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Term weight per field before IDF weighting
+FIELD_WEIGHTS = {
+    "description": 1,
+    "tags": 2,
+    "tools": 1,
+}
+
+# IDF weights are recomputed when the corpus size drifts by this fraction
+_IDF_DRIFT = 0.05
+
+# Rows per sparse product when computing neighbour lists
+_BATCH_SIZE = 256
+
+# Above this many changed servers the neighbour cache is simply cleared
+_MAX_INCREMENTAL = 1024
+
+Neighbours = List[Tuple[int, float]]
+
+
+def server_terms(server: Dict[str, Any]) -> Dict[str, int]:
+    """Weighted terms of a server: description, tag names, tool names and descriptions"""
+    text = {
+        "description": server.get("description"),
+        "tags": " ".join(tag_names(server)),
+        "tools": " ".join(
+            f"{tool.get('name') or ''} {tool.get('description') or ''}" for tool in server.get("tools") or ()
+        ),
+    }
+    terms: Dict[str, int] = {}
+    for field, value in text.items():
+        weight = FIELD_WEIGHTS[field]
+        for token in tokenize(value):
+            terms[token] = terms.get(token, 0) + weight
+    return terms
+
+
+class _Vectors:
+    """Matrix state of the index, replaced as a whole after each rebuild"""
+
+    __slots__ = ("vocab", "ids", "rows", "tf", "matrix", "matrix_t", "idf", "idf_n")
+
+    def __init__(self):
+        self.vocab: Dict[str, int] = {}
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.rows: Dict[int, int] = {}
+        # Raw term weights, and the normalized TF-IDF rows with their transpose
+        self.tf = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self.matrix = self.tf
+        self.matrix_t = self.tf
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.idf_n = 0
+
+
+class SimilarityIndex:
+    """TF-IDF vectors of mirrored servers with cached cosine neighbours
+
+    Every server is a sparse row of term weights, scaled by smoothed IDF and
+    L2-normalized so that cosine similarity is a dot product. Neighbours of
+    a batch of servers come from one sparse matrix product against the
+    whole catalog, with ``argpartition`` selecting the top ``max_results``
+    per row. Lists are cached (LRU, ``max_entries``).
+
+    Catalog changes only tokenize the changed servers: their rows are
+    stacked onto the unchanged rows of the previous matrix. The new
+    matrices are built in a worker thread and swapped in when complete,
+    so lookups keep using the previous ones meanwhile. IDF weights stay
+    frozen until the catalog size drifts by 5%, so unaffected neighbour
+    lists remain valid. A change drops the lists of changed servers, lists
+    naming a changed or removed server, and lists a changed server now
+    scores high enough to enter.
+    """
+
+    def __init__(self, max_results: int = 20, max_entries: int = 2048):
+        """Initialize empty index
+
+        Args:
+            max_results: Neighbours computed and cached per server
+            max_entries: Neighbour lists kept in the cache
+        """
+        self.max_results = max_results
+        self.max_entries = max_entries
+
+        self._vectors = _Vectors()
+        self._neighbours: "OrderedDict[int, Neighbours]" = OrderedDict()
+        self._snapshot = None
+
+        self.rebuilds = 0
+        self.reweights = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    def __len__(self) -> int:
+        return len(self._vectors.ids)
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether a catalog snapshot has been indexed"""
+        return self._snapshot is not None
+
+    def attach(self, catalog) -> None:
+        """Keep the index in sync with a CatalogMirror"""
+        catalog.add_listener(self.apply_changes)
+
+    async def apply_changes(self, snapshot, changed: Iterable[int], removed: Iterable[int]) -> None:
+        """Apply a catalog delta
+
+        Args:
+            snapshot: Newly published CatalogSnapshot
+            changed: IDs of added or modified servers
+            removed: IDs of servers no longer in the catalog
+        """
+        changed = [i for i in changed if i in snapshot.servers]
+        stale = set(changed)
+        stale.update(removed)
+        if not stale:
+            self._snapshot = snapshot
+            return
+
+        servers = [snapshot.details.get(i) or snapshot.servers[i] for i in changed]
+        vectors, reweighted = await asyncio.to_thread(_rebuild, self._vectors, servers, changed, stale)
+
+        # Swap matrices, snapshot and neighbour cache together, on the loop
+        self._vectors = vectors
+        self._snapshot = snapshot
+        if reweighted:
+            self.invalidated += len(self._neighbours)
+            self._neighbours.clear()
+            self.reweights += 1
+        else:
+            self._invalidate(stale, changed)
+        self.rebuilds += 1
+
+    def similar(self, server_id: int, limit: Optional[int] = None) -> Optional[List[Tuple[Dict[str, Any], float]]]:
+        """Servers most similar to one server
+
+        Args:
+            server_id: Server to find neighbours for
+            limit: Maximum number of results (at most ``max_results``)
+
+        Returns:
+            (server payload, cosine similarity) pairs, most similar first,
+            or None if the server is not in the catalog
+        """
+        found = self.similar_many([server_id], limit)
+        return found.get(server_id)
+
+    def similar_many(
+        self,
+        server_ids: Sequence[int],
+        limit: Optional[int] = None
+    ) -> Dict[int, List[Tuple[Dict[str, Any], float]]]:
+        """Neighbours of several servers, computed in batched sparse products
+
+        Servers not in the catalog are left out of the result.
+        """
+        rows = self._vectors.rows
+        found: Dict[int, Neighbours] = {}
+        missing = []
+        for server_id in dict.fromkeys(server_ids):
+            if server_id not in rows:
+                continue
+            neighbours = self._neighbours.get(server_id)
+            if neighbours is not None:
+                self._neighbours.move_to_end(server_id)
+                found[server_id] = neighbours
+                self.hits += 1
+            else:
+                missing.append(server_id)
+                self.misses += 1
+        for start in range(0, len(missing), _BATCH_SIZE):
+            found.update(self._compute(missing[start:start + _BATCH_SIZE]))
+
+        servers = self._snapshot.servers
+        limit = self.max_results if limit is None else min(max(limit, 0), self.max_results)
+        return {
+            server_id: [(servers[i], score) for i, score in neighbours[:limit]]
+            for server_id, neighbours in found.items()
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Return index size and neighbour cache counters"""
+        return {
+            "servers": len(self._vectors.ids),
+            "terms": len(self._vectors.vocab),
+            "cached": len(self._neighbours),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidated": self.invalidated,
+            "rebuilds": self.rebuilds,
+            "reweights": self.reweights,
+        }
+
+    def _compute(self, server_ids: List[int]) -> Dict[int, Neighbours]:
+        vectors = self._vectors
+        rows = np.fromiter((vectors.rows[i] for i in server_ids), dtype=np.int64, count=len(server_ids))
+        product = (vectors.matrix[rows] @ vectors.matrix_t).tocsr()
+        k = self.max_results
+        computed = {}
+        for position, server_id in enumerate(server_ids):
+            start, end = product.indptr[position], product.indptr[position + 1]
+            columns = product.indices[start:end]
+            scores = product.data[start:end]
+            mask = (columns != rows[position]) & (scores > 0)
+            columns, scores = columns[mask], scores[mask]
+            if len(scores) > k:
+                top = np.argpartition(-scores, k)[:k]
+                columns, scores = columns[top], scores[top]
+            order = np.lexsort((vectors.ids[columns], -scores))
+            neighbours = list(zip(vectors.ids[columns[order]].tolist(), scores[order].tolist()))
+            self._store(server_id, neighbours)
+            computed[server_id] = neighbours
+        return computed
+
+    def _store(self, server_id: int, neighbours: Neighbours) -> None:
+        self._neighbours[server_id] = neighbours
+        self._neighbours.move_to_end(server_id)
+        while len(self._neighbours) > self.max_entries:
+            self._neighbours.popitem(last=False)
+
+    def _invalidate(self, stale: set, changed: List[int]) -> None:
+        cache = self._neighbours
+        if not cache:
+            return
+        if len(changed) > _MAX_INCREMENTAL:
+            self.invalidated += len(cache)
+            cache.clear()
+            return
+
+        dropped = [
+            server_id for server_id, neighbours in cache.items()
+            if server_id in stale or any(i in stale for i, _ in neighbours)
+        ]
+        for server_id in dropped:
+            del cache[server_id]
+        self.invalidated += len(dropped)
+        if not cache or not changed:
+            return
+
+        # A changed server enters a cached list if it beats the list's last entry
+        vectors = self._vectors
+        cached = list(cache)
+        rows = np.fromiter((vectors.rows[i] for i in cached), dtype=np.int64, count=len(cached))
+        changed_rows = np.fromiter((vectors.rows[i] for i in changed), dtype=np.int64, count=len(changed))
+        best = (vectors.matrix[rows] @ vectors.matrix[changed_rows].T).max(axis=1).toarray().ravel()
+        floor = np.array([
+            neighbours[-1][1] if len(neighbours) >= self.max_results else 0.0
+            for neighbours in cache.values()
+        ])
+        for position in np.flatnonzero(best > floor):
+            del cache[cached[position]]
+            self.invalidated += 1
+
+
+def _rebuild(
+    previous: _Vectors,
+    servers: List[Dict[str, Any]],
+    changed: List[int],
+    stale: set
+) -> Tuple[_Vectors, bool]:
+    """Build the matrices for a delta without touching ``previous``
+
+    Runs in a worker thread. Returns the new state and whether IDF weights
+    were recomputed (which invalidates every cached neighbour list).
+    """
+    vectors = _Vectors()
+    vectors.vocab = dict(previous.vocab)
+    new_tf = _vectorize(servers, vectors.vocab)
+    width = len(vectors.vocab)
+
+    keep = np.flatnonzero(~np.isin(previous.ids, np.fromiter(stale, dtype=np.int64, count=len(stale))))
+    vectors.tf = sparse.vstack([_widen(previous.tf[keep], width), new_tf], format="csr")
+    vectors.ids = np.concatenate([previous.ids[keep], np.asarray(changed, dtype=np.int64)])
+    vectors.rows = dict(zip(vectors.ids.tolist(), range(len(vectors.ids))))
+
+    n = len(vectors.ids)
+    reweight = not previous.idf_n or abs(n - previous.idf_n) > _IDF_DRIFT * previous.idf_n
+    if reweight:
+        # Recompute IDF from the current catalog and every TF-IDF row
+        df = np.bincount(vectors.tf.indices, minlength=width)
+        vectors.idf = _idf_for(df, n)
+        vectors.idf_n = n
+        vectors.matrix = _weigh(vectors.tf, vectors.idf)
+    else:
+        # Terms first seen since the last reweight get their IDF now;
+        # existing terms keep theirs so cached neighbour lists stay valid
+        vectors.idf, vectors.idf_n = previous.idf, previous.idf_n
+        known = len(previous.idf)
+        if known < width:
+            df = np.bincount(vectors.tf.indices, minlength=width)[known:]
+            vectors.idf = np.concatenate([previous.idf, _idf_for(df, previous.idf_n)])
+        vectors.matrix = sparse.vstack(
+            [_widen(previous.matrix[keep], width), _weigh(new_tf, vectors.idf)],
+            format="csr"
+        )
+    vectors.matrix_t = vectors.matrix.T.tocsr()
+    return vectors, reweight
+
+
+def _vectorize(servers: Iterable[Dict[str, Any]], vocab: Dict[str, int]) -> sparse.csr_matrix:
+    """Raw term weights of the given servers, one row each (extends ``vocab``)"""
+    indptr = [0]
+    indices: List[int] = []
+    data: List[int] = []
+    for server in servers:
+        for term, weight in server_terms(server).items():
+            column = vocab.get(term)
+            if column is None:
+                column = vocab[term] = len(vocab)
+            indices.append(column)
+            data.append(weight)
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+        shape=(len(indptr) - 1, len(vocab))
+    )
+
+
+def _idf_for(df: np.ndarray, n: int) -> np.ndarray:
+    return (np.log((1.0 + n) / (1.0 + df)) + 1.0).astype(np.float32)
+
+
+def _weigh(tf: sparse.csr_matrix, idf: np.ndarray) -> sparse.csr_matrix:
+    """TF-IDF rows scaled to unit length"""
+    weighted = tf.astype(np.float32, copy=True)
+    weighted.data *= idf[weighted.indices]
+    row_of = np.repeat(np.arange(weighted.shape[0]), np.diff(weighted.indptr))
+    norms = np.sqrt(np.bincount(row_of, weights=weighted.data * weighted.data, minlength=weighted.shape[0]))
+    if len(weighted.data):
+        weighted.data /= norms[row_of].astype(np.float32)
+    return weighted
+
+
+def _widen(matrix: sparse.csr_matrix, width: int) -> sparse.csr_matrix:
+    """Same rows with ``width`` columns (the vocabulary only grows)"""
+    if matrix.shape[1] == width:
+        return matrix
+    return sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], width))
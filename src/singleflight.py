@@ -0,0 +1,67 @@
+"""Single-flight coalescing of concurrent identical backend calls"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key
+
+    The first caller for a key starts the call as a task; later callers
+    await the same task until it finishes. Results and exceptions fan out
+    to every waiter. Each waiter awaits through ``asyncio.shield`` so a
+    cancelled waiter never cancels the shared call for the others.
+    """
+
+    def __init__(self):
+        """Initialize with no in-flight calls"""
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.shared = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._calls
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn for key, or join the call already in flight
+
+        Args:
+            key: Coalescing key
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            Result of the shared call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+            self.started += 1
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(task)
+
+    def cancel_all(self) -> None:
+        """Cancel every in-flight call"""
+        for task in list(self._calls.values()):
+            task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """Return coalescing counters"""
+        return {
+            "started": self.started,
+            "shared": self.shared,
+            "in_flight": len(self._calls),
+        }
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
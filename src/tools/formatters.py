@@ -0,0 +1,211 @@
+"""Output formatters for MCP Hub tool results
+
+Each renderer supports three modes:
+
+- ``text``: human-readable multi-line output (default)
+- ``compact``: one line per server/contributor
+- ``json``: structured JSON for programmatic consumers
+
+Each entry is rendered by a single f-string template function and the
+entries are joined once, so cost stays linear in the number of servers
+with no intermediate string copies.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+FORMATS = ("text", "compact", "json")
+
+DIVIDER = "=" * 60
+
+
+def validate_format(mode: Optional[str]) -> str:
+    """Return the output mode, defaulting to text
+
+    Raises:
+        ValueError: If the mode is not supported
+    """
+    if mode is None:
+        return "text"
+    if mode not in FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+    return mode
+
+
+def tag_names(tags: Sequence[Any]) -> Sequence[str]:
+    """Return tag names from a server's tag list
+
+    ServerRecord payloads already hold a tuple of names, which is returned
+    as is.
+    """
+    if type(tags) is tuple:
+        return tags
+    return [t.get('name', t) if isinstance(t, dict) else t for t in tags]
+
+
+def _json_default(value: Any) -> Any:
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if to_dict is not None else str(value)
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, default=_json_default)
+
+
+def _summary(server: Dict[str, Any]) -> Dict[str, Any]:
+    get = server.get
+    return {
+        "id": get('id'),
+        "name": get('name'),
+        "description": get('description'),
+        "github_link": get('github_link'),
+        "favorites_count": get('favorites_count', 0),
+        "tags": tag_names(get('tags') or []),
+    }
+
+
+def _list_item(idx: int, server: Dict[str, Any]) -> str:
+    """Render one text-mode listing entry in a single f-string"""
+    get = server.get
+    desc = get('description', '')
+    tags = get('tags', [])
+    if desc:
+        desc_line = f"   Description: {desc[:100]}...\n" if len(desc) > 100 else f"   Description: {desc}\n"
+    else:
+        desc_line = ""
+    tags_line = f"   Tags: {', '.join(tag_names(tags))}\n" if tags else ""
+    return (
+        f"{idx}. {get('name', 'Unknown')}\n"
+        f"   ID: {get('id')}\n"
+        f"{desc_line}"
+        f"   GitHub: {get('github_link', 'N/A')}\n"
+        f"   Favorites: {get('favorites_count', 0)}\n"
+        f"{tags_line}\n"
+    )
+
+
+def _compact_item(idx: int, server: Dict[str, Any]) -> str:
+    get = server.get
+    tags = get('tags')
+    suffix = f" [{', '.join(tag_names(tags))}]" if tags else ""
+    return f"{idx}. {get('name', 'Unknown')} (ID {get('id')}) - {get('favorites_count', 0)} favorites{suffix}"
+
+
+def _tool_lines(tool: Dict[str, Any]) -> str:
+    desc = tool.get('description')
+    if desc:
+        return f"  • {tool.get('name', 'Unknown')}\n    {desc}\n"
+    return f"  • {tool.get('name', 'Unknown')}\n"
+
+
+def format_server_list(data: Any, title: str, mode: str = "text") -> str:
+    """Format a server listing or search response"""
+    servers = data if isinstance(data, list) else data.get("servers", [])
+
+    if mode == "json":
+        return _dumps({"title": title, "servers": [_summary(s) for s in servers]})
+
+    if not servers:
+        return f"{title}\n\nNo servers found."
+
+    if mode == "compact":
+        return "\n".join([title] + [_compact_item(idx, s) for idx, s in enumerate(servers, 1)])
+
+    parts = [f"{title}\n{DIVIDER}\n\n"]
+    parts.extend([_list_item(idx, s) for idx, s in enumerate(servers, 1)])
+    return "".join(parts)
+
+
+def format_server_details(server: Dict[str, Any], mode: str = "text") -> str:
+    """Format a server detail response"""
+    if mode == "json":
+        return _dumps(server)
+
+    get = server.get
+    tags = get('tags', [])
+    tools = get('tools', [])
+
+    if mode == "compact":
+        suffix = f" [{', '.join(tag_names(tags))}]" if tags else ""
+        return f"{get('name', 'Unknown')} (ID {get('id')}) - {get('favorites_count', 0)} favorites, {len(tools or [])} tools{suffix}"
+
+    parts = [
+        f"=== {get('name', 'Unknown')} ===\n\n"
+        f"ID: {get('id')}\n"
+        f"Description: {get('description', 'N/A')}\n"
+        f"GitHub: {get('github_link', 'N/A')}\n"
+        f"Protocol: {get('protocol', 'N/A')}\n"
+        f"Status: {get('status', 'N/A')}\n"
+        f"Favorites: {get('favorites_count', 0)}\n"
+    ]
+    if tags:
+        parts.append(f"Tags: {', '.join(tag_names(tags))}\n")
+    if tools:
+        parts.append(f"\n--- Tools ({len(tools)}) ---\n")
+        parts.extend([_tool_lines(tool) for tool in tools])
+    if get('created_at'):
+        parts.append(f"\nCreated: {server['created_at']}\n")
+
+    return "".join(parts)
+
+
+def format_server_details_batch(results: List[Tuple[Any, Any]], mode: str = "text") -> str:
+    """Format batch detail results
+
+    Args:
+        results: (server_id, payload or Exception) pairs in request order
+        mode: Output mode
+    """
+    failed = sum(1 for _, data in results if isinstance(data, Exception))
+
+    if mode == "json":
+        return _dumps({
+            "servers": [data for _, data in results if not isinstance(data, Exception)],
+            "errors": [
+                {"id": server_id, "error": str(data)}
+                for server_id, data in results if isinstance(data, Exception)
+            ],
+        })
+
+    sections = []
+    for server_id, data in results:
+        if isinstance(data, Exception):
+            if mode == "compact":
+                sections.append(f"Server {server_id} - Error: {str(data)}")
+            else:
+                sections.append(f"=== Server {server_id} ===\n\nError: {str(data)}\n")
+        else:
+            sections.append(format_server_details(data, mode))
+
+    header = f"Server Details ({len(results) - failed} of {len(results)} found)"
+    if mode == "compact":
+        return "\n".join([header] + sections)
+    return f"{header}\n{DIVIDER}\n\n" + "\n".join(sections)
+
+
+def format_contributors(data: Any, limit: int, mode: str = "text") -> str:
+    """Format a top contributors response"""
+    users = data if isinstance(data, list) else data.get("users", data.get("top_users", []))
+
+    rows = [
+        (user.get("username", user.get("user_name", "Unknown")), user.get("server_count", user.get("count", 0)))
+        for user in users
+    ]
+
+    if mode == "json":
+        return _dumps({
+            "title": f"Top Contributors (Top {limit})",
+            "contributors": [{"username": u, "server_count": c} for u, c in rows],
+        })
+
+    if not rows:
+        return f"Top Contributors (Top {limit})\n\nNo contributors found."
+
+    if mode == "compact":
+        lines = [f"Top Contributors (Top {limit})"]
+        lines.extend([f"{idx}. {u} - {c} servers" for idx, (u, c) in enumerate(rows, 1)])
+        return "\n".join(lines)
+
+    parts = [f"Top Contributors (Top {limit})\n{DIVIDER}\n\n"]
+    parts.extend([f"{idx}. {u}\n   Servers: {c}\n\n" for idx, (u, c) in enumerate(rows, 1)])
+    return "".join(parts)
@@ -1,39 +1,94 @@
 """Tool handlers for MCP Hub MCP Server"""
 
+import asyncio
 import json
 import logging
-from typing import Any, Dict, Callable
+import time
+from typing import Any, Dict, Callable, Hashable, Optional, Union
 from mcp.types import TextContent
 
+from ..admission import AdmissionController, OverloadedError
+from ..config import config
+from ..logging_setup import new_request_id, request_id_var
+from ..prefetch import Prefetcher, details_key, page_key
+from .. import metrics
+from . import formatters
+from .result_cache import ResultCache
+from .schemas import normalize_arguments
+
 logger = logging.getLogger(__name__)
 
+# Admission queue priority per tool (lower runs first): cheap lookups that
+# are usually cached go ahead of heavy listings and fan-outs
+TOOL_PRIORITIES = {
+    "get_mcp_server_details": 0,
+    "get_top_servers": 0,
+    "get_top_contributors": 0,
+    "find_similar_servers": 1,
+    "search_mcp_servers": 1,
+    "list_mcp_servers": 2,
+    "get_mcp_server_details_batch": 2,
+}
+
+# Tool methods return rendered contents, or a plain string for argument errors
+ToolResult = Union[str, list[TextContent]]
+
 
 class ToolHandler:
     """Handler for tool execution"""
 
-    def __init__(self, api_client):
+    def __init__(self, api_client, catalog=None, search_index=None, similarity_index=None):
         """Initialize handler with API client
 
         Args:
             api_client: APIClient instance for making API requests
+            catalog: Optional CatalogMirror answering list/top/detail/contributor tools locally
+            search_index: Optional SearchIndex answering search_mcp_servers locally
+            similarity_index: Optional SimilarityIndex answering find_similar_servers
         """
         self.api_client = api_client
+        self.catalog = catalog
+        self.search_index = search_index
+        self.similarity_index = similarity_index
+        self.admission = AdmissionController(
+            max_in_flight=config.max_in_flight,
+            max_per_session=config.max_in_flight_per_session,
+            max_queued=config.max_queued
+        )
+        self.results = ResultCache(config.result_cache_max_entries) if config.result_cache_max_entries > 0 else None
+        self.prefetcher: Optional[Prefetcher] = None
+        if config.prefetch_enabled and getattr(api_client, "cache", None) is not None:
+            self.prefetcher = Prefetcher(
+                api_client,
+                detail_count=config.prefetch_detail_count,
+                max_in_flight=config.prefetch_max_in_flight,
+                window=config.prefetch_window,
+                busy=lambda: self.admission.waiting > 0
+            )
 
         # Tool handler mapping
         self._handlers: Dict[str, Callable] = {
             "search_mcp_servers": self._search_servers,
             "list_mcp_servers": self._list_servers,
             "get_mcp_server_details": self._get_server_details,
+            "get_mcp_server_details_batch": self._get_server_details_batch,
             "get_top_servers": self._get_top_servers,
             "get_top_contributors": self._get_top_contributors,
+            "find_similar_servers": self._find_similar_servers,
         }
 
-    async def handle_tool_call(self, name: str, arguments: Dict[str, Any]) -> list[TextContent]:
+    async def handle_tool_call(
+        self,
+        name: str,
+        arguments: Dict[str, Any],
+        session: Optional[Hashable] = None
+    ) -> list[TextContent]:
         """Handle tool calls from MCP clients
 
         Args:
             name: Tool name
             arguments: Tool arguments
+            session: Caller identity used for per-session concurrency limits
 
         Returns:
             List of TextContent responses
@@ -42,132 +97,206 @@ class ToolHandler:
         if not handler:
             return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
+        # Every record logged while handling this call carries its request ID
+        token = request_id_var.set(new_request_id())
+        try:
+            async with self.admission.slot(session, TOOL_PRIORITIES.get(name, 1)):
+                return await self._execute(name, handler, arguments)
+        except OverloadedError as e:
+            logger.warning("Rejected tool %s: %s", name, e)
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+        finally:
+            request_id_var.reset(token)
+
+    async def _execute(self, name: str, handler: Callable, arguments: Dict[str, Any]) -> list[TextContent]:
+        """Run a tool handler with metrics and error reporting"""
+        metrics.TOOL_IN_FLIGHT.inc()
+        start = time.perf_counter()
         try:
             result = await handler(arguments)
-            return [TextContent(type="text", text=result)]
+            if isinstance(result, str):
+                return [TextContent(type="text", text=result)]
+            return result
         except Exception as e:
-            logger.error(f"Error executing tool {name}: {e}", exc_info=True)
+            logger.error("Error executing tool %s: %s", name, e, exc_info=True)
+            metrics.TOOL_ERRORS.labels(name).inc()
             return [TextContent(type="text", text=f"Error: {str(e)}")]
+        finally:
+            duration = time.perf_counter() - start
+            metrics.TOOL_DURATION.labels(name).observe(duration)
+            metrics.TOOL_IN_FLIGHT.dec()
+            logger.debug("Tool %s finished", name, extra={"tool": name, "duration_ms": round(duration * 1000, 1)})
+
+    @property
+    def _reader(self):
+        """Catalog mirror when configured, otherwise the live API client"""
+        return self.catalog if self.catalog is not None else self.api_client
+
+    @property
+    def _prefetching(self) -> bool:
+        """Whether to prefetch follow-up calls (not while the mirror serves them)"""
+        return self.prefetcher is not None and (self.catalog is None or not self.catalog.is_ready)
 
-    async def _search_servers(self, arguments: Dict[str, Any]) -> str:
-        """Search MCP servers by keyword"""
+    def _render(self, name: str, arguments: Dict[str, Any], data: Any, render: Callable[[], str]) -> list[TextContent]:
+        """Render a tool result, reusing the cached contents of an equivalent call
+
+        Args:
+            name: Tool name
+            arguments: Tool arguments (normalized against the schema defaults)
+            data: Backend or local data the result is rendered from
+            render: Builds the result text on a cache miss
+        """
+        if self.results is None:
+            return [TextContent(type="text", text=render())]
+
+        key = (name, normalize_arguments(name, arguments))
+        sources = _sources(data)
+        contents = self.results.get(key, sources)
+        if contents is None:
+            contents = [TextContent(type="text", text=render())]
+            self.results.put(key, sources, contents)
+        return contents
+
+    async def _search_servers(self, arguments: Dict[str, Any]) -> ToolResult:
+        """Search MCP servers by keyword and/or tags"""
         keyword = arguments.get("keyword")
-        data = await self.api_client.search_servers(keyword=keyword)
-        return self._format_server_list(data, f"Search results for '{keyword}'")
+        tags = arguments.get("tags")
+        mode = formatters.validate_format(arguments.get("format"))
+        title = f"Search results for '{keyword}'"
+        if tags:
+            title += f" (tags: {', '.join(tags)})"
 
-    async def _list_servers(self, arguments: Dict[str, Any]) -> str:
+        if self.search_index is not None and self.search_index.is_ready:
+            data = self.search_index.search(keyword, tags=tags, limit=config.search_max_results)
+            return self._render("search_mcp_servers", arguments, data, lambda: self._format_server_list(data, title, mode))
+
+        if tags:
+            data = await self.api_client.search_servers(keyword=keyword, tags=tags)
+        else:
+            data = await self.api_client.search_servers(keyword=keyword)
+        if self._prefetching:
+            self.prefetcher.after_search(data)
+        return self._render("search_mcp_servers", arguments, data, lambda: self._format_server_list(data, title, mode))
+
+    async def _list_servers(self, arguments: Dict[str, Any]) -> ToolResult:
         """List MCP servers with pagination"""
         sort = arguments.get("sort", "favorites")
         order = arguments.get("order", "desc")
         limit = arguments.get("limit", 20)
         offset = arguments.get("offset", 0)
+        mode = formatters.validate_format(arguments.get("format"))
+        if self.prefetcher is not None:
+            self.prefetcher.record([page_key(sort, order, limit, offset)])
 
-        data = await self.api_client.list_servers(
+        data = await self._reader.list_servers(
             sort=sort,
             order=order,
             limit=limit,
             offset=offset
         )
-        return self._format_server_list(data, f"MCP Servers (sort={sort}, limit={limit})")
+        if self._prefetching:
+            self.prefetcher.after_listing(data, sort, order, limit, offset)
+        title = f"MCP Servers (sort={sort}, limit={limit})"
+        return self._render("list_mcp_servers", arguments, data, lambda: self._format_server_list(data, title, mode))
 
-    async def _get_server_details(self, arguments: Dict[str, Any]) -> str:
+    async def _get_server_details(self, arguments: Dict[str, Any]) -> ToolResult:
         """Get server details"""
         server_id = arguments.get("server_id")
         if not server_id:
             return "Error: server_id is required"
+        mode = formatters.validate_format(arguments.get("format"))
+        if self.prefetcher is not None:
+            self.prefetcher.record([details_key(server_id)])
+
+        data = await self._reader.get_server_details(server_id)
+        return self._render("get_mcp_server_details", arguments, data, lambda: self._format_server_details(data, mode))
+
+    async def _get_server_details_batch(self, arguments: Dict[str, Any]) -> ToolResult:
+        """Get details for several servers concurrently"""
+        server_ids = list(dict.fromkeys(arguments.get("server_ids") or []))
+        if not server_ids:
+            return "Error: server_ids is required"
+        if len(server_ids) > config.batch_max_ids:
+            return f"Error: at most {config.batch_max_ids} server_ids per call"
+        mode = formatters.validate_format(arguments.get("format"))
+        if self.prefetcher is not None:
+            self.prefetcher.record(details_key(i) for i in server_ids)
+
+        semaphore = asyncio.Semaphore(config.batch_concurrency)
+
+        async def fetch(server_id):
+            async with semaphore:
+                return await self._reader.get_server_details(server_id)
+
+        results = await asyncio.gather(*(fetch(i) for i in server_ids), return_exceptions=True)
+
+        for server_id, data in zip(server_ids, results):
+            if isinstance(data, Exception):
+                logger.warning("Failed to fetch details for server %s: %s", server_id, data)
+
+        return self._render(
+            "get_mcp_server_details_batch",
+            arguments,
+            results,
+            lambda: formatters.format_server_details_batch(list(zip(server_ids, results)), mode)
+        )
 
-        data = await self.api_client.get_server_details(server_id)
-        return self._format_server_details(data)
-
-    async def _get_top_servers(self, arguments: Dict[str, Any]) -> str:
+    async def _get_top_servers(self, arguments: Dict[str, Any]) -> ToolResult:
         """Get top servers"""
         limit = arguments.get("limit", 3)
         sort = arguments.get("sort", "favorites")
+        mode = formatters.validate_format(arguments.get("format"))
 
-        data = await self.api_client.get_top_servers(limit=limit, sort=sort)
+        data = await self._reader.get_top_servers(limit=limit, sort=sort)
         sort_label = "Most Popular" if sort == "favorites" else "Latest"
-        return self._format_server_list(data, f"{sort_label} Servers (Top {limit})")
+        title = f"{sort_label} Servers (Top {limit})"
+        return self._render("get_top_servers", arguments, data, lambda: self._format_server_list(data, title, mode))
 
-    async def _get_top_contributors(self, arguments: Dict[str, Any]) -> str:
+    async def _get_top_contributors(self, arguments: Dict[str, Any]) -> ToolResult:
         """Get top contributors"""
         limit = arguments.get("limit", 3)
-        data = await self.api_client.get_top_contributors(limit=limit)
-        return self._format_contributors(data, limit)
+        mode = formatters.validate_format(arguments.get("format"))
+        data = await self._reader.get_top_contributors(limit=limit)
+        return self._render("get_top_contributors", arguments, data, lambda: self._format_contributors(data, limit, mode))
 
-    def _format_server_list(self, data: Dict[str, Any], title: str) -> str:
+    async def _find_similar_servers(self, arguments: Dict[str, Any]) -> ToolResult:
+        """Find servers similar to a given server"""
+        server_id = arguments.get("server_id")
+        if not server_id:
+            return "Error: server_id is required"
+        limit = arguments.get("limit", 5)
+        if not isinstance(limit, int) or limit < 1:
+            return "Error: limit must be at least 1"
+        mode = formatters.validate_format(arguments.get("format"))
+        if self.similarity_index is None:
+            return "Error: find_similar_servers requires the catalog mirror (MIRROR_ENABLED=true) and numpy/scipy"
+        if not self.similarity_index.is_ready:
+            return "Error: the catalog mirror is still loading, try again shortly"
+
+        neighbours = self.similarity_index.similar(server_id, limit)
+        if neighbours is None:
+            return f"Error: server {server_id} is not in the catalog"
+        data = [server for server, _ in neighbours]
+        title = f"Servers similar to {server_id}"
+        return self._render("find_similar_servers", arguments, data, lambda: self._format_server_list(data, title, mode))
+
+    def _format_server_list(self, data: Dict[str, Any], title: str, mode: str = "text") -> str:
         """Format server list response"""
-        servers = data if isinstance(data, list) else data.get("servers", [])
-
-        if not servers:
-            return f"{title}\n\nNo servers found."
-
-        result = f"{title}\n{'=' * 60}\n\n"
-
-        for idx, server in enumerate(servers, 1):
-            result += f"{idx}. {server.get('name', 'Unknown')}\n"
-            result += f"   ID: {server.get('id')}\n"
-
-            desc = server.get('description', '')
-            if desc:
-                result += f"   Description: {desc[:100]}{'...' if len(desc) > 100 else ''}\n"
-
-            result += f"   GitHub: {server.get('github_link', 'N/A')}\n"
-            result += f"   Favorites: {server.get('favorites_count', 0)}\n"
-
-            tags = server.get('tags', [])
-            if tags:
-                tag_names = [t.get('name', t) if isinstance(t, dict) else t for t in tags]
-                result += f"   Tags: {', '.join(tag_names)}\n"
+        return formatters.format_server_list(data, title, mode)
 
-            result += "\n"
-
-        return result
-
-    def _format_server_details(self, server: Dict[str, Any]) -> str:
+    def _format_server_details(self, server: Dict[str, Any], mode: str = "text") -> str:
         """Format server details response"""
-        result = f"=== {server.get('name', 'Unknown')} ===\n\n"
-        result += f"ID: {server.get('id')}\n"
-        result += f"Description: {server.get('description', 'N/A')}\n"
-        result += f"GitHub: {server.get('github_link', 'N/A')}\n"
-        result += f"Protocol: {server.get('protocol', 'N/A')}\n"
-        result += f"Status: {server.get('status', 'N/A')}\n"
-        result += f"Favorites: {server.get('favorites_count', 0)}\n"
-
-        # Tags
-        tags = server.get('tags', [])
-        if tags:
-            tag_names = [t.get('name', t) if isinstance(t, dict) else t for t in tags]
-            result += f"Tags: {', '.join(tag_names)}\n"
-
-        # Tools
-        tools = server.get('tools', [])
-        if tools:
-            result += f"\n--- Tools ({len(tools)}) ---\n"
-            for tool in tools:
-                result += f"  • {tool.get('name', 'Unknown')}\n"
-                if tool.get('description'):
-                    result += f"    {tool['description']}\n"
-
-        # Additional metadata
-        if server.get('created_at'):
-            result += f"\nCreated: {server['created_at']}\n"
+        return formatters.format_server_details(server, mode)
 
-        return result
-
-    def _format_contributors(self, data: Dict[str, Any], limit: int) -> str:
+    def _format_contributors(self, data: Dict[str, Any], limit: int, mode: str = "text") -> str:
         """Format contributors response"""
-        users = data if isinstance(data, list) else data.get("users", data.get("top_users", []))
-
-        if not users:
-            return f"Top Contributors (Top {limit})\n\nNo contributors found."
-
-        result = f"Top Contributors (Top {limit})\n{'=' * 60}\n\n"
-
-        for idx, user in enumerate(users, 1):
-            username = user.get("username", user.get("user_name", "Unknown"))
-            server_count = user.get("server_count", user.get("count", 0))
+        return formatters.format_contributors(data, limit, mode)
 
-            result += f"{idx}. {username}\n"
-            result += f"   Servers: {server_count}\n\n"
 
-        return result
+def _sources(data: Any) -> tuple:
+    """Objects a rendered result is built from (the servers of a listing)"""
+    if isinstance(data, dict) and isinstance(data.get("servers"), list):
+        return tuple(data["servers"])
+    if isinstance(data, list):
+        return tuple(data)
+    return (data,)
@@ -0,0 +1,68 @@
+"""Cache of rendered tool results"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from mcp.types import TextContent
+
+
+class ResultCache:
+    """LRU cache of rendered tool results validated against their source data
+
+    Each entry remembers the objects it was rendered from (listing entries,
+    detail payloads). The response cache, catalog mirror and search index
+    hand out the same objects for as long as the data is unchanged and new
+    ones once it changes, so an entry is reused only while every source is
+    still the identical object. Anything else is a miss and re-renders.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        """Initialize cache
+
+        Args:
+            max_entries: Maximum number of rendered results kept
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Tuple[Any, ...], List[TextContent]]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[str, str], sources: Sequence[Any]) -> Optional[List[TextContent]]:
+        """Return the rendered result if it was built from exactly these sources"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            cached_sources, contents = entry
+            if len(cached_sources) == len(sources) and all(a is b for a, b in zip(cached_sources, sources)):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(contents)
+            del self._entries[key]
+            self.invalidations += 1
+        self.misses += 1
+        return None
+
+    def put(self, key: Tuple[str, str], sources: Sequence[Any], contents: List[TextContent]) -> None:
+        """Store a rendered result with the objects it was built from"""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (tuple(sources), list(contents))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/invalidation/eviction counters and size"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+        }
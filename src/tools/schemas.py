@@ -1,18 +1,35 @@
 """Tool schemas for MCP Hub MCP Server"""
 
+import json
+from typing import Any, Dict
+
 from mcp.types import Tool
 
+# Output mode shared by every tool
+FORMAT_PROPERTY = {
+    "type": "string",
+    "enum": ["text", "compact", "json"],
+    "description": "Output format: 'text' (readable, default), 'compact' (one line per item) or 'json' (structured)",
+    "default": "text"
+}
+
 TOOLS = [
     Tool(
         name="search_mcp_servers",
-        description="Search for MCP servers by keyword. Returns matching servers with basic information.",
+        description="Search for MCP servers by keyword and/or tags. Returns matching servers with basic information.",
         inputSchema={
             "type": "object",
             "properties": {
                 "keyword": {
                     "type": "string",
                     "description": "Search keyword to match against server name or description"
-                }
+                },
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Only return servers tagged with all of these tags"
+                },
+                "format": FORMAT_PROPERTY
             }
         }
     ),
@@ -43,7 +60,8 @@ TOOLS = [
                     "type": "integer",
                     "description": "Number of results to skip (default: 0)",
                     "default": 0
-                }
+                },
+                "format": FORMAT_PROPERTY
             }
         }
     ),
@@ -56,11 +74,28 @@ TOOLS = [
                 "server_id": {
                     "type": "integer",
                     "description": "The unique ID of the MCP server"
-                }
+                },
+                "format": FORMAT_PROPERTY
             },
             "required": ["server_id"]
         }
     ),
+    Tool(
+        name="get_mcp_server_details_batch",
+        description="Get detailed information about several MCP servers in one call. Use this instead of repeated get_mcp_server_details calls.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "server_ids": {
+                    "type": "array",
+                    "items": {"type": "integer"},
+                    "description": "Unique IDs of the MCP servers (duplicates are ignored)"
+                },
+                "format": FORMAT_PROPERTY
+            },
+            "required": ["server_ids"]
+        }
+    ),
     Tool(
         name="get_top_servers",
         description="Get top MCP servers by popularity (favorites) or recency (created_at).",
@@ -77,10 +112,35 @@ TOOLS = [
                     "enum": ["favorites", "created_at"],
                     "description": "Sort field: 'favorites' (most popular) or 'created_at' (newest)",
                     "default": "favorites"
-                }
+                },
+                "format": FORMAT_PROPERTY
             }
         }
     ),
+    Tool(
+        name="find_similar_servers",
+        description=(
+            "Find MCP servers similar to a given server, based on descriptions, tags and tools. "
+            "Returns at most SIMILAR_MAX_RESULTS servers (20 by default); larger limits are capped."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "server_id": {
+                    "type": "integer",
+                    "description": "The unique ID of the MCP server to compare against"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of similar servers to return (default: 5, capped at SIMILAR_MAX_RESULTS)",
+                    "default": 5,
+                    "minimum": 1
+                },
+                "format": FORMAT_PROPERTY
+            },
+            "required": ["server_id"]
+        }
+    ),
     Tool(
         name="get_top_contributors",
         description="Get top contributors (users with most MCP servers registered).",
@@ -91,8 +151,30 @@ TOOLS = [
                     "type": "integer",
                     "description": "Number of top contributors to return (default: 3)",
                     "default": 3
-                }
+                },
+                "format": FORMAT_PROPERTY
             }
         }
     )
 ]
+
+# Declared argument defaults per tool
+TOOL_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    tool.name: {
+        name: spec["default"]
+        for name, spec in tool.inputSchema.get("properties", {}).items()
+        if "default" in spec
+    }
+    for tool in TOOLS
+}
+
+
+def normalize_arguments(name: str, arguments: Dict[str, Any]) -> str:
+    """Canonical form of a tool call's arguments
+
+    Omitted arguments are filled in from the schema defaults, so calls that
+    differ only in spelling out a default (``{"limit": 3}`` vs ``{}``)
+    normalize to the same string.
+    """
+    merged = {**TOOL_DEFAULTS.get(name, {}), **arguments}
+    return json.dumps(merged, sort_keys=True, separators=(",", ":"), default=str)
@@ -1,12 +1,42 @@
 """HTTP transport for MCP server"""
 
 import logging
+import socket
+from typing import Optional
+
 from mcp.server import Server
-from mcp.server.stdio import stdio_server
+
+from . import metrics
 
 logger = logging.getLogger(__name__)
 
 
+async def _send_metrics(send):
+    """Respond with the Prometheus metrics page"""
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [[b"content-type", metrics.CONTENT_TYPE.encode()]],
+    })
+    await send({
+        "type": "http.response.body",
+        "body": metrics.REGISTRY.render().encode(),
+    })
+
+
+async def _send_not_found(send):
+    """Respond with 404"""
+    await send({
+        "type": "http.response.start",
+        "status": 404,
+        "headers": [[b"content-type", b"text/plain"]],
+    })
+    await send({
+        "type": "http.response.body",
+        "body": b"Not Found",
+    })
+
+
 async def run_http_transport(app: Server, host: str = "0.0.0.0", port: int = 8080):
     """Run MCP server with HTTP (SSE) transport
 
@@ -27,38 +57,85 @@ async def run_http_transport(app: Server, host: str = "0.0.0.0", port: int = 808
 
             if path == "/sse":
                 # Handle SSE endpoint
-                async with sse.connect_sse(scope, receive, send) as streams:
-                    await app.run(
-                        streams[0], streams[1], app.create_initialization_options()
-                    )
+                metrics.SSE_SESSIONS.inc()
+                try:
+                    async with sse.connect_sse(scope, receive, send) as streams:
+                        await app.run(
+                            streams[0], streams[1], app.create_initialization_options()
+                        )
+                finally:
+                    metrics.SSE_SESSIONS.dec()
             elif path == "/messages":
                 # Handle messages endpoint
                 await sse.handle_post_message(scope, receive, send)
+            elif path == "/metrics":
+                # Prometheus scrape endpoint
+                await _send_metrics(send)
             else:
                 # 404 for other paths
-                await send({
-                    "type": "http.response.start",
-                    "status": 404,
-                    "headers": [[b"content-type", b"text/plain"]],
-                })
-                await send({
-                    "type": "http.response.body",
-                    "body": b"Not Found",
-                })
+                await _send_not_found(send)
 
     import uvicorn
-    logger.info(f"Starting HTTP transport on {host}:{port}")
-    config = uvicorn.Config(asgi_app, host=host, port=port, log_level="info")
+    logger.info("Starting HTTP transport on %s:%s", host, port)
+    # log_config=None: uvicorn logs propagate to the root queue handler
+    config = uvicorn.Config(asgi_app, host=host, port=port, log_level="info", log_config=None)
     server = uvicorn.Server(config)
     await server.serve()
 
 
+async def run_streamable_http_transport(
+    app: Server,
+    host: str = "0.0.0.0",
+    port: int = 8080,
+    json_response: bool = False,
+    sock: Optional[socket.socket] = None
+):
+    """Run MCP server with stateless Streamable HTTP transport
+
+    Every request is a self-contained POST to /mcp, so no session state
+    is kept between requests and any worker or replica can serve any
+    request.
+
+    Args:
+        app: MCP Server instance
+        host: Host to bind to
+        port: Port to bind to
+        json_response: Return plain JSON responses instead of SSE streams
+        sock: Pre-bound listening socket (worker processes); overrides host/port
+    """
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+
+    manager = StreamableHTTPSessionManager(app, stateless=True, json_response=json_response)
+
+    async def asgi_app(scope, receive, send):
+        """Main ASGI app for routing"""
+        if scope["type"] == "http":
+            path = scope["path"]
+
+            if path == "/mcp":
+                await manager.handle_request(scope, receive, send)
+            elif path == "/metrics":
+                await _send_metrics(send)
+            else:
+                await _send_not_found(send)
+
+    import uvicorn
+    logger.info("Starting stateless Streamable HTTP transport on %s:%s", host, port)
+    # log_config=None: uvicorn logs propagate to the root queue handler
+    config = uvicorn.Config(asgi_app, host=host, port=port, log_level="info", log_config=None)
+    server = uvicorn.Server(config)
+    async with manager.run():
+        await server.serve(sockets=[sock] if sock is not None else None)
+
+
 async def run_stdio_transport(app: Server):
     """Run MCP server with stdio transport
 
     Args:
         app: MCP Server instance
     """
+    from mcp.server.stdio import stdio_server
+
     logger.info("Starting stdio transport")
     async with stdio_server() as (read_stream, write_stream):
         await app.run(
@@ -0,0 +1,122 @@
+"""Pre-fork worker processes for the HTTP server"""
+
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Callable, Dict
+
+from .logging_setup import stop_logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds between supervisor checks for exited workers
+_POLL_INTERVAL = 0.2
+# Delay before restarting a crashed worker (avoids a tight crash loop)
+_RESTART_DELAY = 1.0
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Create the listening socket shared by all workers
+
+    Args:
+        host: Host to bind to
+        port: Port to bind to
+
+    Returns:
+        Bound socket (uvicorn starts listening on it in each worker)
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    return sock
+
+
+def _ignore_signal(signum, frame):
+    # uvicorn handles SIGTERM/SIGINT while serving and re-raises them after
+    # a graceful shutdown; ignoring the re-raise lets the worker finish its
+    # own cleanup (closing the APIClient) before exiting.
+    pass
+
+
+def run_workers(
+    target: Callable[[socket.socket], None],
+    workers: int,
+    sock: socket.socket,
+    shutdown_timeout: float = 30.0
+) -> None:
+    """Fork worker processes serving on a shared socket and supervise them
+
+    Each worker runs ``target(sock)`` in its own interpreter state and event
+    loop. Workers that crash are restarted. SIGTERM or SIGINT to the
+    supervisor is forwarded to the workers as SIGTERM; workers still
+    running after ``shutdown_timeout`` are killed.
+
+    Args:
+        target: Function run in each worker with the listening socket
+        workers: Number of worker processes
+        sock: Bound listening socket inherited by the workers
+        shutdown_timeout: Seconds to wait for a graceful shutdown
+    """
+    children: Dict[int, int] = {}
+    stopping = False
+
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.signal(signal.SIGTERM, _ignore_signal)
+                signal.signal(signal.SIGINT, _ignore_signal)
+                target(sock)
+            except BaseException:
+                logger.exception("Worker %d failed", index)
+                code = 1
+            finally:
+                # os._exit skips atexit hooks: write out queued log records first
+                stop_logging()
+                os._exit(code)
+        children[pid] = index
+        logger.info("Started worker %d (pid %d)", index, pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    previous = {sig: signal.signal(sig, stop) for sig in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        for index in range(workers):
+            spawn(index)
+
+        deadline = None
+        while children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                if stopping:
+                    deadline = deadline or time.monotonic() + shutdown_timeout
+                    if time.monotonic() > deadline:
+                        logger.warning("Killing %d workers after shutdown timeout", len(children))
+                        for child in list(children):
+                            os.kill(child, signal.SIGKILL)
+                time.sleep(_POLL_INTERVAL)
+                continue
+
+            index = children.pop(pid, None)
+            if index is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if code != 0 and not stopping:
+                logger.warning("Worker %d (pid %d) exited with %d; restarting", index, pid, code)
+                time.sleep(_RESTART_DELAY)
+                if not stopping:
+                    spawn(index)
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
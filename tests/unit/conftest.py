@@ -0,0 +1,19 @@
+"""Shared fixtures for unit tests"""
+
+import pytest
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Clock starting at 0 that tests advance by setting ``now``"""
+    return FakeClock()
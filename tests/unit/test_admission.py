@@ -0,0 +1,105 @@
+"""Unit tests for tool call admission control"""
+
+import asyncio
+import pytest
+from src.admission import AdmissionController, OverloadedError
+
+
+async def hold(controller, gate, started, session=None, priority=0, label=None):
+    """Hold a slot until gate is set, recording start order"""
+    async with controller.slot(session, priority):
+        started.append(label)
+        await gate.wait()
+
+
+@pytest.mark.asyncio
+class TestAdmissionController:
+    """Unit tests for AdmissionController"""
+
+    async def test_global_cap_queues_excess_calls(self):
+        """Test calls beyond the global cap wait for a slot"""
+        controller = AdmissionController(max_in_flight=2, max_per_session=0)
+        gate = asyncio.Event()
+        started = []
+
+        tasks = [asyncio.create_task(hold(controller, gate, started, label=i)) for i in range(3)]
+        await asyncio.sleep(0)
+        assert started == [0, 1]
+        assert controller.waiting == 1
+
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert started == [0, 1, 2]
+        assert controller.stats()["in_flight"] == 0
+
+    async def test_priority_order(self):
+        """Test queued calls start by priority, then arrival"""
+        controller = AdmissionController(max_in_flight=1, max_per_session=0)
+        gate = asyncio.Event()
+        started = []
+
+        first = asyncio.create_task(hold(controller, gate, started, label="running"))
+        await asyncio.sleep(0)
+        heavy = asyncio.create_task(hold(controller, gate, started, priority=2, label="heavy"))
+        cheap = asyncio.create_task(hold(controller, gate, started, priority=0, label="cheap"))
+        await asyncio.sleep(0)
+
+        gate.set()
+        await asyncio.gather(first, heavy, cheap)
+        assert started == ["running", "cheap", "heavy"]
+
+    async def test_per_session_cap_does_not_block_other_sessions(self):
+        """Test a session at its cap is skipped in favour of other sessions"""
+        controller = AdmissionController(max_in_flight=10, max_per_session=1)
+        gate = asyncio.Event()
+        started = []
+
+        tasks = [
+            asyncio.create_task(hold(controller, gate, started, session="a", label="a1")),
+            asyncio.create_task(hold(controller, gate, started, session="a", label="a2")),
+            asyncio.create_task(hold(controller, gate, started, session="b", label="b1")),
+        ]
+        await asyncio.sleep(0)
+        assert started == ["a1", "b1"]
+        assert controller.waiting == 1
+
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert started == ["a1", "b1", "a2"]
+
+    async def test_full_queue_rejects_immediately(self):
+        """Test calls are rejected without waiting when the queue is full"""
+        controller = AdmissionController(max_in_flight=1, max_queued=1)
+        gate = asyncio.Event()
+        started = []
+
+        running = asyncio.create_task(hold(controller, gate, started))
+        queued = asyncio.create_task(hold(controller, gate, started))
+        await asyncio.sleep(0)
+
+        with pytest.raises(OverloadedError):
+            await controller.acquire()
+        assert controller.stats()["rejected"] == 1
+
+        gate.set()
+        await asyncio.gather(running, queued)
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test a cancelled queued call frees its queue position"""
+        controller = AdmissionController(max_in_flight=1)
+        gate = asyncio.Event()
+        started = []
+
+        running = asyncio.create_task(hold(controller, gate, started, label="running"))
+        queued = asyncio.create_task(hold(controller, gate, started, label="queued"))
+        await asyncio.sleep(0)
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert controller.waiting == 0
+
+        gate.set()
+        await running
+        assert started == ["running"]
+        assert controller.in_flight == 0
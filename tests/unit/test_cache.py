@@ -0,0 +1,74 @@
+"""Unit tests for response cache"""
+
+from src.cache import FRESH, MISS, STALE, ResponseCache, endpoint_kind, make_key
+
+
+class TestResponseCache:
+    """Unit tests for ResponseCache"""
+
+    def test_fresh_hit_and_miss(self, clock):
+        """Test fresh lookups and misses are counted"""
+        cache = ResponseCache(clock=clock)
+        assert cache.lookup("a") == (MISS, None)
+
+        cache.set("a", {"id": 1}, size=10, ttl=5)
+        assert cache.lookup("a") == (FRESH, {"id": 1})
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["bytes"] == 10
+
+    def test_stale_while_revalidate_window(self, clock):
+        """Test expired entries are stale inside the window and gone after it"""
+        cache = ResponseCache(stale_ttl=10, clock=clock)
+        cache.set("a", "value", size=1, ttl=5)
+
+        clock.now = 6
+        assert cache.lookup("a") == (STALE, "value")
+
+        clock.now = 16
+        assert cache.lookup("a") == (MISS, None)
+        assert len(cache) == 0
+
+    def test_lru_eviction_by_entry_count(self, clock):
+        """Test least recently used entry is evicted first"""
+        cache = ResponseCache(max_entries=2, clock=clock)
+        cache.set("a", 1, size=1, ttl=5)
+        cache.set("b", 2, size=1, ttl=5)
+        cache.lookup("a")
+        cache.set("c", 3, size=1, ttl=5)
+
+        assert cache.lookup("b") == (MISS, None)
+        assert cache.lookup("a") == (FRESH, 1)
+        assert cache.stats()["evictions"] == 1
+
+    def test_eviction_by_byte_size(self, clock):
+        """Test byte budget is enforced"""
+        cache = ResponseCache(max_bytes=100, clock=clock)
+        cache.set("a", 1, size=60, ttl=5)
+        cache.set("b", 2, size=60, ttl=5)
+
+        assert len(cache) == 1
+        assert cache.stats()["bytes"] == 60
+
+        cache.set("huge", 3, size=101, ttl=5)
+        assert cache.lookup("huge") == (MISS, None)
+
+    def test_zero_ttl_is_not_cached(self, clock):
+        """Test endpoints with TTL 0 bypass the cache"""
+        cache = ResponseCache(clock=clock)
+        cache.set("a", 1, size=1, ttl=0)
+        assert len(cache) == 0
+
+    def test_make_key_normalizes_param_order(self):
+        """Test keys do not depend on dict ordering"""
+        assert make_key("GET", "/x", {"a": 1, "b": 2}) == make_key("GET", "/x", {"b": 2, "a": 1})
+        assert make_key("GET", "/x", {"a": 1}) != make_key("POST", "/x", {"a": 1})
+
+    def test_endpoint_kind(self):
+        """Test endpoint classification"""
+        assert endpoint_kind("/mcp-servers/") == "list"
+        assert endpoint_kind("/mcp-servers/search") == "search"
+        assert endpoint_kind("/mcp-servers/top-users") == "contributors"
+        assert endpoint_kind("/mcp-servers/5") == "details"
@@ -0,0 +1,314 @@
+"""Unit tests for catalog mirror"""
+
+from collections import Counter
+
+import pytest
+from src.catalog import CatalogMirror, CatalogSnapshot
+from src.client import APIClient
+
+SERVERS = [
+    {"id": 1, "name": "alpha", "favorites_count": 5, "created_at": "2024-01-01T00:00:00"},
+    {"id": 2, "name": "beta", "favorites_count": 9, "created_at": "2024-02-01T00:00:00"},
+    {"id": 3, "name": "gamma", "favorites_count": 1, "created_at": "2024-03-01T00:00:00"},
+    {"id": 4, "name": "delta", "favorites_count": 9, "created_at": "2024-04-01T00:00:00"},
+    {"id": 5, "name": "epsilon", "favorites_count": 0, "created_at": "2024-05-01T00:00:00"},
+]
+
+
+def make_backend(mocker, servers=SERVERS):
+    """Create a mocked APIClient paging over servers by created_at or favorites"""
+    client = mocker.AsyncMock()
+
+    async def list_servers(sort="favorites", order="desc", limit=20, offset=0, use_cache=True):
+        field = "favorites_count" if sort == "favorites" else sort
+        ordered = sorted(servers, key=lambda s: (s.get(field, 0), s["id"]), reverse=(order == "desc"))
+        return {"servers": ordered[offset:offset + limit]}
+
+    async def get_server_details(server_id, use_cache=True):
+        return {"id": server_id, "tools": [{"name": f"tool-{server_id}"}]}
+
+    client.list_servers.side_effect = list_servers
+    client.get_server_details.side_effect = get_server_details
+    client.iter_servers = lambda **kwargs: APIClient.iter_servers(client, **kwargs)
+    return client
+
+
+class TestCatalogSnapshot:
+    """Unit tests for CatalogSnapshot paging"""
+
+    def test_page_desc_by_favorites(self):
+        """Test descending favorites ordering with offset and limit"""
+        snapshot = CatalogSnapshot(SERVERS)
+        ids = [s["id"] for s in snapshot.page("favorites", "desc", 3, 0)]
+        assert ids == [4, 2, 1]
+        ids = [s["id"] for s in snapshot.page("favorites", "desc", 3, 3)]
+        assert ids == [3, 5]
+
+    def test_page_asc_by_created_at(self):
+        """Test ascending created_at ordering"""
+        snapshot = CatalogSnapshot(SERVERS)
+        ids = [s["id"] for s in snapshot.page("created_at", "asc", 2, 1)]
+        assert ids == [2, 3]
+
+    def test_page_past_end_is_empty(self):
+        """Test offsets beyond the catalog return nothing"""
+        snapshot = CatalogSnapshot(SERVERS)
+        assert snapshot.page("favorites", "desc", 10, 10) == []
+        assert snapshot.page("favorites", "asc", 10, 10) == []
+
+    def test_watermark_is_newest_server(self):
+        """Test the watermark is the latest (created_at, id)"""
+        assert CatalogSnapshot(SERVERS).watermark == ("2024-05-01T00:00:00", 5)
+        assert CatalogSnapshot([]).watermark is None
+
+    def test_apply_matches_full_rebuild(self):
+        """Test a small delta keeps orderings identical to a fresh snapshot"""
+        servers = SERVERS + [
+            {"id": i, "name": f"s{i}", "favorites_count": i % 7, "created_at": f"2023-01-{i % 28 + 1:02d}T00:00:00"}
+            for i in range(10, 60)
+        ]
+        snapshot = CatalogSnapshot(servers, {1: {"id": 1}, 3: {"id": 3}})
+        added = {"id": 6, "name": "zeta", "favorites_count": 4, "created_at": "2024-06-01T00:00:00"}
+        modified = dict(SERVERS[1], favorites_count=100)
+
+        updated = snapshot.apply([added, modified], {6: {"id": 6}}, removed=[3])
+
+        expected = CatalogSnapshot([s for s in servers if s["id"] not in (2, 3)] + [added, modified])
+        for sort in ("favorites", "created_at"):
+            assert updated.page(sort, "desc", 100, 0) == expected.page(sort, "desc", 100, 0)
+        assert set(updated.details) == {1, 6}
+        assert updated.watermark == ("2024-06-01T00:00:00", 6)
+        # The original snapshot is unchanged
+        assert 3 in snapshot.servers and 6 not in snapshot.servers
+        assert snapshot.page("favorites", "desc", 1, 0)[0]["id"] in (2, 4)
+
+
+@pytest.mark.asyncio
+class TestCatalogMirror:
+    """Unit tests for CatalogMirror"""
+
+    async def test_refresh_pages_through_backend(self, mocker):
+        """Test refresh walks all pages and fetches details"""
+        backend = make_backend(mocker)
+        mirror = CatalogMirror(backend)
+        mirror.page_size = 2
+
+        snapshot = await mirror.refresh()
+
+        assert len(snapshot) == 5
+        assert backend.list_servers.call_count == 3
+        assert snapshot.details[3]["tools"][0]["name"] == "tool-3"
+
+    async def test_cold_mirror_falls_back_to_api(self, mocker):
+        """Test calls go to the live API before the first refresh"""
+        backend = make_backend(mocker)
+        mirror = CatalogMirror(backend)
+
+        await mirror.get_top_servers(limit=2)
+
+        backend.get_top_servers.assert_called_once_with(limit=2, sort="favorites")
+
+    async def test_warm_mirror_serves_locally(self, mocker):
+        """Test list/top/detail are answered from the snapshot"""
+        backend = make_backend(mocker)
+        mirror = CatalogMirror(backend)
+        await mirror.refresh()
+        backend.reset_mock()
+
+        top = await mirror.get_top_servers(limit=2, sort="created_at")
+        listing = await mirror.list_servers(sort="favorites", order="asc", limit=2, offset=0)
+        details = await mirror.get_server_details(2)
+
+        assert [s["id"] for s in top["servers"]] == [5, 4]
+        assert [s["id"] for s in listing["servers"]] == [5, 3]
+        assert details["id"] == 2
+        backend.list_servers.assert_not_called()
+        backend.get_top_servers.assert_not_called()
+        backend.get_server_details.assert_not_called()
+
+    async def test_failed_refresh_keeps_previous_snapshot(self, mocker):
+        """Test a failing refresh does not replace the published snapshot"""
+        backend = make_backend(mocker)
+        mirror = CatalogMirror(backend)
+        first = await mirror.refresh()
+
+        backend.list_servers.side_effect = Exception("backend down")
+        with pytest.raises(Exception):
+            await mirror.refresh()
+
+        assert mirror.snapshot is first
+
+    async def test_failed_detail_keeps_listing_entry(self, mocker):
+        """Test one failing detail call does not abort the refresh"""
+        now = [0.0]
+        backend = make_backend(mocker)
+        fetch_details = backend.get_server_details.side_effect
+
+        async def get_server_details(server_id, use_cache=True):
+            if server_id == 3:
+                raise Exception("404 Not Found")
+            return await fetch_details(server_id, use_cache)
+
+        backend.get_server_details.side_effect = get_server_details
+        mirror = CatalogMirror(backend, full_sync_interval=60, clock=lambda: now[0])
+        snapshot = await mirror.sync()
+
+        assert mirror.is_ready
+        assert 3 in snapshot.servers and 3 not in snapshot.details
+        assert mirror.stats()["details_failed"] == 1
+
+        # The next full sync fetches only the missing details again
+        backend.get_server_details.side_effect = fetch_details
+        backend.get_server_details.reset_mock()
+        now[0] = 61.0
+        snapshot = await mirror.sync()
+        assert 3 in snapshot.details
+        backend.get_server_details.assert_called_once_with(3, use_cache=False)
+
+    async def test_failed_detail_drops_stale_payload_on_rebuild(self, mocker):
+        """Test a large delta does not keep old details of a changed server"""
+        servers = [dict(s) for s in SERVERS]
+        backend = make_backend(mocker, servers)
+        mirror = CatalogMirror(backend, full_sync_interval=3600)
+        await mirror.sync()
+        assert 5 in mirror.snapshot.details
+
+        async def get_server_details(server_id, use_cache=True):
+            raise Exception("503 Service Unavailable")
+
+        backend.get_server_details.side_effect = get_server_details
+        servers[4] = dict(servers[4], name="epsilon-2")
+        # One upsert out of five servers exceeds the incremental fraction
+        snapshot = await mirror.sync()
+
+        assert snapshot.servers[5]["name"] == "epsilon-2"
+        assert 5 not in snapshot.details
+        assert set(snapshot.details) == {1, 2, 3, 4}
+
+    async def test_delta_sync_fetches_only_new_servers(self, mocker):
+        """Test a delta sync stops at the watermark and applies new servers"""
+        servers = [dict(s) for s in SERVERS]
+        backend = make_backend(mocker, servers)
+        mirror = CatalogMirror(backend, full_sync_interval=3600)
+        mirror.page_size = 2
+        await mirror.sync()
+        listener = mocker.Mock()
+        mirror.add_listener(listener)
+        backend.reset_mock()
+
+        servers.append({"id": 6, "name": "zeta", "favorites_count": 3, "created_at": "2024-06-01T00:00:00"})
+        snapshot = await mirror.sync()
+
+        assert len(snapshot) == 6
+        assert snapshot.watermark == ("2024-06-01T00:00:00", 6)
+        assert backend.list_servers.call_args_list == [
+            mocker.call(sort="created_at", order="desc", limit=2, offset=0, use_cache=False),
+            mocker.call(sort="favorites", order="desc", limit=2, offset=0, use_cache=False),
+        ]
+        backend.get_server_details.assert_called_once_with(6, use_cache=False)
+        listener.assert_called_once_with(snapshot, [6], [])
+        assert mirror.stats()["delta_syncs"] == 1
+
+    async def test_delta_sync_refreshes_top_favorites(self, mocker):
+        """Test a delta sync picks up favorite counts of older top servers"""
+        servers = [dict(s) for s in SERVERS]
+        backend = make_backend(mocker, servers)
+        mirror = CatalogMirror(backend, full_sync_interval=3600)
+        mirror.page_size = 2
+        await mirror.sync()
+        backend.reset_mock()
+
+        servers[0] = dict(servers[0], favorites_count=20)
+        servers[2] = dict(servers[2], favorites_count=2)
+        snapshot = await mirror.sync()
+
+        # Server 1 is now on the first favorites page; server 3 is not
+        assert snapshot.servers[1]["favorites_count"] == 20
+        assert snapshot.servers[3]["favorites_count"] == 1
+        assert snapshot.page("favorites", "desc", 1, 0)[0]["id"] == 1
+        backend.get_server_details.assert_called_once_with(1, use_cache=False)
+
+    async def test_delta_sync_without_changes_publishes_nothing(self, mocker):
+        """Test an idle tick keeps the snapshot and does not notify"""
+        backend = make_backend(mocker)
+        mirror = CatalogMirror(backend, full_sync_interval=3600)
+        first = await mirror.sync()
+        listener = mocker.Mock()
+        mirror.add_listener(listener)
+
+        assert await mirror.sync() is first
+        listener.assert_not_called()
+
+    async def test_full_sync_reconciles_deletions(self, mocker):
+        """Test a due full sync removes deleted servers and reuses details"""
+        servers = [dict(s) for s in SERVERS]
+        now = [0.0]
+        backend = make_backend(mocker, servers)
+        mirror = CatalogMirror(backend, full_sync_interval=60, clock=lambda: now[0])
+        await mirror.sync()
+        listener = mocker.Mock()
+        mirror.add_listener(listener)
+        backend.reset_mock()
+
+        del servers[0]
+        servers[1] = dict(servers[1], favorites_count=50)
+        now[0] = 61.0
+        snapshot = await mirror.sync()
+
+        assert 1 not in snapshot.servers
+        assert snapshot.servers[3]["favorites_count"] == 50
+        backend.get_server_details.assert_called_once_with(3, use_cache=False)
+        listener.assert_called_once_with(snapshot, [3], [1])
+        assert mirror.stats()["full_syncs"] == 2
+
+    async def test_top_contributors_from_leaderboard(self, mocker):
+        """Test contributors are ranked locally and follow delta syncs"""
+        servers = [dict(s, author="bob" if s["id"] % 2 else "alice") for s in SERVERS]
+        backend = make_backend(mocker, servers)
+        mirror = CatalogMirror(backend, full_sync_interval=3600)
+        await mirror.sync()
+
+        servers.append({"id": 6, "name": "zeta", "author": "alice", "created_at": "2024-06-01T00:00:00"})
+        servers.append({"id": 7, "name": "eta", "author": "alice", "created_at": "2024-07-01T00:00:00"})
+        await mirror.sync()
+        top = await mirror.get_top_contributors(limit=1)
+
+        assert top == {"users": [{"username": "alice", "server_count": 4}]}
+        backend.get_top_contributors.assert_not_called()
+
+    async def test_top_contributors_ties_match_backend(self, mocker):
+        """Test tied counts rank like the backend's top-users endpoint"""
+        authors = ["zoe", "bob", "zoe", "amy", "bob", "amy", "carl"]
+        servers = [
+            {"id": i, "name": f"s{i}", "author": author, "created_at": f"2024-01-{i:02d}T00:00:00"}
+            for i, author in enumerate(authors, 1)
+        ]
+        backend = make_backend(mocker, servers)
+
+        async def get_top_contributors(limit=3):
+            # Backend order: count, then first appearance in the catalog
+            counts = Counter(s["author"] for s in sorted(servers, key=lambda s: s["id"]))
+            return {"users": [{"username": u, "server_count": c} for u, c in counts.most_common(limit)]}
+
+        backend.get_top_contributors.side_effect = get_top_contributors
+        mirror = CatalogMirror(backend, full_sync_interval=3600)
+        await mirror.sync()
+
+        for limit in range(1, 5):
+            assert await mirror.get_top_contributors(limit) == await get_top_contributors(limit)
+
+        # carl takes over server 1 and now ties bob and amy from the lowest ID
+        servers[0] = dict(servers[0], author="carl")
+        await mirror.sync()
+        for limit in range(1, 5):
+            assert await mirror.get_top_contributors(limit) == await get_top_contributors(limit)
+
+    async def test_top_contributors_fall_back_without_authors(self, mocker):
+        """Test the top-users endpoint is used when listings carry no authors"""
+        backend = make_backend(mocker)
+        mirror = CatalogMirror(backend)
+        await mirror.refresh()
+
+        await mirror.get_top_contributors(limit=2)
+
+        backend.get_top_contributors.assert_called_once_with(limit=2)
@@ -1,8 +1,12 @@
 """Unit tests for API client with mocks"""
 
+import asyncio
+import time
+import httpx
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from src.client import APIClient
+from src.config import config
 
 
 @pytest.mark.asyncio
@@ -38,7 +42,8 @@ class TestAPIClientUnit:
         assert result == mock_response
         client._get.assert_called_once_with(
             "/mcp-servers/",
-            {"status": "approved", "sort": "favorites", "order": "desc", "limit": 5, "offset": 0}
+            {"status": "approved", "sort": "favorites", "order": "desc", "limit": 5, "offset": 0},
+            use_cache=True
         )
         await client.close()
 
@@ -52,7 +57,7 @@ class TestAPIClientUnit:
         result = await client.get_server_details(server_id=5)
 
         assert result == mock_response
-        client._get.assert_called_once_with("/mcp-servers/5")
+        client._get.assert_called_once_with("/mcp-servers/5", use_cache=True)
         await client.close()
 
     async def test_get_top_servers_mock(self, mocker):
@@ -83,3 +88,429 @@ class TestAPIClientUnit:
         assert result == mock_response
         client._get.assert_called_once_with("/mcp-servers/top-users", {"limit": 3})
         await client.close()
+
+
+def make_mock_client(handler):
+    """Create an APIClient whose HTTP layer is served by handler"""
+    client = APIClient()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+@pytest.mark.asyncio
+class TestAPIClientCache:
+    """Unit tests for API client response caching"""
+
+    async def test_repeated_get_is_served_from_cache(self):
+        """Test identical requests hit the backend once"""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            return httpx.Response(200, json={"servers": [{"id": 1}]})
+
+        client = make_mock_client(handler)
+        first = await client.list_servers(limit=3)
+        second = await client.list_servers(limit=3)
+
+        assert first == second
+        assert len(calls) == 1
+        assert client.cache_stats()["hits"] == 1
+        await client.close()
+
+    async def test_stale_entry_is_served_while_refreshing(self):
+        """Test expired entries are returned immediately and refreshed in background"""
+        responses = iter([{"id": 1, "v": 1}, {"id": 1, "v": 2}])
+
+        def handler(request):
+            return httpx.Response(200, json=next(responses))
+
+        client = make_mock_client(handler)
+        assert (await client.get_server_details(1))["v"] == 1
+
+        key = next(iter(client.cache._entries))
+        client.cache._entries[key].stored_at -= client._ttls["details"] + 1
+
+        assert (await client.get_server_details(1))["v"] == 1
+        await asyncio.gather(*client._refreshing.values())
+        assert (await client.get_server_details(1))["v"] == 2
+        assert client.cache_stats()["refreshes"] == 1
+        await client.close()
+
+    async def test_uncached_request_skips_cache(self):
+        """Test bulk-sync requests always reach the backend and store nothing"""
+        versions = iter(range(1, 10))
+
+        def handler(request):
+            return httpx.Response(200, json={"id": 1, "v": next(versions)})
+
+        client = make_mock_client(handler)
+        assert (await client.get_server_details(1))["v"] == 1
+        assert (await client.get_server_details(1, use_cache=False))["v"] == 2
+        assert (await client.list_servers(use_cache=False))["v"] == 3
+
+        # The cached entry is untouched and nothing else was stored
+        assert (await client.get_server_details(1))["v"] == 1
+        assert client.cache_stats()["entries"] == 1
+        await client.close()
+
+    async def test_has_fresh_checks_cache_without_counting(self):
+        """Test freshness checks match cached requests and leave stats alone"""
+        client = make_mock_client(lambda request: httpx.Response(200, json={"servers": []}))
+        assert not client.has_fresh_listing("favorites", "desc", 5, 0)
+
+        await client.list_servers(limit=5)
+        await client.get_server_details(3)
+        stats = client.cache_stats()
+
+        assert client.has_fresh_listing("favorites", "desc", 5, 0)
+        assert not client.has_fresh_listing("favorites", "desc", 5, 5)
+        assert client.has_fresh_details(3)
+        assert not client.has_fresh_details(4)
+        assert client.cache_stats() == stats
+        await client.close()
+
+    async def test_concurrent_identical_requests_are_coalesced(self):
+        """Test a burst of identical misses issues one HTTP request"""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"id": 7})
+
+        client = make_mock_client(handler)
+        results = await asyncio.gather(*[client.get_server_details(7) for _ in range(20)])
+
+        assert len(calls) == 1
+        assert all(r == {"id": 7} for r in results)
+        assert client.coalescing_stats()["shared"] == 19
+        await client.close()
+
+
+@pytest.mark.asyncio
+class TestAPIClientPagination:
+    """Unit tests for streaming pagination"""
+
+    async def test_iter_servers_walks_all_pages(self, mocker):
+        """Test iteration continues until a short page"""
+        client = APIClient()
+        servers = [{"id": i} for i in range(7)]
+
+        async def list_servers(sort, order, limit, offset, use_cache=True):
+            return {"servers": servers[offset:offset + limit]}
+
+        mocker.patch.object(client, "list_servers", side_effect=list_servers)
+
+        result = [s["id"] async for s in client.iter_servers(page_size=3)]
+
+        assert result == list(range(7))
+        assert client.list_servers.call_count == 3
+        await client.close()
+
+    async def test_iter_servers_bounds_read_ahead(self, mocker):
+        """Test the producer stops once the buffer is full"""
+        client = APIClient()
+
+        async def list_servers(sort, order, limit, offset, use_cache=True):
+            return {"servers": [{"id": offset + i} for i in range(limit)]}
+
+        mocker.patch.object(client, "list_servers", side_effect=list_servers)
+
+        iterator = client.iter_servers(page_size=2, max_buffered_pages=2)
+        assert (await iterator.__anext__())["id"] == 0
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        # One page being consumed, two buffered, one blocked on put
+        assert client.list_servers.call_count == 4
+        await iterator.aclose()
+        await client.close()
+
+    async def test_iter_servers_propagates_errors(self, mocker):
+        """Test backend errors surface to the consumer"""
+        client = APIClient()
+        mocker.patch.object(client, "list_servers", side_effect=Exception("backend down"))
+
+        with pytest.raises(Exception, match="backend down"):
+            async for _ in client.iter_servers(page_size=2):
+                pass
+        await client.close()
+
+
+async def start_keepalive_server():
+    """Start a minimal HTTP/1.1 server answering every request with 200"""
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                await asyncio.sleep(0.01)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}"
+
+
+@pytest.mark.asyncio
+class TestAPIClientPool:
+    """Unit tests for connection pool configuration"""
+
+    async def test_pool_limits_from_config(self):
+        """Test pool limits come from config"""
+        client = APIClient()
+        stats = client.pool_stats()
+
+        assert stats["max_connections"] == config.http_max_connections
+        assert stats["connections"] == 0
+        await client.close()
+
+    async def test_warm_up_opens_idle_connections(self):
+        """Test warm-up leaves keep-alive connections in the pool"""
+        server, url = await start_keepalive_server()
+        client = APIClient()
+        client.base_url = url
+
+        idle = await client.warm_up(3)
+
+        assert idle == 3
+        stats = client.pool_stats()
+        assert stats["in_use"] == 0
+        assert stats["waiters"] == 0
+        await client.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+class TestAPIClientFakeHub:
+    """Unit tests for APIClient against the in-process fake backend"""
+
+    async def test_endpoints_round_trip(self):
+        """Test every client method against the fake MCP Hub API"""
+        from benchmarks.fake_hub import API_PREFIX, FakeHub
+
+        hub = FakeHub(servers=30)
+        client = APIClient()
+        client.base_url = f"http://fake{API_PREFIX}"
+        client.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=hub))
+
+        listing = await client.list_servers(limit=5, sort="favorites")
+        details = await client.get_server_details(listing["servers"][0]["id"])
+        top_users = await client.get_top_contributors(limit=2)
+        word = hub.catalog[0]["name"].split("-")[0]
+        found = await client.search_servers(keyword=word)
+        every = [s async for s in client.iter_servers(page_size=7)]
+
+        assert len(listing["servers"]) == 5
+        assert "tools" in details
+        assert len(top_users["users"]) == 2
+        assert any(s["id"] == hub.catalog[0]["id"] for s in found["servers"])
+        assert len(every) == 30
+        await client.close()
+
+
+@pytest.mark.asyncio
+class TestAPIClientSharedCache:
+    """Unit tests for the cache shared between worker processes"""
+
+    async def test_second_client_is_served_from_shared_cache(self, tmp_path, monkeypatch):
+        """Test a response fetched by one client is reused by another"""
+        monkeypatch.setattr(config, "shared_cache_path", str(tmp_path / "shared.sqlite3"))
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            return httpx.Response(200, json={"servers": [{"id": 1}]})
+
+        first = make_mock_client(handler)
+        second = make_mock_client(handler)
+
+        assert await first.list_servers(limit=3) == {"servers": [{"id": 1}]}
+        assert await second.list_servers(limit=3) == {"servers": [{"id": 1}]}
+        # Now held in the second client's local cache as well
+        assert await second.list_servers(limit=3) == {"servers": [{"id": 1}]}
+
+        assert len(calls) == 1
+        assert second.shared_cache_stats()["hits"] == 1
+        await first.close()
+        await second.close()
+
+    async def test_restart_serves_stale_and_revalidates(self, tmp_path, monkeypatch):
+        """Test a restarted client answers from disk at once and refreshes in background"""
+        monkeypatch.setattr(config, "shared_cache_path", str(tmp_path / "shared.sqlite3"))
+        responses = iter([{"servers": [{"id": 1}]}, {"servers": [{"id": 2}]}])
+
+        def handler(request):
+            return httpx.Response(200, json=next(responses))
+
+        before = make_mock_client(handler)
+        await before.list_servers(limit=3)
+        await before.close()
+
+        # Age the stored entry past its TTL but inside the disk stale window
+        after = make_mock_client(handler)
+        after.shared._clock = lambda: time.time() + config.cache_ttls["list"] + 1
+
+        assert await after.list_servers(limit=3) == {"servers": [{"id": 1}]}
+        await asyncio.gather(*after._refreshing.values())
+        assert await after.list_servers(limit=3) == {"servers": [{"id": 2}]}
+        await after.close()
+
+
+@pytest.mark.asyncio
+class TestAPIClientResilience:
+    """Unit tests for retries, hedging and circuit breaking"""
+
+    @pytest.fixture(autouse=True)
+    def fast_backoff(self, monkeypatch):
+        monkeypatch.setattr(config, "retry_backoff_base", 0.0)
+
+    async def test_get_retried_after_server_error(self):
+        """Test a failed GET is retried and succeeds"""
+        responses = iter([httpx.Response(503), httpx.Response(200, json={"id": 1})])
+        client = make_mock_client(lambda request: next(responses))
+
+        assert await client.get_server_details(1) == {"id": 1}
+        assert client.resilience_stats()["retries"] == 1
+        await client.close()
+
+    async def test_post_and_client_errors_not_retried(self):
+        """Test POSTs and 4xx responses are sent once"""
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            return httpx.Response(503 if request.method == "POST" else 404)
+
+        client = make_mock_client(handler)
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.search_servers(keyword="x")
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_server_details(1)
+
+        assert calls == ["POST", "GET"]
+        await client.close()
+
+    async def test_open_circuit_fails_fast(self, monkeypatch):
+        """Test calls stop reaching the backend once the circuit opens"""
+        from src.resilience import CircuitOpenError
+
+        monkeypatch.setattr(config, "retry_attempts", 0)
+        monkeypatch.setattr(config, "circuit_failure_threshold", 2)
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            return httpx.Response(500)
+
+        client = make_mock_client(handler)
+        for server_id in (1, 2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get_server_details(server_id)
+        with pytest.raises(CircuitOpenError):
+            await client.get_server_details(3)
+
+        assert len(calls) == 2
+        assert client.resilience_stats()["circuits_open"] == 1
+        await client.close()
+
+    async def test_expired_entry_served_when_backend_fails(self, monkeypatch):
+        """Test stale-if-error returns the last good response"""
+        monkeypatch.setattr(config, "retry_attempts", 0)
+        responses = iter([httpx.Response(200, json={"id": 1}), httpx.Response(500)])
+        client = make_mock_client(lambda request: next(responses))
+        client.cache.stale_ttl = 0
+
+        await client.get_server_details(1)
+        key = next(iter(client.cache._entries))
+        client.cache._entries[key].stored_at -= config.cache_ttls["details"] + 1
+
+        assert await client.get_server_details(1) == {"id": 1}
+        assert client.resilience_stats()["stale_if_error"] == 1
+        await client.close()
+
+    async def test_hedged_request_beats_slow_primary(self, monkeypatch):
+        """Test a backup request is sent after the latency threshold and wins"""
+        from src.resilience import LatencyWindow
+
+        monkeypatch.setattr(config, "hedge_enabled", True)
+        monkeypatch.setattr(config, "hedge_min_delay", 0.01)
+        calls = 0
+
+        async def handler(request):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(5)
+            return httpx.Response(200, json={"id": calls})
+
+        client = make_mock_client(handler)
+        window = client._latency["/mcp-servers/{id}"] = LatencyWindow(min_samples=1)
+        window.observe(0.01)
+
+        assert await asyncio.wait_for(client.get_server_details(1), timeout=1) == {"id": 2}
+        stats = client.resilience_stats()
+        assert stats["hedges"] == 1
+        assert stats["hedge_wins"] == 1
+        await client.close()
+
+
+@pytest.mark.asyncio
+class TestAPIClientRevalidation:
+    """Unit tests for ETag / Last-Modified revalidation"""
+
+    def make_hub_client(self, hub):
+        from benchmarks.fake_hub import API_PREFIX
+
+        client = APIClient()
+        client.base_url = f"http://fake{API_PREFIX}"
+        client.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=hub))
+        return client
+
+    def expire(self, client):
+        for entry in client.cache._entries.values():
+            entry.stored_at -= entry.ttl + 1
+
+    async def test_not_modified_reuses_parsed_value(self):
+        """Test a 304 refresh returns the same object without re-downloading"""
+        from benchmarks.fake_hub import FakeHub
+
+        hub = FakeHub(servers=30)
+        client = self.make_hub_client(hub)
+        first = await client.list_servers(limit=10)
+        sent = hub.bytes_sent
+
+        self.expire(client)
+        client.cache.stale_ttl = 0
+        second = await client.list_servers(limit=10)
+
+        assert second is first
+        assert hub.not_modified == 1
+        assert hub.bytes_sent == sent
+        assert client.cache_stats()["revalidations"] == 1
+        await client.close()
+
+    async def test_changed_resource_is_downloaded(self):
+        """Test a modified resource is fetched in full after its ETag changes"""
+        from benchmarks.fake_hub import FakeHub
+
+        hub = FakeHub(servers=30)
+        client = self.make_hub_client(hub)
+        server_id = hub.catalog[0]["id"]
+        await client.get_server_details(server_id)
+
+        hub.modify(server_id, name="renamed")
+        self.expire(client)
+        client.cache.stale_ttl = 0
+        details = await client.get_server_details(server_id)
+
+        assert details["name"] == "renamed"
+        assert hub.not_modified == 0
+        await client.close()
@@ -0,0 +1,102 @@
+"""Unit tests for output formatters"""
+
+import json
+import pytest
+from src.tools import formatters
+
+SERVER = {
+    "id": 1,
+    "name": "github-mcp",
+    "description": "x" * 120,
+    "github_link": "https://github.com/example/github-mcp",
+    "favorites_count": 4,
+    "tags": [{"name": "git"}, "devtools"],
+}
+
+DETAILS = {
+    "id": 1,
+    "name": "github-mcp",
+    "description": "GitHub tools",
+    "protocol": "stdio",
+    "status": "approved",
+    "favorites_count": 4,
+    "tags": [{"name": "git"}],
+    "tools": [{"name": "create_issue", "description": "Create an issue"}, {"name": "list_prs"}],
+    "created_at": "2024-01-01",
+}
+
+
+class TestFormatters:
+    """Unit tests for formatters"""
+
+    def test_text_server_list(self):
+        """Test text mode output layout"""
+        text = formatters.format_server_list({"servers": [SERVER]}, "Title")
+        assert text == (
+            "Title\n" + "=" * 60 + "\n\n"
+            "1. github-mcp\n"
+            "   ID: 1\n"
+            "   Description: " + "x" * 100 + "...\n"
+            "   GitHub: https://github.com/example/github-mcp\n"
+            "   Favorites: 4\n"
+            "   Tags: git, devtools\n"
+            "\n"
+        )
+
+    def test_text_empty_list(self):
+        """Test empty listing message"""
+        assert formatters.format_server_list([], "Title") == "Title\n\nNo servers found."
+
+    def test_text_server_details(self):
+        """Test text mode details layout"""
+        text = formatters.format_server_details(DETAILS)
+        assert text == (
+            "=== github-mcp ===\n\n"
+            "ID: 1\n"
+            "Description: GitHub tools\n"
+            "GitHub: N/A\n"
+            "Protocol: stdio\n"
+            "Status: approved\n"
+            "Favorites: 4\n"
+            "Tags: git\n"
+            "\n--- Tools (2) ---\n"
+            "  • create_issue\n"
+            "    Create an issue\n"
+            "  • list_prs\n"
+            "\nCreated: 2024-01-01\n"
+        )
+
+    def test_text_contributors(self):
+        """Test text mode contributors layout"""
+        text = formatters.format_contributors({"users": [{"username": "admin", "server_count": 5}]}, 3)
+        assert text == "Top Contributors (Top 3)\n" + "=" * 60 + "\n\n1. admin\n   Servers: 5\n\n"
+
+    def test_compact_modes(self):
+        """Test compact mode renders one line per item"""
+        text = formatters.format_server_list([SERVER, SERVER], "Title", "compact")
+        assert text.splitlines() == [
+            "Title",
+            "1. github-mcp (ID 1) - 4 favorites [git, devtools]",
+            "2. github-mcp (ID 1) - 4 favorites [git, devtools]",
+        ]
+        assert formatters.format_server_details(DETAILS, "compact") == "github-mcp (ID 1) - 4 favorites, 2 tools [git]"
+
+    def test_json_modes(self):
+        """Test json mode produces structured output"""
+        data = json.loads(formatters.format_server_list([SERVER], "Title", "json"))
+        assert data["servers"][0]["tags"] == ["git", "devtools"]
+
+        data = json.loads(formatters.format_contributors([{"user_name": "bob", "count": 2}], 3, "json"))
+        assert data["contributors"] == [{"username": "bob", "server_count": 2}]
+
+    def test_batch_json_reports_errors(self):
+        """Test batch json output separates failures"""
+        data = json.loads(formatters.format_server_details_batch([(1, DETAILS), (2, Exception("Not Found"))], "json"))
+        assert [s["id"] for s in data["servers"]] == [1]
+        assert data["errors"] == [{"id": 2, "error": "Not Found"}]
+
+    def test_validate_format(self):
+        """Test unknown formats are rejected"""
+        assert formatters.validate_format(None) == "text"
+        with pytest.raises(ValueError):
+            formatters.validate_format("xml")
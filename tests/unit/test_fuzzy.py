@@ -0,0 +1,61 @@
+"""Unit tests for trigram fuzzy matching"""
+
+from src.fuzzy import TrigramIndex, trigrams
+
+
+def build_index():
+    """Index a few servers by name, tag and tool terms"""
+    index = TrigramIndex()
+    index.upsert(1, {"github": 3, "mcp": 3, "git": 2})
+    index.upsert(2, {"postgres": 3, "mcp": 3, "database": 2, "sql": 1})
+    index.upsert(3, {"kubernetes": 3, "mcp": 3})
+    return index
+
+
+class TestTrigramIndex:
+    """Unit tests for TrigramIndex"""
+
+    def test_trigrams_are_padded(self):
+        """Test word boundaries produce their own trigrams"""
+        assert trigrams("git") == {"  g", " gi", "git", "it "}
+
+    def test_typos_match(self):
+        """Test misspelled tokens find the intended server"""
+        index = build_index()
+        assert index.search(["githbu"]) == [1]
+        assert index.search(["postgress"]) == [2]
+        assert index.search(["kubernets"]) == [3]
+
+    def test_match_terms_best_first(self):
+        """Test candidate terms are ordered by similarity"""
+        matches = build_index().match_terms("datbase")
+        assert matches[0][1] == "database"
+        assert all(score >= 0.4 for score, _ in matches)
+
+    def test_unrelated_token_finds_nothing(self):
+        """Test tokens below the threshold do not match"""
+        assert build_index().search(["zzzz"]) == []
+
+    def test_common_terms_are_ignored(self):
+        """Test terms present in most documents do not rank anything"""
+        assert build_index().search(["mpc"]) == []
+
+    def test_allowed_and_exclude(self):
+        """Test candidate filtering"""
+        index = build_index()
+        assert index.search(["githbu", "postgress"], allowed={2}) == [2]
+        assert index.search(["githbu", "postgress"], exclude=[2]) == [1]
+
+    def test_remove_and_replace(self):
+        """Test documents can be replaced and removed"""
+        index = build_index()
+        index.upsert(1, {"kafka": 3})
+        assert index.search(["githbu"]) == []
+        assert index.search(["kafak"]) == [1]
+
+        index.remove(1)
+        index.remove(1)
+        assert len(index) == 2
+        assert index.search(["kafak"]) == []
+        assert "kafka" not in index._term_docs
+        assert not any("kafka" in terms for terms in index._gram_terms.values())
@@ -1,5 +1,7 @@
 """Unit tests for tool handlers"""
 
+import asyncio
+
 import pytest
 from mcp.types import TextContent
 from src.tools.handlers import ToolHandler
@@ -112,3 +114,170 @@ class TestToolHandlerUnit:
         assert isinstance(result, list)
         assert len(result) == 1
         assert "Error" in result[0].text
+
+    async def test_catalog_serves_listing_tools(self, mocker):
+        """Test list/top/detail tools read from the catalog when configured"""
+        mock_client = mocker.AsyncMock()
+        mock_catalog = mocker.AsyncMock()
+        mock_catalog.get_top_servers.return_value = {"servers": [{"id": 1}]}
+
+        handler = ToolHandler(mock_client, catalog=mock_catalog)
+        await handler.handle_tool_call("get_top_servers", {"limit": 3})
+
+        mock_catalog.get_top_servers.assert_called_once_with(limit=3, sort="favorites")
+        mock_client.get_top_servers.assert_not_called()
+
+    async def test_search_forwards_tags(self, mocker):
+        """Test tag filters are passed to the backend search"""
+        mock_client = mocker.AsyncMock()
+        mock_client.search_servers.return_value = {"servers": []}
+
+        handler = ToolHandler(mock_client)
+        await handler.handle_tool_call("search_mcp_servers", {"keyword": "git", "tags": ["devtools"]})
+
+        mock_client.search_servers.assert_called_once_with(keyword="git", tags=["devtools"])
+
+    async def test_search_uses_local_index_when_ready(self, mocker):
+        """Test search is answered by the local index once populated"""
+        mock_client = mocker.AsyncMock()
+        mock_index = mocker.MagicMock()
+        mock_index.is_ready = True
+        mock_index.search.return_value = [{"id": 1, "name": "github-mcp"}]
+
+        handler = ToolHandler(mock_client, search_index=mock_index)
+        result = await handler.handle_tool_call("search_mcp_servers", {"keyword": "github"})
+
+        assert "github-mcp" in result[0].text
+        mock_client.search_servers.assert_not_called()
+
+    async def test_get_server_details_batch_handler(self, mocker):
+        """Test batch details deduplicates IDs and tolerates partial failures"""
+        mock_client = mocker.AsyncMock()
+
+        async def get_server_details(server_id):
+            if server_id == 2:
+                raise Exception("Not Found")
+            return {"id": server_id, "name": f"server-{server_id}"}
+
+        mock_client.get_server_details.side_effect = get_server_details
+
+        handler = ToolHandler(mock_client)
+        result = await handler.handle_tool_call(
+            "get_mcp_server_details_batch",
+            {"server_ids": [1, 2, 3, 1]}
+        )
+
+        text = result[0].text
+        assert mock_client.get_server_details.call_count == 3
+        assert "2 of 3 found" in text
+        assert "server-1" in text and "server-3" in text
+        assert "Error: Not Found" in text
+
+    async def test_get_server_details_batch_requires_ids(self, mocker):
+        """Test batch details rejects an empty list"""
+        handler = ToolHandler(mocker.AsyncMock())
+        result = await handler.handle_tool_call("get_mcp_server_details_batch", {"server_ids": []})
+        assert "server_ids is required" in result[0].text
+
+    async def test_format_argument(self, mocker):
+        """Test the format argument selects the output mode"""
+        mock_client = mocker.AsyncMock()
+        mock_client.list_servers.return_value = {"servers": [{"id": 1, "name": "test"}]}
+
+        handler = ToolHandler(mock_client)
+        result = await handler.handle_tool_call("list_mcp_servers", {"format": "json"})
+        assert result[0].text.startswith("{")
+
+        result = await handler.handle_tool_call("list_mcp_servers", {"format": "xml"})
+        assert result[0].text.startswith("Error: format must be one of")
+
+    async def test_overloaded_call_is_rejected(self, mocker):
+        """Test a full admission queue returns an error without running the tool"""
+        from src.admission import AdmissionController
+
+        mock_client = mocker.AsyncMock()
+        handler = ToolHandler(mock_client)
+        handler.admission = AdmissionController(max_in_flight=1, max_queued=0)
+        await handler.admission.acquire()
+
+        result = await handler.handle_tool_call("get_top_servers", {})
+
+        assert "busy" in result[0].text
+        mock_client.get_top_servers.assert_not_called()
+
+    async def test_prefetch_after_listing(self, mocker):
+        """Test an enabled prefetcher warms the next page and counts the hit"""
+        mocker.patch("src.tools.handlers.config.prefetch_enabled", True)
+        mock_client = mocker.AsyncMock()
+        mock_client.list_servers.return_value = {"servers": [{"id": 1}, {"id": 2}]}
+        mock_client.has_fresh_listing = mocker.Mock(return_value=False)
+        mock_client.has_fresh_details = mocker.Mock(return_value=False)
+
+        handler = ToolHandler(mock_client)
+        await handler.handle_tool_call("list_mcp_servers", {"limit": 2, "offset": 0})
+        await asyncio.gather(*list(handler.prefetcher._tasks.values()))
+        await handler.handle_tool_call("list_mcp_servers", {"limit": 2, "offset": 2})
+
+        stats = handler.prefetcher.stats()
+        assert stats["hits"] == 1
+        assert stats["issued"] >= 2
+        mock_client.get_server_details.assert_called()
+
+    async def test_result_cache_reuses_equivalent_calls(self, mocker):
+        """Test calls equal up to schema defaults share one rendered result"""
+        mock_client = mocker.AsyncMock()
+        mock_client.get_top_servers.return_value = {"servers": [{"id": 1, "name": "test"}]}
+        handler = ToolHandler(mock_client)
+        format_list = mocker.spy(handler, "_format_server_list")
+
+        first = await handler.handle_tool_call("get_top_servers", {"limit": 3})
+        second = await handler.handle_tool_call("get_top_servers", {})
+
+        assert first[0].text == second[0].text
+        assert format_list.call_count == 1
+        assert handler.results.stats()["hits"] == 1
+
+    async def test_result_cache_invalidated_by_new_data(self, mocker):
+        """Test a changed backend response is rendered again"""
+        mock_client = mocker.AsyncMock()
+        mock_client.get_top_servers.return_value = {"servers": [{"id": 1, "name": "old"}]}
+        handler = ToolHandler(mock_client)
+        await handler.handle_tool_call("get_top_servers", {})
+
+        mock_client.get_top_servers.return_value = {"servers": [{"id": 1, "name": "new"}]}
+        result = await handler.handle_tool_call("get_top_servers", {})
+
+        assert "new" in result[0].text
+        assert handler.results.stats()["invalidations"] == 1
+
+    async def test_find_similar_servers(self, mocker):
+        """Test similar servers come from the similarity index"""
+        mock_client = mocker.AsyncMock()
+        mock_index = mocker.MagicMock()
+        mock_index.is_ready = True
+        mock_index.similar.return_value = [({"id": 3, "name": "gitlab-mcp"}, 0.42)]
+
+        handler = ToolHandler(mock_client, similarity_index=mock_index)
+        result = await handler.handle_tool_call("find_similar_servers", {"server_id": 1, "limit": 3})
+
+        assert "Servers similar to 1" in result[0].text
+        assert "gitlab-mcp" in result[0].text
+        mock_index.similar.assert_called_once_with(1, 3)
+
+    async def test_find_similar_servers_errors(self, mocker):
+        """Test find_similar_servers without an index or for unknown servers"""
+        handler = ToolHandler(mocker.AsyncMock())
+        result = await handler.handle_tool_call("find_similar_servers", {"server_id": 1})
+        assert "requires the catalog mirror" in result[0].text
+
+        mock_index = mocker.MagicMock()
+        mock_index.is_ready = True
+        mock_index.similar.return_value = None
+        handler = ToolHandler(mocker.AsyncMock(), similarity_index=mock_index)
+        result = await handler.handle_tool_call("find_similar_servers", {"server_id": 99})
+        assert result[0].text == "Error: server 99 is not in the catalog"
+
+        for limit in (0, -1):
+            result = await handler.handle_tool_call("find_similar_servers", {"server_id": 1, "limit": limit})
+            assert result[0].text == "Error: limit must be at least 1"
+        mock_index.similar.assert_called_once_with(99, 5)
@@ -0,0 +1,92 @@
+"""Unit tests for catalog leaderboards"""
+
+from src.catalog import CatalogSnapshot
+from src.leaderboard import ContributorLeaderboard, RankedCounter, author_of
+
+
+class TestRankedCounter:
+    """Unit tests for RankedCounter"""
+
+    def test_top_orders_by_count_then_key(self):
+        """Test ranking by descending count with ties broken by key"""
+        counter = RankedCounter()
+        for key in ["bob", "alice", "bob", "carol", "alice", "bob"]:
+            counter.add(key)
+
+        assert counter.top(2) == [("bob", 3), ("alice", 2)]
+        assert counter.top(10) == [("bob", 3), ("alice", 2), ("carol", 1)]
+
+    def test_tie_values_order_equal_counts(self):
+        """Test equal counts rank by tie value before key, and ties can move"""
+        counter = RankedCounter()
+        counter.add("alice", 2, tie=5)
+        counter.add("bob", 2, tie=1)
+        counter.add("carol", 3, tie=9)
+        assert counter.top(3) == [("carol", 3), ("bob", 2), ("alice", 2)]
+
+        counter.update({"bob": 0}, {"bob": 7})
+        assert counter.top(3) == [("carol", 3), ("alice", 2), ("bob", 2)]
+
+    def test_decrement_reorders_and_drops_zero(self):
+        """Test lowering counts moves keys down and removes them at zero"""
+        counter = RankedCounter()
+        counter.add("bob", 3)
+        counter.add("alice", 2)
+        counter.add("bob", -2)
+        counter.add("carol")
+        counter.add("carol", -1)
+
+        assert counter.top(5) == [("alice", 2), ("bob", 1)]
+        assert len(counter) == 2
+
+    def test_bulk_update_matches_single_adds(self):
+        """Test a large batch of changes ranks the same as one-by-one adds"""
+        single = RankedCounter()
+        bulk = RankedCounter()
+        deltas = {f"user{i}": i % 5 for i in range(50)}
+        for key, delta in deltas.items():
+            if delta:
+                single.add(key, delta)
+        bulk.update(deltas)
+
+        assert bulk.top(50) == single.top(50)
+        bulk.update({"user1": -1, "user4": 10})
+        single.add("user1", -1)
+        single.add("user4", 10)
+        assert bulk.top(50) == single.top(50)
+
+
+class TestContributorLeaderboard:
+    """Unit tests for ContributorLeaderboard"""
+
+    def test_author_of_reads_known_fields(self):
+        """Test author extraction from flat and nested fields"""
+        assert author_of({"author": "bob"}) == "bob"
+        assert author_of({"owner": {"username": "carol"}}) == "carol"
+        assert author_of({"name": "x"}) is None
+
+    def test_applies_catalog_deltas(self):
+        """Test counts follow added, reassigned and removed servers"""
+        servers = [
+            {"id": 1, "author": "bob", "created_at": "2024-01-01"},
+            {"id": 2, "author": "bob", "created_at": "2024-01-02"},
+            {"id": 3, "author": "alice", "created_at": "2024-01-03"},
+        ]
+        board = ContributorLeaderboard()
+        snapshot = CatalogSnapshot(servers)
+        board.apply_changes(snapshot, [1, 2, 3], [])
+        assert board.top(3) == {"users": [
+            {"username": "bob", "server_count": 2},
+            {"username": "alice", "server_count": 1},
+        ]}
+
+        snapshot = snapshot.apply([dict(servers[1], author="alice")], removed=[1])
+        board.apply_changes(snapshot, [2], [1])
+
+        assert board.top(3) == {"users": [{"username": "alice", "server_count": 2}]}
+
+    def test_not_ready_without_authors(self):
+        """Test the leaderboard stays unusable when listings lack authors"""
+        board = ContributorLeaderboard()
+        board.apply_changes(CatalogSnapshot([{"id": 1, "created_at": "2024-01-01"}]), [1], [])
+        assert not board.is_ready
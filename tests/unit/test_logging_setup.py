@@ -0,0 +1,84 @@
+"""Unit tests for the logging pipeline"""
+
+import io
+import json
+import logging
+
+from src import logging_setup
+from src.logging_setup import JsonFormatter, RateLimitFilter, request_id_var
+
+
+def make_record(msg="Backend failed: %s", args=("boom",), level=logging.ERROR, **extra):
+    record = logging.LogRecord("src.client", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestRateLimitFilter:
+    """Unit tests for RateLimitFilter"""
+
+    def test_limits_repeats_of_a_template(self):
+        """Test a burst passes, the rest is dropped and counted on the next emitted record"""
+        now = [0.0]
+        limiter = RateLimitFilter(burst=2, interval=60, clock=lambda: now[0])
+
+        passed = [limiter.filter(make_record(args=(i,))) for i in range(5)]
+        assert passed == [True, True, False, False, False]
+        assert limiter.filter(make_record("Other failure")) is True
+
+        now[0] = 61.0
+        record = make_record()
+        assert limiter.filter(record) is True
+        assert record.suppressed == 3
+
+    def test_sampling_and_low_levels(self):
+        """Test one in sample_every over-limit records passes and INFO is never limited"""
+        limiter = RateLimitFilter(burst=1, sample_every=3)
+
+        passed = [limiter.filter(make_record()) for _ in range(7)]
+        assert passed == [True, False, False, True, False, False, True]
+        assert all(limiter.filter(make_record(level=logging.INFO)) for _ in range(5))
+
+
+class TestJsonFormatter:
+    """Unit tests for JsonFormatter"""
+
+    def test_includes_message_and_extra_fields(self):
+        """Test the lazily formatted message and extra fields are emitted"""
+        entry = json.loads(JsonFormatter().format(make_record(request_id="1-a", duration_ms=12.5)))
+
+        assert entry["message"] == "Backend failed: boom"
+        assert entry["level"] == "ERROR"
+        assert entry["request_id"] == "1-a"
+        assert entry["duration_ms"] == 12.5
+
+
+class TestConfigureLogging:
+    """Unit tests for configure_logging"""
+
+    def test_records_written_by_background_thread(self):
+        """Test records pass through the queue with their request ID"""
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        stream = io.StringIO()
+        try:
+            logging_setup.configure_logging("INFO", json_format=True, stream=stream)
+            token = request_id_var.set("req-1")
+            try:
+                logging.getLogger("src.test").info("Served %d servers", 3)
+            finally:
+                request_id_var.reset(token)
+            logging.getLogger("src.test").debug("Not written %s", "at INFO")
+            logging_setup.stop_logging()
+        finally:
+            root.handlers[:] = saved_handlers
+            root.setLevel(saved_level)
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert lines == [{
+            "time": lines[0]["time"],
+            "level": "INFO",
+            "logger": "src.test",
+            "message": "Served 3 servers",
+            "request_id": "req-1",
+        }]
@@ -0,0 +1,78 @@
+"""Unit tests for in-process metrics"""
+
+import pytest
+from src import metrics
+from src.tools.handlers import ToolHandler
+
+
+class TestMetrics:
+    """Unit tests for metric types and exposition"""
+
+    def test_counter_and_gauge_render(self):
+        """Test counters and gauges render with labels"""
+        registry = metrics.MetricsRegistry()
+        counter = registry.register(metrics.Counter("c_total", "A counter", ["tool"]))
+        gauge = registry.register(metrics.Gauge("g", "A gauge"))
+
+        counter.labels("search").inc()
+        counter.labels("search").inc(2)
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        text = registry.render()
+        assert "# TYPE c_total counter" in text
+        assert 'c_total{tool="search"} 3' in text
+        assert "g 1" in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram bucket counts, sum and count"""
+        registry = metrics.MetricsRegistry()
+        hist = registry.register(metrics.Histogram("h_seconds", "A histogram", ["tool"], buckets=(0.1, 1.0)))
+
+        for value in (0.05, 0.1, 0.5, 2.0):
+            hist.labels("x").observe(value)
+
+        text = registry.render()
+        assert 'h_seconds_bucket{tool="x",le="0.1"} 2' in text
+        assert 'h_seconds_bucket{tool="x",le="1"} 3' in text
+        assert 'h_seconds_bucket{tool="x",le="+Inf"} 4' in text
+        assert 'h_seconds_count{tool="x"} 4' in text
+        assert 'h_seconds_sum{tool="x"} 2.65' in text
+
+    def test_label_count_is_checked(self):
+        """Test wrong label arity is rejected"""
+        counter = metrics.Counter("c_total", "A counter", ["a", "b"])
+        with pytest.raises(ValueError):
+            counter.labels("only-one")
+
+    def test_stats_sources(self):
+        """Test stats dicts are exposed as gauges at render time"""
+        registry = metrics.MetricsRegistry()
+        registry.register_stats("cache", "Cache stats", lambda: {"hits": 3, "misses": 1})
+        text = registry.render()
+        assert 'cache{stat="hits"} 3' in text
+        assert 'cache{stat="misses"} 1' in text
+
+    def test_endpoint_label(self):
+        """Test numeric path segments are collapsed"""
+        assert metrics.endpoint_label("/mcp-servers/42") == "/mcp-servers/{id}"
+        assert metrics.endpoint_label("/mcp-servers/") == "/mcp-servers/"
+
+
+@pytest.mark.asyncio
+class TestToolMetrics:
+    """Unit tests for tool call instrumentation"""
+
+    async def test_tool_calls_are_timed_and_errors_counted(self, mocker):
+        """Test handle_tool_call records duration and errors"""
+        mock_client = mocker.AsyncMock()
+        mock_client.search_servers.side_effect = Exception("API Error")
+        handler = ToolHandler(mock_client)
+
+        before = metrics.TOOL_ERRORS.labels("search_mcp_servers").value
+        await handler.handle_tool_call("search_mcp_servers", {"keyword": "x"})
+
+        assert metrics.TOOL_ERRORS.labels("search_mcp_servers").value == before + 1
+        assert metrics.TOOL_DURATION.labels("search_mcp_servers").count >= 1
+        assert metrics.TOOL_IN_FLIGHT.labels().value == 0
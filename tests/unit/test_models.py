@@ -0,0 +1,69 @@
+"""Unit tests for compact server records"""
+
+import json
+
+import pytest
+from src.models import ServerRecord
+from src.tools import formatters
+
+PAYLOAD = {
+    "id": 7,
+    "name": "github-mcp",
+    "description": "GitHub tools",
+    "favorites_count": 3,
+    "created_at": "2024-01-01T00:00:00",
+    "tags": [{"id": 1, "name": "git"}, {"id": 2, "name": "vcs"}],
+    "license": "MIT",
+}
+
+
+class TestServerRecord:
+    """Unit tests for ServerRecord"""
+
+    def test_dict_style_access(self):
+        """Test get/[] match the payload, including unslotted fields"""
+        record = ServerRecord.from_dict(PAYLOAD)
+
+        assert record["id"] == 7
+        assert record.get("favorites_count") == 3
+        assert record.get("github_link", "N/A") == "N/A"
+        assert record.get("license") == "MIT"
+        assert record.get("tags") == ("git", "vcs")
+        with pytest.raises(KeyError):
+            record["github_link"]
+
+    def test_tags_are_interned_and_shared(self):
+        """Test equal tags across servers are the same objects"""
+        first = ServerRecord.from_dict(PAYLOAD)
+        second = ServerRecord.from_dict(dict(PAYLOAD, id=8))
+
+        assert first.tag_records[0] is second.tag_records[0]
+        assert first.tags[1] is second.tags[1]
+
+    def test_details_reuse_listing_values(self):
+        """Test a detail record shares equal values with its listing entry"""
+        listing = ServerRecord.from_dict(PAYLOAD)
+        payload = json.loads(json.dumps(dict(PAYLOAD, tools=[{"name": "create_issue", "description": "Open an issue"}])))
+        details = ServerRecord.from_dict(payload, base=listing)
+
+        assert details.description is listing.description
+        assert details.tags is listing.tags
+        assert details["tools"][0]["name"] == "create_issue"
+
+    def test_equality_and_round_trip(self):
+        """Test records compare by value and convert back to payload dicts"""
+        record = ServerRecord.from_dict(PAYLOAD)
+
+        assert record == ServerRecord.from_dict(dict(PAYLOAD))
+        assert record != ServerRecord.from_dict(dict(PAYLOAD, favorites_count=4))
+        assert record.to_dict() == PAYLOAD
+
+    def test_formatters_accept_records(self):
+        """Test listing and JSON detail rendering work on records"""
+        record = ServerRecord.from_dict(PAYLOAD)
+
+        text = formatters.format_server_list([record], "Servers")
+        data = json.loads(formatters.format_server_details(record, "json"))
+
+        assert "Tags: git, vcs" in text
+        assert data["tags"] == PAYLOAD["tags"]
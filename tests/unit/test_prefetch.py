@@ -0,0 +1,125 @@
+"""Unit tests for speculative prefetch"""
+
+import asyncio
+
+import pytest
+from src.prefetch import Prefetcher, details_key, page_key
+
+PAGE = {"servers": [{"id": i} for i in range(1, 6)]}
+
+
+def make_client(mocker):
+    """Create a mocked APIClient whose response cache holds nothing fresh"""
+    client = mocker.AsyncMock()
+    client.has_fresh_listing = mocker.Mock(return_value=False)
+    client.has_fresh_details = mocker.Mock(return_value=False)
+    return client
+
+
+async def drain(prefetcher):
+    """Wait for running prefetches to finish"""
+    await asyncio.gather(*list(prefetcher._tasks.values()))
+
+
+@pytest.mark.asyncio
+class TestPrefetcher:
+    """Unit tests for Prefetcher"""
+
+    async def test_listing_prefetches_next_page_and_details(self, mocker):
+        """Test a full page schedules the next page and top-K details"""
+        client = make_client(mocker)
+        prefetcher = Prefetcher(client, detail_count=2, max_in_flight=10)
+
+        prefetcher.after_listing(PAGE, "favorites", "desc", 5, 0)
+        await drain(prefetcher)
+
+        client.list_servers.assert_called_once_with(sort="favorites", order="desc", limit=5, offset=5)
+        assert [c.args for c in client.get_server_details.call_args_list] == [(1,), (2,)]
+        assert prefetcher.stats()["completed"] == 3
+
+    async def test_short_page_has_no_next_page(self, mocker):
+        """Test the last page does not prefetch beyond the end"""
+        client = make_client(mocker)
+        prefetcher = Prefetcher(client, detail_count=0)
+
+        prefetcher.after_listing(PAGE, "favorites", "desc", 20, 0)
+        await drain(prefetcher)
+
+        client.list_servers.assert_not_called()
+
+    async def test_hits_and_waste_are_counted(self, mocker):
+        """Test used prefetches count as hits and expired ones as wasted"""
+        now = [0.0]
+        client = make_client(mocker)
+        prefetcher = Prefetcher(client, detail_count=3, max_in_flight=10, window=60, clock=lambda: now[0])
+        prefetcher.after_search(PAGE)
+        await drain(prefetcher)
+
+        prefetcher.record([details_key(1), details_key(1), details_key(9)])
+        now[0] = 61.0
+        stats = prefetcher.stats()
+
+        assert stats["hits"] == 1
+        assert stats["wasted"] == 2
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+    async def test_request_during_prefetch_is_a_hit(self, mocker):
+        """Test a call arriving while the prefetch runs counts once"""
+        release = asyncio.Event()
+        client = make_client(mocker)
+
+        async def slow_list(**kwargs):
+            await release.wait()
+
+        client.list_servers.side_effect = slow_list
+        prefetcher = Prefetcher(client, detail_count=0)
+        prefetcher.after_listing(PAGE, "favorites", "desc", 5, 0)
+        await asyncio.sleep(0)
+
+        prefetcher.record([page_key("favorites", "desc", 5, 5)])
+        release.set()
+        await drain(prefetcher)
+        prefetcher.record([page_key("favorites", "desc", 5, 5)])
+
+        assert prefetcher.stats()["hits"] == 1
+        assert prefetcher.stats()["wasted"] == 0
+
+    async def test_budget_and_busy_skip_prefetches(self, mocker):
+        """Test prefetches beyond the budget or while busy are dropped"""
+        client = make_client(mocker)
+        prefetcher = Prefetcher(client, detail_count=5, max_in_flight=2)
+        prefetcher.after_search(PAGE)
+        assert prefetcher.stats()["issued"] == 2
+        assert prefetcher.stats()["skipped"] == 3
+        await drain(prefetcher)
+
+        busy = Prefetcher(client, detail_count=5, busy=lambda: True)
+        busy.after_search(PAGE)
+        assert busy.stats()["issued"] == 0
+
+    async def test_failures_are_counted(self, mocker):
+        """Test a failing prefetch is recorded and not remembered"""
+        client = make_client(mocker)
+        client.get_server_details.side_effect = Exception("boom")
+        prefetcher = Prefetcher(client, detail_count=1)
+        prefetcher.after_search(PAGE)
+        await drain(prefetcher)
+
+        prefetcher.record([details_key(1)])
+
+        assert prefetcher.stats()["failed"] == 1
+        assert prefetcher.stats()["hits"] == 0
+
+    async def test_fresh_cache_entries_are_not_prefetched(self, mocker):
+        """Test results already cached fresh are skipped, not counted as completed"""
+        client = make_client(mocker)
+        client.has_fresh_details.side_effect = lambda server_id: server_id == 1
+        prefetcher = Prefetcher(client, detail_count=2, max_in_flight=10)
+
+        prefetcher.after_search(PAGE)
+        await drain(prefetcher)
+
+        assert [c.args for c in client.get_server_details.call_args_list] == [(2,)]
+        stats = prefetcher.stats()
+        assert stats["cached"] == 1
+        assert stats["completed"] == 1
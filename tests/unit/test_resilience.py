@@ -0,0 +1,86 @@
+"""Unit tests for retry, hedging and circuit breaker primitives"""
+
+import httpx
+from src.resilience import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, LatencyWindow, backoff_delay, is_backend_failure
+)
+
+
+def status_error(code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "http://backend/x")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(code, request=request))
+
+
+class TestCircuitBreaker:
+    """Unit tests for CircuitBreaker"""
+
+    def test_opens_after_consecutive_failures(self, clock):
+        """Test the circuit opens at the threshold and a success resets the count"""
+        breaker = CircuitBreaker(failure_threshold=3, clock=clock)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert breaker.opens == 1
+
+    def test_half_open_probe(self, clock):
+        """Test one probe is allowed after the reset timeout"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 10
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+    def test_failed_probe_reopens(self, clock):
+        """Test a failed probe opens the circuit for another timeout"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 10
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.opens == 2
+
+        clock.now = 19
+        assert not breaker.allow()
+
+
+class TestBackoffAndLatency:
+    """Unit tests for backoff and latency tracking"""
+
+    def test_backoff_ceiling_grows_and_caps(self):
+        """Test the jitter range doubles per attempt up to the cap"""
+        upper = lambda lo, hi: hi
+        assert [backoff_delay(i, 0.1, 0.5, rng=upper) for i in range(4)] == [0.1, 0.2, 0.4, 0.5]
+        assert 0 <= backoff_delay(3, 0.1, 0.5) <= 0.5
+
+    def test_latency_percentile(self):
+        """Test percentiles need a minimum sample count"""
+        window = LatencyWindow(size=100, min_samples=10)
+        for i in range(9):
+            window.observe(i / 100)
+        assert window.percentile(0.95) is None
+
+        for i in range(9, 100):
+            window.observe(i / 100)
+        assert window.percentile(0.95) == 0.95
+
+    def test_backend_failure_classification(self):
+        """Test 5xx and transport errors count, 4xx does not"""
+        assert is_backend_failure(status_error(503))
+        assert is_backend_failure(httpx.ConnectTimeout("slow"))
+        assert not is_backend_failure(status_error(404))
+        assert not is_backend_failure(ValueError("bad json"))
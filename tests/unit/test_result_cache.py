@@ -0,0 +1,45 @@
+"""Unit tests for the rendered tool result cache"""
+
+from mcp.types import TextContent
+from src.tools.result_cache import ResultCache
+
+KEY = ("get_top_servers", "{}")
+
+
+def contents(text="rendered"):
+    return [TextContent(type="text", text=text)]
+
+
+class TestResultCache:
+    """Unit tests for ResultCache"""
+
+    def test_hit_requires_identical_sources(self):
+        """Test entries are reused only for the very same source objects"""
+        cache = ResultCache()
+        server = {"id": 1}
+        cache.put(KEY, (server,), contents())
+
+        assert cache.get(KEY, (server,))[0].text == "rendered"
+        assert cache.get(KEY, ({"id": 1},)) is None
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["invalidations"] == 1
+        assert stats["entries"] == 0
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted at capacity"""
+        cache = ResultCache(max_entries=2)
+        cache.put(("a", ""), (), contents("a"))
+        cache.put(("b", ""), (), contents("b"))
+        cache.get(("a", ""), ())
+        cache.put(("c", ""), (), contents("c"))
+
+        assert cache.get(("b", ""), ()) is None
+        assert cache.get(("a", ""), ()) is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_disabled_with_zero_entries(self):
+        """Test a zero-sized cache stores nothing"""
+        cache = ResultCache(max_entries=0)
+        cache.put(KEY, (), contents())
+        assert len(cache) == 0
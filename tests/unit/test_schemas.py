@@ -2,7 +2,7 @@
 
 import pytest
 from mcp.types import Tool
-from src.tools.schemas import TOOLS
+from src.tools.schemas import TOOLS, normalize_arguments
 
 
 class TestToolSchemas:
@@ -12,7 +12,7 @@ class TestToolSchemas:
         """Test TOOLS list exists and is not empty"""
         assert TOOLS is not None
         assert isinstance(TOOLS, list)
-        assert len(TOOLS) == 5
+        assert len(TOOLS) == 7
 
     def test_all_tools_are_tool_objects(self):
         """Test all items in TOOLS are Tool objects"""
@@ -49,3 +49,11 @@ class TestToolSchemas:
         """Test there are no duplicate tool names"""
         tool_names = [tool.name for tool in TOOLS]
         assert len(tool_names) == len(set(tool_names))
+
+    def test_normalize_arguments_fills_defaults(self):
+        """Test calls spelling out defaults normalize like calls omitting them"""
+        assert normalize_arguments("get_top_servers", {"limit": 3}) == normalize_arguments("get_top_servers", {})
+        assert normalize_arguments("get_top_servers", {"sort": "favorites", "format": "text"}) == (
+            normalize_arguments("get_top_servers", {})
+        )
+        assert normalize_arguments("get_top_servers", {"limit": 5}) != normalize_arguments("get_top_servers", {})
@@ -0,0 +1,136 @@
+"""Unit tests for local BM25 search"""
+
+import asyncio
+
+import pytest
+
+from src.catalog import CatalogSnapshot
+from src.search import SearchIndex, tokenize
+
+SERVERS = [
+    {"id": 1, "name": "github-mcp", "description": "Manage GitHub issues and pull requests",
+     "favorites_count": 10, "tags": [{"name": "git"}, {"name": "devtools"}]},
+    {"id": 2, "name": "postgres-mcp", "description": "Query a PostgreSQL database",
+     "favorites_count": 7, "tags": [{"name": "database"}]},
+    {"id": 3, "name": "gitlab-mcp", "description": "GitLab merge requests and pipelines",
+     "favorites_count": 3, "tags": [{"name": "git"}]},
+]
+
+DETAILS = {
+    2: {"id": 2, "name": "postgres-mcp", "description": "Query a PostgreSQL database",
+        "tags": [{"name": "database"}], "tools": [{"name": "run_sql"}]},
+}
+
+
+def build_index():
+    """Index the sample servers"""
+    index = SearchIndex()
+    for server in SERVERS:
+        index.upsert(server, DETAILS.get(server["id"]))
+    return index
+
+
+class TestSearchIndex:
+    """Unit tests for SearchIndex"""
+
+    def test_tokenize_drops_stopwords_and_punctuation(self):
+        """Test tokenizer output"""
+        assert tokenize("The GitHub-MCP server, for issues!") == ["github", "mcp", "server", "issues"]
+
+    def test_name_match_ranks_first(self):
+        """Test BM25 ranks the best name match first"""
+        results = build_index().search("github")
+        assert [s["id"] for s in results] == [1]
+
+    def test_tool_names_are_indexed(self):
+        """Test tool names from detail payloads are searchable"""
+        results = build_index().search("sql")
+        assert [s["id"] for s in results] == [2]
+
+    def test_tag_filter(self):
+        """Test tag filters restrict results"""
+        index = build_index()
+        assert {s["id"] for s in index.search("requests", tags=["git"])} == {1, 3}
+        assert index.search("requests", tags=["database"]) == []
+
+    def test_tag_only_filter_orders_by_favorites(self):
+        """Test tag filtering without a keyword"""
+        results = build_index().search(None, tags=["GIT"])
+        assert [s["id"] for s in results] == [1, 3]
+
+    def test_empty_query_orders_by_favorites(self):
+        """Test a missing or stopword-only keyword matches every server"""
+        index = build_index()
+        assert [s["id"] for s in index.search(None)] == [1, 2, 3]
+        assert [s["id"] for s in index.search("the and", limit=2)] == [1, 2]
+
+    def test_incremental_update_and_remove(self):
+        """Test documents can be replaced and removed"""
+        index = build_index()
+        index.upsert({"id": 3, "name": "gitlab-mcp", "description": "Kubernetes deployments", "tags": []})
+
+        assert [s["id"] for s in index.search("kubernetes")] == [3]
+        assert [s["id"] for s in index.search("pipelines")] == []
+
+        index.remove(3)
+        assert index.search("kubernetes") == []
+        assert len(index) == 2
+
+    def test_fuzzy_fallback_for_typos(self):
+        """Test misspelled queries fall back to trigram matches"""
+        index = build_index()
+        assert [s["id"] for s in index.search("githbu")] == [1, 3]
+        assert [s["id"] for s in index.search("postgress")] == [2]
+        assert [s["id"] for s in index.search("run_sqll")] == [2]
+        assert index.fuzzy_searches == 3
+
+    def test_fuzzy_results_follow_exact_ones(self):
+        """Test fuzzy matches are appended after exact hits and respect tag filters"""
+        index = build_index()
+        assert [s["id"] for s in index.search("pipelines githbu")] == [3, 1]
+        assert [s["id"] for s in index.search("pipelines githbu", tags=["git"], limit=1)] == [3]
+        assert index.search("githbu", tags=["database"]) == []
+
+    def test_fuzzy_fallback_can_be_disabled(self):
+        """Test fuzzy_min_results=0 keeps search exact"""
+        index = SearchIndex(fuzzy_min_results=0)
+        for server in SERVERS:
+            index.upsert(server, DETAILS.get(server["id"]))
+        assert index.search("githbu") == []
+        assert len(index._fuzzy) == 0
+
+    @pytest.mark.asyncio
+    async def test_apply_catalog_changes(self):
+        """Test syncing from catalog snapshots"""
+        index = SearchIndex()
+        snapshot = CatalogSnapshot(SERVERS, DETAILS)
+        await index.apply_changes(snapshot, list(snapshot.servers), [])
+        assert index.is_ready
+        assert len(index) == 3
+
+        smaller = CatalogSnapshot(SERVERS[:2], DETAILS)
+        changed, removed = smaller.diff(snapshot)
+        await index.apply_changes(smaller, changed, removed)
+        assert removed == [3]
+        # Only the fuzzy "git" tag match on github-mcp is left
+        assert [s["id"] for s in index.search("gitlab")] == [1]
+
+    @pytest.mark.asyncio
+    async def test_large_delta_yields_to_event_loop(self):
+        """Test big deltas are applied in chunks between event loop turns"""
+        index = SearchIndex()
+        snapshot = CatalogSnapshot([{"id": i, "name": f"server-{i}"} for i in range(1, 501)])
+        seen = []
+
+        async def observe():
+            while True:
+                seen.append(len(index))
+                await asyncio.sleep(0)
+
+        observer = asyncio.create_task(observe())
+        await asyncio.sleep(0)
+        await index.apply_changes(snapshot, list(snapshot.servers), [])
+        observer.cancel()
+
+        assert len(index) == 500
+        assert any(0 < size < 500 for size in seen)
@@ -0,0 +1,166 @@
+"""Unit tests for the SQLite-backed shared cache"""
+
+import sqlite3
+
+from src.shared_cache import SharedCacheStore
+
+
+class TestSharedCacheStore:
+    """Unit tests for SharedCacheStore"""
+
+    def test_round_trip_between_connections(self, clock, tmp_path):
+        """Test a value written by one store is read by another on the same file"""
+        path = str(tmp_path / "cache.sqlite3")
+        writer = SharedCacheStore(path, clock=clock)
+        reader = SharedCacheStore(path, clock=clock)
+
+        writer.set("GET /x", {"servers": [{"id": 1}]}, size=20, ttl=30, etag='"abc"')
+        clock.now += 5
+
+        assert reader.get("GET /x") == ({"servers": [{"id": 1}]}, 20, 5.0, 30.0, '"abc"', None)
+        assert reader.stats()["hits"] == 1
+        writer.close()
+        reader.close()
+
+    def test_expiry_respects_stale_window(self, clock, tmp_path):
+        """Test entries are returned until the stale window ends"""
+        store = SharedCacheStore(str(tmp_path / "cache.sqlite3"), stale_ttl=10, clock=clock)
+        store.set("k", "v", size=1, ttl=5)
+
+        clock.now += 8
+        value, _, age, ttl, _, _ = store.get("k")
+        assert value == "v" and age > ttl
+
+        clock.now += 10
+        assert store.get("k") is None
+        assert store.purge() == 1
+        assert store.stats()["misses"] == 1
+
+    def test_zero_ttl_is_not_stored(self, tmp_path):
+        """Test non-cacheable responses are skipped"""
+        store = SharedCacheStore(str(tmp_path / "cache.sqlite3"))
+        store.set("k", "v", size=1, ttl=0)
+        assert store.get("k") is None
+
+    def test_touch_refreshes_timestamp(self, clock, tmp_path):
+        """Test touch() makes an entry fresh again without rewriting it"""
+        store = SharedCacheStore(str(tmp_path / "cache.sqlite3"), stale_ttl=10, clock=clock)
+        store.set("k", "v", size=1, ttl=5)
+
+        clock.now += 8
+        store.touch("k", ttl=5)
+        assert store.get("k")[2] == 0.0
+
+    def test_invalidate(self, tmp_path):
+        """Test single-key and full invalidation"""
+        store = SharedCacheStore(str(tmp_path / "cache.sqlite3"))
+        store.set("a", 1, size=1, ttl=5)
+        store.set("b", 2, size=1, ttl=5)
+
+        store.invalidate("a")
+        assert store.get("a") is None
+        assert store.get("b") is not None
+
+        store.invalidate()
+        assert store.get("b") is None
+
+    def test_database_errors_are_misses(self, tmp_path):
+        """Test an unusable database path degrades to misses"""
+        store = SharedCacheStore(str(tmp_path / "missing" / "cache.sqlite3"))
+        store.set("k", "v", size=1, ttl=5)
+
+        assert store.get("k") is None
+        assert store.stats()["errors"] == 2
+
+    def test_locked_database_skips_write(self, tmp_path):
+        """Test a write lock held by another worker is skipped, not waited on"""
+        path = str(tmp_path / "cache.sqlite3")
+        store = SharedCacheStore(path)
+        store.set("a", 1, size=1, ttl=5)
+
+        other = sqlite3.connect(path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        store.set("b", 2, size=1, ttl=5)
+        other.execute("ROLLBACK")
+        other.close()
+
+        assert store.get("a") is not None
+        assert store.get("b") is None
+        stats = store.stats()
+        assert stats["busy"] == 1
+        assert stats["errors"] == 0
+
+
+class TestPersistentCache:
+    """Unit tests for restart and disk budget behaviour"""
+
+    def test_entries_survive_restart(self, tmp_path):
+        """Test a new store on the same file serves entries written before close"""
+        path = str(tmp_path / "cache.sqlite3")
+        store = SharedCacheStore(path)
+        store.set("k", {"id": 1}, size=5, ttl=60)
+        store.close()
+
+        restarted = SharedCacheStore(path)
+        assert restarted.get("k")[0] == {"id": 1}
+        assert restarted.stats()["bytes"] == 5
+
+    def test_disk_budget_evicts_oldest(self, clock, tmp_path):
+        """Test the oldest entries are evicted once the budget is exceeded"""
+        store = SharedCacheStore(str(tmp_path / "cache.sqlite3"), max_bytes=100, clock=clock)
+        for i in range(5):
+            store.set(f"k{i}", i, size=30, ttl=60)
+            clock.now += 1
+
+        assert store.get("k0") is None
+        assert store.get("k4") is not None
+        stats = store.stats()
+        assert stats["bytes"] <= 100
+        assert stats["evictions"] >= 2
+
+    def test_stored_bytes_follow_overwrites_and_deletes(self, tmp_path):
+        """Test the shared size total tracks writes from every connection"""
+        path = str(tmp_path / "cache.sqlite3")
+        store = SharedCacheStore(path)
+        other = SharedCacheStore(path)
+        store.set("k", "v", size=10, ttl=60)
+        other.set("k", "w", size=4, ttl=60)
+        other.set("j", "v", size=3, ttl=60)
+        other.invalidate("j")
+
+        store.purge()
+        assert store.stats()["bytes"] == 4
+
+    def test_backend_change_does_not_serve_old_responses(self, clock, tmp_path):
+        """Test a store for another backend URL misses on the same file"""
+        path = str(tmp_path / "cache.sqlite3")
+        old = SharedCacheStore(path, namespace="http://old/api/v1", clock=clock)
+        old.set("GET /x", {"v": 1}, size=5, ttl=60)
+        old.close()
+
+        new = SharedCacheStore(path, namespace="http://new/api/v1", clock=clock)
+        assert new.get("GET /x") is None
+        new.set("GET /x", {"v": 2}, size=5, ttl=60)
+        assert new.get("GET /x")[0] == {"v": 2}
+
+        # Old entries expire and are purged as usual
+        clock.now += 61
+        assert new.purge() == 2
+
+    def test_oversized_entry_is_skipped(self, tmp_path):
+        """Test a single response larger than the budget is not stored"""
+        store = SharedCacheStore(str(tmp_path / "cache.sqlite3"), max_bytes=10)
+        store.set("k", "v", size=11, ttl=60)
+        assert store.get("k") is None
+
+    def test_schema_version_change_clears_file(self, tmp_path, monkeypatch):
+        """Test files written with another schema version are discarded"""
+        import src.shared_cache as shared_cache
+
+        path = str(tmp_path / "cache.sqlite3")
+        store = SharedCacheStore(path)
+        store.set("k", "v", size=1, ttl=60)
+        store.close()
+
+        monkeypatch.setattr(shared_cache, "SCHEMA_VERSION", shared_cache.SCHEMA_VERSION + 1)
+        assert SharedCacheStore(path).get("k") is None
@@ -0,0 +1,150 @@
+"""Unit tests for TF-IDF similar-server lookups"""
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from src.catalog import CatalogSnapshot
+from src import similarity
+from src.similarity import SimilarityIndex, server_terms
+
+SERVERS = [
+    {"id": 1, "name": "github-mcp", "description": "Manage GitHub issues and pull requests",
+     "tags": [{"name": "git"}, {"name": "devtools"}]},
+    {"id": 2, "name": "postgres-mcp", "description": "Query a PostgreSQL database with SQL",
+     "tags": [{"name": "database"}]},
+    {"id": 3, "name": "gitlab-mcp", "description": "GitLab merge requests, issues and pipelines",
+     "tags": [{"name": "git"}, {"name": "devtools"}]},
+    {"id": 4, "name": "mysql-mcp", "description": "Run SQL against a MySQL database",
+     "tags": [{"name": "database"}]},
+    {"id": 5, "name": "weather-mcp", "description": "Forecasts for any city", "tags": []},
+]
+
+DETAILS = {
+    2: dict(SERVERS[1], tools=[{"name": "run_sql", "description": "Execute a read-only SQL query"}]),
+}
+
+
+async def build_index(**kwargs):
+    """Index the sample servers from a snapshot"""
+    index = SimilarityIndex(**kwargs)
+    snapshot = CatalogSnapshot(SERVERS, DETAILS)
+    await index.apply_changes(snapshot, list(snapshot.servers), [])
+    return index, snapshot
+
+
+def neighbour_ids(index, server_id, limit=None):
+    return [server["id"] for server, _ in index.similar(server_id, limit)]
+
+
+class TestSimilarityIndex:
+    """Unit tests for SimilarityIndex"""
+
+    def test_server_terms(self):
+        """Test descriptions, tags and tools are weighted into terms"""
+        terms = server_terms(DETAILS[2])
+        assert terms["sql"] == 3
+        assert terms["database"] == 3
+        assert terms["run"] == 1
+        assert "postgres" not in terms
+
+    @pytest.mark.asyncio
+    async def test_nearest_neighbours(self):
+        """Test servers sharing words and tags rank first"""
+        index, _ = await build_index()
+        assert neighbour_ids(index, 1)[0] == 3
+        assert neighbour_ids(index, 2)[0] == 4
+        assert neighbour_ids(index, 5) == []
+
+        scores = [score for _, score in index.similar(1)]
+        assert scores == sorted(scores, reverse=True)
+        assert all(0 < score <= 1 for score in scores)
+
+    @pytest.mark.asyncio
+    async def test_limit_and_unknown_server(self):
+        """Test result limits and servers missing from the catalog"""
+        index, _ = await build_index(max_results=1)
+        assert len(index.similar(1, 5)) == 1
+        assert index.similar(1, -1) == []
+        assert index.similar(42) is None
+        assert index.similar_many([1, 42, 3]).keys() == {1, 3}
+
+    @pytest.mark.asyncio
+    async def test_neighbour_lists_are_cached(self):
+        """Test repeated lookups reuse the cached list"""
+        index, _ = await build_index()
+        index.similar(1)
+        index.similar(1, 1)
+        assert index.stats()["hits"] == 1
+        assert index.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_change_invalidates_affected_lists(self):
+        """Test a delta drops only the lists it can affect"""
+        index, snapshot = await build_index()
+        index.similar_many([1, 2, 5])
+        assert index.stats()["reweights"] == 1
+
+        changed = dict(SERVERS[4], description="Forecasts for any city")
+        changed["tags"] = [{"name": "weather"}]
+        updated = snapshot.apply([changed])
+        await index.apply_changes(updated, [5], [])
+
+        # IDF weights are kept, the list of server 5 itself is dropped
+        assert index.stats()["reweights"] == 1
+        assert index.stats()["cached"] == 2
+
+        newcomer = {"id": 6, "name": "mariadb-mcp", "description": "Query a MariaDB database with SQL",
+                    "tags": [{"name": "database"}]}
+        grown = updated.apply([newcomer])
+        await index.apply_changes(grown, [6], [])
+        assert 6 in neighbour_ids(index, 2)
+
+    @pytest.mark.asyncio
+    async def test_removed_servers_leave_neighbour_lists(self):
+        """Test removing a server drops it from cached lists"""
+        index, snapshot = await build_index()
+        assert 3 in neighbour_ids(index, 1)
+
+        smaller = CatalogSnapshot(SERVERS[:2] + SERVERS[3:], DETAILS)
+        changed, removed = smaller.diff(snapshot)
+        await index.apply_changes(smaller, changed, removed)
+
+        assert 3 not in neighbour_ids(index, 1)
+        assert index.similar(3) is None
+        assert len(index) == 4
+
+    @pytest.mark.asyncio
+    async def test_incremental_matches_full_build(self):
+        """Test rows stacked incrementally equal a fresh build with the same IDF"""
+        index, snapshot = await build_index()
+        changed = dict(SERVERS[0], description="Manage GitHub issues, pull requests and pipelines")
+        updated = snapshot.apply([changed])
+        await index.apply_changes(updated, [1], [])
+
+        fresh = SimilarityIndex()
+        fresh._vectors.vocab = dict(index._vectors.vocab)
+        await fresh.apply_changes(updated, list(updated.servers), [])
+        vectors = fresh._vectors
+        vectors.idf = index._vectors.idf
+        vectors.matrix = similarity._weigh(vectors.tf, vectors.idf)
+        vectors.matrix_t = vectors.matrix.T.tocsr()
+
+        for server_id in updated.servers:
+            assert index.similar(server_id) == pytest.approx(fresh.similar(server_id))
+
+    @pytest.mark.asyncio
+    async def test_rebuild_runs_off_the_event_loop(self, mocker):
+        """Test matrices are built in a worker thread and swapped in after"""
+        to_thread = mocker.spy(similarity.asyncio, "to_thread")
+        index, snapshot = await build_index()
+        previous = index._vectors
+
+        changed = dict(SERVERS[4], description="Forecasts and alerts for any city")
+        await index.apply_changes(snapshot.apply([changed]), [5], [])
+
+        assert to_thread.call_count == 2
+        assert index._vectors is not previous
+        assert "alerts" not in previous.vocab
+        assert len(previous.ids) == len(index._vectors.ids)
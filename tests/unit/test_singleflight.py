@@ -0,0 +1,78 @@
+"""Unit tests for single-flight request coalescing"""
+
+import asyncio
+import pytest
+from src.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    """Unit tests for SingleFlight"""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test identical concurrent calls run once"""
+        flight = SingleFlight()
+        calls = 0
+        gate = asyncio.Event()
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await gate.wait()
+            return {"id": 1}
+
+        waiters = [asyncio.create_task(flight.do("k", fetch)) for _ in range(10)]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*waiters)
+
+        assert calls == 1
+        assert all(r == {"id": 1} for r in results)
+        assert flight.stats() == {"started": 1, "shared": 9, "in_flight": 0}
+
+    async def test_errors_fan_out_to_all_waiters(self):
+        """Test an exception reaches every waiter"""
+        flight = SingleFlight()
+        gate = asyncio.Event()
+
+        async def fetch():
+            await gate.wait()
+            raise ValueError("backend down")
+
+        waiters = [asyncio.create_task(flight.do("k", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert "k" not in flight
+
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        """Test cancelling one waiter leaves the others running"""
+        flight = SingleFlight()
+        gate = asyncio.Event()
+
+        async def fetch():
+            await gate.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("k", fetch))
+        second = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+
+        assert await second == "done"
+        assert first.cancelled()
+
+    async def test_different_keys_run_independently(self):
+        """Test calls with different keys are not coalesced"""
+        flight = SingleFlight()
+
+        async def fetch():
+            return 1
+
+        await asyncio.gather(flight.do("a", fetch), flight.do("b", fetch))
+        assert flight.stats()["started"] == 2
@@ -0,0 +1,93 @@
+"""Startup cost regression tests (run the server in subprocesses)"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Budgets are about 2x the measured values (~20-24ms import, ~0.9s startup)
+# so that undoing the lazy imports fails these tests.
+# Self time of our own modules in `python -X importtime -c "import src.main"`
+IMPORT_BUDGET_MS = 50
+# Process launch until the tools/list response over stdio
+STARTUP_BUDGET_SECONDS = 2.0
+
+# Modules only needed by optional components or other transports
+DEFERRED_MODULES = ("src.catalog", "src.search", "src.shared_cache", "src.workers", "src.transport", "src.similarity", "numpy", "sqlite3")
+
+
+def run_python(*args, env=None):
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True, env=env, timeout=60
+    )
+
+
+def own_import_ms() -> float:
+    """Sum self import time of src.* modules"""
+    result = run_python("-X", "importtime", "-c", "import src.main")
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if name.strip().startswith("src"):
+            total_us += int(self_us)
+    return total_us / 1000
+
+
+class TestStartup:
+    """Startup regression tests"""
+
+    def test_import_skips_deferred_modules(self):
+        """Test importing the entry point does not load optional components"""
+        result = run_python("-c", "import sys, src.main; print(' '.join(sys.modules))")
+        loaded = set(result.stdout.split())
+
+        assert "src.main" in loaded
+        assert [m for m in DEFERRED_MODULES if m in loaded] == []
+
+    def test_import_time_budget(self):
+        """Test our own modules import within budget (best of 3 runs)"""
+        best = min(own_import_ms() for _ in range(3))
+        assert best < IMPORT_BUDGET_MS, f"src.* import took {best:.1f}ms (budget {IMPORT_BUDGET_MS}ms)"
+
+    def test_stdio_lists_tools_without_creating_client(self):
+        """Test stdio answers tools/list within budget and before any backend setup"""
+        env = dict(os.environ, TRANSPORT_MODE="stdio", MCP_HUB_URL="http://127.0.0.1:9/api/v1")
+        messages = [
+            {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "startup-test", "version": "0"},
+            }},
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+            {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+        ]
+
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "src.main"],
+            cwd=ROOT, env=env, text=True,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        try:
+            proc.stdin.write("".join(json.dumps(m) + "\n" for m in messages))
+            proc.stdin.flush()
+            while True:
+                line = proc.stdout.readline()
+                assert line, "server exited before answering tools/list"
+                response = json.loads(line)
+                if response.get("id") == 2:
+                    break
+            elapsed = time.perf_counter() - start
+        finally:
+            proc.stdin.close()
+            proc.wait(timeout=10)
+
+        assert len(response["result"]["tools"]) > 0
+        assert elapsed < STARTUP_BUDGET_SECONDS, f"stdio startup took {elapsed:.2f}s"
+        assert "API client initialized" not in proc.stderr.read()
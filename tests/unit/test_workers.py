@@ -0,0 +1,44 @@
+"""Unit tests for the pre-fork worker supervisor"""
+
+import os
+import socket
+
+from src.workers import bind_socket, run_workers
+
+
+class TestWorkers:
+    """Unit tests for run_workers"""
+
+    def test_workers_share_socket_and_exit_cleanly(self, tmp_path):
+        """Test every worker receives the same listening socket"""
+        sock = bind_socket("127.0.0.1", 0)
+        port = sock.getsockname()[1]
+
+        def target(worker_sock: socket.socket):
+            (tmp_path / str(os.getpid())).write_text(str(worker_sock.getsockname()[1]))
+
+        try:
+            run_workers(target, 3, sock, shutdown_timeout=5)
+        finally:
+            sock.close()
+
+        ports = [p.read_text() for p in tmp_path.iterdir()]
+        assert ports == [str(port)] * 3
+
+    def test_crashed_worker_is_restarted(self, tmp_path):
+        """Test a worker exiting with an error is started again"""
+        sock = bind_socket("127.0.0.1", 0)
+        marker = tmp_path / "crashed"
+
+        def target(worker_sock: socket.socket):
+            if not marker.exists():
+                marker.write_text("1")
+                raise RuntimeError("boom")
+            (tmp_path / "restarted").write_text("1")
+
+        try:
+            run_workers(target, 1, sock, shutdown_timeout=5)
+        finally:
+            sock.close()
+
+        assert (tmp_path / "restarted").exists()